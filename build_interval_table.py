@@ -0,0 +1,48 @@
+#!/usr/bin/env python
+"""Offline builder for the secure interval lookup table (speed × distance since balise).
+
+Usage:
+  python build_interval_table.py --config config/model.yml --out results/secure_interval_table.npz
+
+Calibrates on the secure path of the time loop (`advance_secure`) over the configured
+horizon. The table is consumed by `simulate_time_series` with `fusion.interval.method: table`
+(`fusion.interval.table_path`) or via `run_sim.py --interval-table <path>`; it is rejected
+there if the quantile levels or the secure path model of the config differ.
+"""
+from __future__ import annotations
+
+import argparse
+import numpy as np
+
+from src.config import load_config, get_seed
+from src.interval_table import build_interval_table, save_interval_table
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Build secure interval lookup table (P_low/P_high on speed × distance grid)")
+    ap.add_argument("--config", required=True, help="Path to YAML config")
+    ap.add_argument("--out", default="results/secure_interval_table.npz", help="Output .npz artifact")
+    ap.add_argument("--n-per-node", type=int, default=2000, help="Calibration samples per speed node")
+    ap.add_argument("--speed-nodes", type=int, default=8, help="Number of speed nodes over 0..16.7 m/s")
+    ap.add_argument("--dist-nodes", type=int, default=9, help="Number of distance nodes over 0..400 m (balise spacing)")
+    ap.add_argument("--horizon", type=float, default=None, help="Calibration horizon [s] (default: sim.time_horizon_s)")
+    ap.add_argument("--sample-every", type=float, default=10.0, help="Pooling cadence of the secure errors [s]")
+    args = ap.parse_args()
+
+    cfg = load_config(args.config)
+    rng = np.random.default_rng(get_seed(cfg) + 4242)
+    table = build_interval_table(
+        cfg, rng,
+        speed_nodes=np.linspace(0.0, 16.7, args.speed_nodes),
+        dist_nodes=np.linspace(0.0, 400.0, args.dist_nodes),
+        n_per_node=args.n_per_node,
+        horizon_s=args.horizon,
+        sample_every_s=args.sample_every,
+    )
+    table.meta["config"] = str(args.config)
+    path = save_interval_table(table, args.out)
+    print(f"Saved interval table ({len(table.speed_nodes)}x{len(table.dist_nodes)} nodes) to {path}")
+
+
+if __name__ == "__main__":
+    main()
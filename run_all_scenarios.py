@@ -25,6 +25,13 @@ Optionales Abschalten einzelner Feature-Gruppen über Umgebungsvariablen ("0" od
   DISABLE_CONVERGENCE
   DISABLE_INTERVAL_EXPORT
 
+Batch-Modus Zeitreihen (BATCH_TIME_SERIES=1): alle Szenarien werden in einem gemeinsamen
+Zeitschleifen-Lauf (simulate_time_series_batch, Szenario-Achse) simuliert statt je Subprozess.
+Gleiche CSV-Exporte (time_series_metrics, fusion_mode_stats, fusion_switch_rate,
+secure_interval_bounds, secure_interval_growth), keine Zeitreihen-Plots. RNG je Szenario:
+default_rng(random_seed + 3333) → statistisch äquivalent, aber nicht bit-identisch zum
+Subprozess-Lauf (dort hängt der Zeitreihen-Stream von vorangehenden Analysen ab).
+
 Beispiel PowerShell:
   python run_all_scenarios.py
 """
@@ -52,12 +59,13 @@ DIS_TIME = env_disabled("DISABLE_TIME_SERIES")
 DIS_SENS = env_disabled("DISABLE_SENSITIVITY")
 DIS_CONV = env_disabled("DISABLE_CONVERGENCE")
 DIS_INTERVAL = env_disabled("DISABLE_INTERVAL_EXPORT")
+BATCH_TIME = os.environ.get("BATCH_TIME_SERIES", "").strip().lower() in {"1","true","yes","on"}
 
 BASE_FLAGS = [
     "--export-secure-interval",
     "--export-covariance",
 ]
-if not DIS_TIME:
+if not DIS_TIME and not BATCH_TIME:
     BASE_FLAGS += ["--time-series","--fusion-stats","--export-interval-bounds"]
 if not DIS_CONV:
     BASE_FLAGS += ["--convergence"]
@@ -76,6 +84,42 @@ SENS_FLAGS = [] if DIS_SENS else [
 
 # Keine Sobol Flags anhängen (bewusst)
 
+def run_time_series_batch(scenarios):
+    """Time-series stage for all scenarios in one batched loop (shared N, dt, horizon)."""
+    import numpy as np
+    import pandas as pd
+    sys.path.insert(0, str(ROOT))
+    from src.config import load_config, get_seed
+    from src.time_sim import simulate_time_series_batch, time_series_columns
+
+    cfgs = [load_config(CONFIG_DIR / scen) for scen in scenarios]
+    rngs = [np.random.default_rng(get_seed(cfg) + 3333) for cfg in cfgs]
+    print(f"\n=== BATCH TIME SERIES: {len(cfgs)} Szenarien ===")
+    results = simulate_time_series_batch(cfgs, rngs, export_interval_bounds=True)
+    for scen, cfg, res in zip(scenarios, cfgs, results):
+        out_dir = ROOT / "results" / scen.replace("scenario_", "").replace(".yml", "")
+        out_dir.mkdir(parents=True, exist_ok=True)
+        pd.DataFrame(time_series_columns(res)).to_csv(out_dir / "time_series_metrics.csv", index=False)
+        if res.mode_share is not None:
+            pd.DataFrame({
+                "t_s": res.times,
+                "share_midpoint": res.mode_share["midpoint"],
+                "share_unsafe": res.mode_share["unsafe"],
+                "share_unsafe_clamped": res.mode_share["unsafe_clamped"],
+            }).to_csv(out_dir / "fusion_mode_stats.csv", index=False)
+            pd.DataFrame({"t_s": res.times, "switch_rate": res.switch_rate}).to_csv(out_dir / "fusion_switch_rate.csv", index=False)
+        if res.interval_lower is not None:
+            pd.DataFrame({"interval_lower": res.interval_lower, "interval_upper": res.interval_upper}).to_csv(
+                out_dir / "secure_interval_bounds.csv", index=False)
+        if res.si_times is not None:
+            pd.DataFrame({
+                "t_s": res.si_times,
+                "p99_additive": res.si_additive_p99,
+                "p99_joint": res.si_joint_p99,
+                "bias_pct": res.si_bias_pct,
+            }).to_csv(out_dir / "secure_interval_growth.csv", index=False)
+        print(f"[OK] Zeitreihe {scen} → {out_dir}")
+
 def run():
     python_exe = sys.executable
     for scen in SCENARIOS:
@@ -106,6 +150,8 @@ def run():
             print(f"[ERROR] Szenario {scen_tag} fehlgeschlagen (RC={res.returncode})")
         else:
             print(f"[OK] Szenario {scen_tag} abgeschlossen. Ergebnisse: {out_dir}")
+    if BATCH_TIME and not DIS_TIME:
+        run_time_series_batch([scen for scen in SCENARIOS if (CONFIG_DIR / scen).exists()])
 
 if __name__ == "__main__":
     run()
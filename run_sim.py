@@ -26,6 +26,7 @@ from src.metrics import (
     quantile_convergence_trace,
     rmse_convergence_trace,
     es_convergence_trace,
+    SteadyStateSpec,
 )
 from src.fusion import fuse_pair, rule_based_fusion
 from src.plots import (
@@ -37,7 +38,15 @@ from src.plots import (
     add_plot_explanation,
     COLORS,
 )
-from src.time_sim import simulate_time_series
+from src.time_sim import (simulate_time_series, simulate_time_series_event_driven, simulate_time_series_gnss_modes,
+                          time_series_columns)
+from src.sharded import simulate_time_series_sharded
+from src.trace_recorder import TraceSpec, load_traces
+from src.ts_metrics import DEFAULT_METRICS
+from src.ts_bootstrap import BootstrapSpec
+from src.ts_store import MODE_COLUMNS
+from src.ts_attribution import AttributionSpec
+from src.dead_paths import analyze_config, early_detection_dead
 from src.sensitivity import (
     oat_sensitivity,
     oat_sensitivity_2d,
@@ -51,6 +60,21 @@ from src.sensitivity import (
 )
 
 
+def _time_series_metrics(args) -> list:
+    """Registry metrics consumed by the requested time-series exports (CSV, plots, steady state)."""
+    names = list(args.ts_metrics) if args.ts_metrics is not None else [m for m in DEFAULT_METRICS if m != "si"]
+    names += [f"share_oos@{t:g}" for t in args.oos_thresholds or ()]
+    if not args.no_plots:
+        # Zeitplots + secure_interval_growth.csv
+        names += ["rmse", "p95", "var_secure", "var_unsafe", "share_oos", "rmse_lat", "rmse_2d", "si"]
+    if args.steady_state:
+        # Mode shares / switch rate are engine series outside the registry (always recorded)
+        names += [m for m in SteadyStateSpec().metrics if m not in MODE_COLUMNS]
+    if args.bootstrap_replicates:
+        names += list(BootstrapSpec().metrics)
+    return names
+
+
 def main():
     # Defensive re-import (vereinzelt trat ein UnboundLocalError auf obwohl numpy global importiert ist)
     # Dadurch wird sichergestellt, dass "np" im lokalen Scope gebunden ist, bevor es genutzt wird.
@@ -64,16 +88,37 @@ def main():
     ap.add_argument("--save-samples", action="store_true", help="Persist raw sample errors to CSV")
     ap.add_argument("--time-series", action="store_true", help="Run time-series simulation (RMSE(t), P95(t), Var paths)")
     ap.add_argument("--oos-threshold", type=float, default=0.2, help="Out-of-spec threshold for share_oos metric (m)")
+    ap.add_argument("--oos-thresholds", type=float, nargs="*", default=None, help="Weitere Out-of-Spec-Schwellen [m] (Spalten share_out_of_spec_long@T, ein gemeinsamer Durchlauf)")
+    ap.add_argument("--ts-metrics", nargs="*", default=None, help="Zeitreihen-Metriken (Registry, z.B. rmse p95 p99 rmse_lat share_oos var_secure si; Default: alle CSV-Spalten); nur diese werden berechnet")
     ap.add_argument("--fusion-mode", choices=["var_weight","rule_based"], default=None, help="Override fusion mode (default: config driven)")
     ap.add_argument("--export-secure-interval", action="store_true", help="Export secure interval metrics CSV (width, additive vs joint P99, bias %)")
     ap.add_argument("--export-covariance", action="store_true", help="Export empirische Kovarianz/Korrelation der secure Komponenten (validiert additive Annahme)")
     # Adaptive interval / stateful fusion extensions
     ap.add_argument("--interval-update-cadence-s", type=float, default=1.0, help="Adaptive Intervall-Aktualisierungscadence in s")
     ap.add_argument("--no-adaptive-interval", action="store_true", help="Deaktiviert adaptive Intervallberechnung (Fallback global additive P99)")
+    ap.add_argument("--interval-method", choices=["exact", "sketch", "table"], default=None, help="Override fusion.interval.method (exact=Zertifizierung, sketch=inkrementelle Quantil-Sketches, table=Lookup)")
+    ap.add_argument("--interval-table", default=None, help="Pfad zur Intervall-Lookup-Tabelle (.npz, build_interval_table.py); impliziert --interval-method table")
+    ap.add_argument("--fusion-backend", choices=["numpy", "numba", "auto"], default=None, help="Override fusion.backend (numba optional; Fallback numpy falls nicht installiert)")
+    ap.add_argument("--metrics-cadence-s", type=float, default=None, help="Metrik-Aufzeichnungscadence in s (Vielfaches von dt_s; Default sim.metrics_cadence_s bzw. jeder Schritt)")
+    ap.add_argument("--event-driven", action="store_true", help="Ereignisgetriebene Zeitreihe (Sprünge zwischen Ausgabezeitpunkten; ~14x weniger Iterationen bei --metrics-cadence-s 10, nur ~1.4x bei 1 s; keine Traces)")
+    ap.add_argument("--time-block", type=int, default=None, help="Zeitblockierte Pfad-Updates: K Schritte Drift/Balise/GNSS je (K,N)-Arrayoperation (0 = automatisch)")
+    ap.add_argument("--shards", type=int, default=1, help="Experimentell: Zeitreihe in K Prozess-Shards (unabhängige Seed-Streams, exakt gemergte Metriken; Skalierung über Kerne nicht gemessen)")
+    ap.add_argument("--checkpoint-every", type=int, default=None, help="Zeitreihen-Checkpoint alle K Schritte (out/time_series_checkpoint.npz, atomar geschrieben)")
+    ap.add_argument("--stream-time-series", action="store_true", help="Zeitreihen-Metriken chunkweise in out/time_series_store (npy-Memmap-Spalten + progress.json) schreiben")
+    ap.add_argument("--trace-samples", type=int, default=None, help="Volle Trajektorien (secure/unsafe/fused/bounds/mode) für K Reservoir-Samples + Schwellwertverletzer (out/traces, float32-Memmap)")
+    ap.add_argument("--trace-breach-threshold", type=float, default=None, help="Schwelle |fused| für Breach-Traces (Default: --oos-threshold)")
+    ap.add_argument("--steady-state", action="store_true", help="Stationaritätstest der Zeitreihe (MSER-5 + Batch-Means-KI); Abbruch sobald stationär (time_series_steady_state.csv)")
+    ap.add_argument("--steady-rel-tol", type=float, default=0.02, help="Max. relative KI-Halbbreite der stationären Schätzer für --steady-state")
+    ap.add_argument("--bootstrap-replicates", type=int, default=None, help="Poisson-Bootstrap mit B Replikaten: KI-Bänder für RMSE(t)/P95(t) in einem Lauf (Spalten *_ci_lo/*_ci_hi)")
+    ap.add_argument("--ts-attribution", action="store_true", help="Zeitaufgelöste SRC/PRCC des fusionierten Fehlers auf seine Komponenten aus laufenden Momentmatrizen (time_series_attribution.csv)")
+    ap.add_argument("--ts-attribution-window-s", type=float, default=10.0, help="Fensterlänge [s] der gepoolten Momente für --ts-attribution")
+    ap.add_argument("--gnss-modes", nargs="*", default=None, help="Zeitreihe je GNSS-Modus (open/urban/tunnel; leer = alle konfigurierten) auf gemeinsamem secure Pfad (time_series_metrics_gnss_modes.csv)")
+    ap.add_argument("--resume", action="store_true", help="Zeitreihe aus vorhandenem Checkpoint fortsetzen (bit-identisch zum ununterbrochenen Lauf)")
     ap.add_argument("--fusion-stats", action="store_true", help="Exportiert Fusionsmodusanteile & Switch Rate (fusion_mode_stats.csv, fusion_switch_rate.csv)")
     ap.add_argument("--export-interval-bounds", action="store_true", help="Exportiert finale Intervallgrenzen je Sample (secure_interval_bounds.csv)")
     ap.add_argument("--convergence", action="store_true", help="Export Konvergenz-Traces (RMSE, P95, P99, ES95)")
     ap.add_argument("--perf", action="store_true", help="Messe Runtime adaptiver stateful Fusion vs. Legacy (nur Kurzlauf)")
+    ap.add_argument("--metric-threads", type=int, default=0, help="Experimentell: Thread-Pool für Metrik-Reduktionen je Aufzeichnungsschritt (0 = seriell; auf einem Kern ~15%% langsamer, Mehrkern-Gewinn nicht gemessen)")
     ap.add_argument("--stress", nargs="*", default=None, help="Stress scenario flags: balise_tail, odo_residual, heavy_map")
     ap.add_argument("--early-detect-validate", action="store_true", help="Validate Early-Detection impact (ΔP95) and log result")
     ap.add_argument("--override-n", type=int, default=None, help="Override N_samples (dev/performance)")
@@ -103,6 +148,16 @@ def main():
     rng = np.random.default_rng(get_seed(cfg))
     n = int(cfg.sim["N_samples"]) if args.override_n is None else int(args.override_n)
 
+    if args.interval_method is not None:
+        cfg.sensors.setdefault("fusion", {}).setdefault("interval", {})["method"] = args.interval_method
+    if args.interval_table is not None:
+        interval_over = cfg.sensors.setdefault("fusion", {}).setdefault("interval", {})
+        interval_over["method"] = "table"
+        interval_over["table_path"] = args.interval_table
+
+    if args.fusion_backend is not None:
+        cfg.sensors.setdefault("fusion", {})["backend"] = args.fusion_backend
+
     # Timestamp for provenance
     ts = datetime.now(UTC).isoformat()
 
@@ -122,12 +177,16 @@ def main():
         if "heavy_map" in stress_flags and "interpolation" in cfg.sensors["map"]["longitudinal"]:
             cfg.sensors["map"]["longitudinal"]["interpolation"]["weight"] = min(0.6, cfg.sensors["map"]["longitudinal"]["interpolation"]["weight"] * 1.5)
 
+    # Statisch inaktive Komponenten/Pfade (GNSS-Modi mit outage_prob >= 1, Mischgewicht 0, Early Detection aus)
+    dead = analyze_config(cfg)
+
     bal = simulate_balise_errors(cfg, n, rng)
     bal_long, bal_lat = simulate_balise_errors_2d(cfg, n, rng)
     map_err = simulate_map_error(cfg, n, rng)
     map_long, map_lat = simulate_map_error_2d(cfg, n, rng)
     odo = simulate_odometry_segment_error(cfg, n, rng)
-    imu = simulate_imu_bias_position_error(cfg, n, rng)
+    # Unsafe path dead (open GNSS never available): IMU bridging term is not sampled
+    imu = np.zeros(n) if dead.unsafe_path_dead else simulate_imu_bias_position_error(cfg, n, rng)
     # Separate longitudinal & lateral GNSS errors (open mode) for realistic lateral unsafe path
     gnss_open_long, gnss_open_lat = simulate_gnss_bias_noise_2d(cfg, n, rng, mode="open")
     # Mode comparison (open/urban/tunnel) longitudinal only for now
@@ -155,7 +214,11 @@ def main():
     cfg_fusion = cfg.sensors.get("fusion", {})
     fusion_mode_cfg = "rule_based" if cfg_fusion.get("rule_based", False) else "var_weight"
     fusion_mode = args.fusion_mode or fusion_mode_cfg
-    if fusion_mode == "rule_based":
+    if dead.unsafe_path_dead:
+        # No unsafe path: fused = secure (rule-based: outage fallback clamped to the interval), no fusion kernel
+        fused = np.clip(secure, -additive_p99, additive_p99) if fusion_mode == "rule_based" else secure.copy()
+        var_fused = np.full(n, np.var(fused, ddof=1))
+    elif fusion_mode == "rule_based":
         fused, var_fused = rule_based_fusion(secure, unsafe, interval_width=additive_p99, blend_steps=int(cfg_fusion.get("blend_steps", 5)))
     else:
         fused, var_fused = fuse_pair(secure, np.full(n, var_secure), unsafe, np.full(n, var_unsafe))
@@ -182,7 +245,10 @@ def main():
     # Fuse lateral separately via variance inverse weighting
     var_secure_lat = np.var(lateral_secure, ddof=1)
     var_unsafe_lat = np.var(lateral_unsafe, ddof=1)
-    fused_lat, var_fused_lat = fuse_pair(lateral_secure, np.full(n, var_secure_lat), lateral_unsafe, np.full(n, var_unsafe_lat))
+    if dead.unsafe_path_dead:
+        fused_lat, var_fused_lat = lateral_secure, np.full(n, var_secure_lat)
+    else:
+        fused_lat, var_fused_lat = fuse_pair(lateral_secure, np.full(n, var_secure_lat), lateral_unsafe, np.full(n, var_unsafe_lat))
     # 2D radial error based on fused longitudinal & fused lateral
     fused_2d = combine_2d(fused, fused_lat)
     # Add lateral & 2D metrics
@@ -192,7 +258,7 @@ def main():
     metrics_fused["p95_2d"] = float(np.percentile(fused_2d, 95))
     # Early-detection Varianzbeitrag (falls aktiv): approximativ durch Abschalten d_const berechnen
     ed_cfg = cfg.sensors.get("balise", {}).get("early_detection", {})
-    if ed_cfg.get("enabled", False):
+    if not early_detection_dead(ed_cfg):
         d_const = ed_cfg.get("d_const_m", 0.0)
         if d_const != 0.0:
             # Resample balise Fehler ohne d_const Anteil (annäherungsweise: ziehe d_const term ab und recompute secure variance diff)
@@ -236,6 +302,13 @@ def main():
     # Add mode comparison metrics
     for mname, sample in gnss_modes_samples.items():
         json_map[mname] = summarize(sample)
+    # Pruned components are never sampled (zero placeholders): report NaN instead of RMSE = P95 = 0
+    pruned = [f"gnss_{mode}" for mode in dead.dead_gnss_modes]
+    if dead.unsafe_path_dead:
+        pruned += ["imu", "gnss_open", "unsafe"]
+    pruned = [name for name in json_map if name in pruned]
+    for name in pruned:
+        json_map[name] = {k: float('nan') for k in json_map[name]}
     for name, m in json_map.items():
         payload = {"component": name, "metrics": m, **provenance}
         with (out_dir / f"metrics_{name}.json").open("w") as f:
@@ -248,6 +321,11 @@ def main():
         rows.append(r)
     df_metrics = pd.DataFrame(rows)
     df_metrics.to_csv(out_dir / "metrics_all.csv", index=False)
+    if dead.entries:
+        pd.DataFrame(dead.rows()).to_csv(out_dir / "dead_path_report.csv", index=False)
+        print(f"[info] Dead paths pruned ({len(dead.entries)}): {', '.join(e['component'] for e in dead.entries)} → dead_path_report.csv")
+    if pruned:
+        print(f"[info] Pruned components reported as NaN in metrics_all.csv: {', '.join(pruned)}")
 
     # Optionally store raw samples
     if args.save_samples:
@@ -374,35 +452,83 @@ def main():
     if args.time_series:
         import time
         t0 = time.perf_counter()
-        ts_res = simulate_time_series(
-            cfg, rng,
+        ts_kwargs = dict(
             threshold_oos=args.oos_threshold,
             with_lateral=True,
             adaptive_interval=not args.no_adaptive_interval,
             interval_update_cadence_s=float(args.interval_update_cadence_s),
             export_interval_bounds=args.export_interval_bounds,
             blend_steps=cfg.sensors.get("fusion", {}).get("blend_steps", 5),
+            metrics_cadence_s=args.metrics_cadence_s,
         )
+        if args.metric_threads and args.shards <= 1:
+            ts_kwargs["metric_threads"] = args.metric_threads
+        if args.shards <= 1:
+            ts_kwargs["metrics"] = _time_series_metrics(args)
+        elif args.ts_metrics is not None or args.oos_thresholds:
+            print("[warn] --ts-metrics/--oos-thresholds not supported with --shards (full metric set); ignored")
+        ckpt_kwargs = {}
+        if args.checkpoint_every or args.resume:
+            ckpt_kwargs = dict(
+                checkpoint_path=out_dir / "time_series_checkpoint.npz",
+                checkpoint_every=args.checkpoint_every or 1000,
+                resume=args.resume,
+            )
+        trace_spec = None  # None once dropped (--event-driven / --shards): no trace plot then
+        if args.trace_samples:
+            trace_spec = TraceSpec(out_dir / "traces", n_samples=args.trace_samples,
+                                   breach_threshold=args.trace_breach_threshold, seed=get_seed(cfg))
+            ckpt_kwargs["trace"] = trace_spec
+        if args.stream_time_series:
+            ckpt_kwargs["stream_dir"] = out_dir / "time_series_store"
+            ckpt_kwargs["resume"] = args.resume
+        if args.steady_state:
+            ckpt_kwargs["steady_state"] = SteadyStateSpec(rel_tol=args.steady_rel_tol)
+        if args.bootstrap_replicates:
+            ckpt_kwargs["bootstrap"] = BootstrapSpec(replicates=args.bootstrap_replicates)
+            if cfg.sensors.get("fusion", {}).get("rule_based", False):
+                print("[warn] bootstrap bands are conditional on the estimated secure interval (rule-based fusion): interval estimation variance not included")
+        if args.ts_attribution:
+            ckpt_kwargs["attribution"] = AttributionSpec(window_s=args.ts_attribution_window_s)
+        if args.time_block is not None and (args.event_driven or args.shards > 1):
+            print("[warn] --time-block only applies to the fixed-step time series; ignored")
+        if args.event_driven:
+            if ckpt_kwargs.pop("trace", None) is not None:
+                trace_spec = None
+                print("[warn] --trace-samples needs every step; not supported with --event-driven (ignored)")
+            ts_res = simulate_time_series_event_driven(cfg, rng, **ts_kwargs, **ckpt_kwargs)
+        elif args.shards > 1:
+            if ckpt_kwargs:
+                print("[warn] --checkpoint-every/--resume/--stream-time-series/--trace-samples/--steady-state/--bootstrap-replicates/--ts-attribution not supported with --shards; ignored")
+            trace_spec = None
+            ts_res = simulate_time_series_sharded(cfg, args.shards, seed=get_seed(cfg), **ts_kwargs)
+        else:
+            ts_res = simulate_time_series(cfg, rng, **ts_kwargs, **ckpt_kwargs, time_block_steps=args.time_block)
         t1 = time.perf_counter()
-        data_map = {
-            "t_s": ts_res.times,
-            "rmse_long": ts_res.rmse,
-            "p95_long": ts_res.p95,
-            "var_secure_long": ts_res.var_secure,
-            "var_unsafe_long": ts_res.var_unsafe,
-            "share_out_of_spec_long": ts_res.share_oos,
-        }
-        # Optional lateral / 2D
-        if ts_res.rmse_lat is not None:
-            data_map["rmse_lat"] = ts_res.rmse_lat
-        if ts_res.p95_lat is not None:
-            data_map["p95_lat"] = ts_res.p95_lat
-        if ts_res.rmse_2d is not None:
-            data_map["rmse_2d"] = ts_res.rmse_2d
-        if ts_res.p95_2d is not None:
-            data_map["p95_2d"] = ts_res.p95_2d
-        ts_df = pd.DataFrame(data_map)
+        ts_df = pd.DataFrame(time_series_columns(ts_res))
         ts_df.to_csv(out_dir / "time_series_metrics.csv", index=False)
+        # Stationarität: erkannte Einschwingdauer + stationäre Schätzer mit Konfidenzintervall
+        if ts_res.steady_state is not None:
+            ss = ts_res.steady_state
+            pd.DataFrame([{"metric": name, "detected": ss.detected, "t_detect_s": ss.t_detect_s, "warmup_s": est["warmup_s"],
+                           "mean": est["mean"], "ci_half_width": est["ci_half_width"], "rel_half_width": est["rel_half_width"],
+                           "confidence": ss.confidence} for name, est in ss.estimates.items()]
+                         ).to_csv(out_dir / "time_series_steady_state.csv", index=False)
+            if ss.detected:
+                print(f"[info] Steady state after warm-up {ss.warmup_s:.1f}s; run stopped at t={ss.t_detect_s:.1f}s")
+            else:
+                print("[info] Steady state not detected within the horizon")
+        # Zeitaufgelöste Attribution: SRC(t)/PRCC(t) je Fensterende
+        if ts_res.attribution is not None:
+            pd.DataFrame(ts_res.attribution.rows()).to_csv(out_dir / "time_series_attribution.csv", index=False)
+        # GNSS-Modus-Achse: secure Pfad einmal, unsafe Pfad + Fusion je Modus (Langformat mit Spalte mode)
+        if args.gnss_modes is not None:
+            tg0 = time.perf_counter()
+            mode_res = simulate_time_series_gnss_modes(cfg, np.random.default_rng(get_seed(cfg) + 4444),
+                                                       modes=args.gnss_modes or None, **ts_kwargs)
+            pd.concat([pd.DataFrame(time_series_columns(res)).assign(mode=name) for name, res in mode_res.items()],
+                      ignore_index=True).to_csv(out_dir / "time_series_metrics_gnss_modes.csv", index=False)
+            print(f"[info] GNSS modes {', '.join(mode_res)} simulated in {time.perf_counter() - tg0:.2f}s")
         # Fusion mode shares & switch rate
         if args.fusion_stats and ts_res.mode_share is not None:
             stats_df = pd.DataFrame({
@@ -426,15 +552,29 @@ def main():
                 "clamp_over_all_ratio": mean_uns_cl / (mean_mid + mean_uns + mean_uns_cl),
             }]
             pd.DataFrame(eff_rows).to_csv(out_dir / "fusion_mode_efficiency_summary.csv", index=False)
-            # Derived average mode residence time (approx) = dt / switch_rate where switch_rate>0 else NaN
-            if ts_res.switch_rate is not None and len(ts_res.switch_rate) > 0:
-                import numpy as _np
-                dt_local = float(cfg.sim.get("dt_s", 0.1))
-                residence = dt_local / ts_res.switch_rate
-                # Replace inf/NaN (zero switch rate) with NaN explicitly
-                bad = ~_np.isfinite(residence)
-                if bad.any():
-                    residence[bad] = _np.nan
+            # Exakte Verweildauern je Modus aus der lauflängenkodierten Modus-Timeline (zensierte Läufe separat)
+            if ts_res.mode_residence is not None:
+                res_rows = []
+                for mode_name, durations in ts_res.mode_residence.completed.items():
+                    censored = ts_res.mode_residence.censored[mode_name]
+                    res_rows.append({
+                        "mode": mode_name,
+                        "n_runs": int(durations.size),
+                        "mean_s": float(np.mean(durations)) if durations.size else float('nan'),
+                        "p50_s": float(np.percentile(durations, 50)) if durations.size else float('nan'),
+                        "p95_s": float(np.percentile(durations, 95)) if durations.size else float('nan'),
+                        "max_s": float(np.max(durations)) if durations.size else float('nan'),
+                        "n_censored": int(censored.size),
+                        "mean_censored_s": float(np.mean(censored)) if censored.size else float('nan'),
+                    })
+                pd.DataFrame(res_rows).to_csv(out_dir / "fusion_mode_residence.csv", index=False)
+            elif args.event_driven:
+                print("[info] --event-driven: no mode timeline (jumped stretches), fusion_mode_residence.csv not written")
+            elif ts_res.switch_rate is not None and len(ts_res.switch_rate) > 0:
+                # Ohne Timeline (--shards): genäherte mittlere Verweildauer = dt / switch_rate (NaN ohne Wechsel)
+                with np.errstate(divide="ignore"):
+                    residence = float(cfg.sim.get("dt_s", 0.1)) / ts_res.switch_rate
+                residence[~np.isfinite(residence)] = np.nan
                 pd.DataFrame({"t_s": ts_res.times[:len(residence)], "residence_time_est_s": residence}).to_csv(out_dir / "fusion_mode_residence_est.csv", index=False)
         if args.export_interval_bounds and ts_res.interval_lower is not None and ts_res.interval_upper is not None:
             pd.DataFrame({
@@ -448,6 +588,9 @@ def main():
             plt.figure(figsize=(6,3))
             plt.plot(ts_res.times, ts_res.rmse, label="RMSE [m]")
             plt.plot(ts_res.times, ts_res.p95, label="P95 [m]")
+            for col in ("rmse_long", "p95_long"):
+                if ts_res.ci_bands and col + "_ci_lo" in ts_res.ci_bands:
+                    plt.fill_between(ts_res.times, ts_res.ci_bands[col + "_ci_lo"], ts_res.ci_bands[col + "_ci_hi"], alpha=0.25, lw=0)
             plt.xlabel("Zeit t [s]"); plt.ylabel("Positionsfehler [m]")
             plt.title("Zeitverlauf Fusionspfad – RMSE & P95")
             plt.legend()
@@ -540,6 +683,18 @@ def main():
                 plt.legend(fontsize=8)
                 add_plot_explanation("Momentaufnahme der asymmetrischen Intervallgrenzen. Midpoint = mittlere Position, lower/upper = geschwindigkeitsabhängige Vertrauensgrenzen. Asymmetrie zeigt richtungsabhängige Unsicherheiten.")
                 plt.tight_layout(); plt.savefig(fig_dir/"fused_time_interval_bounds.png", dpi=150, bbox_inches='tight'); plt.close()
+            # Echte Zeitverläufe einzelner Samples (Trace-Recorder) statt sortierter Snapshot
+            if trace_spec is not None:
+                traces = load_traces(trace_spec.directory)
+                plt.figure(figsize=(6.4,3.2))
+                for row, color in zip(range(min(3, len(traces["sample_ids"]))), ["#1b9e77", "#d95f02", "#7570b3"]):
+                    plt.plot(traces["t_s"], traces["fused"][row], color=color, label=f"fused #{traces['sample_ids'][row]}")
+                    plt.fill_between(traces["t_s"], traces["lower"][row], traces["upper"][row], color=color, alpha=0.15)
+                plt.xlabel("Zeit t [s]"); plt.ylabel("Fehlerraum [m]")
+                plt.title("Fusionsfehler & Intervallgrenzen einzelner Samples")
+                plt.legend(fontsize=8)
+                add_plot_explanation("Vollständige Zeitverläufe ausgewählter Reservoir-Samples: fusionierter Fehler (Linie) und sicheres Intervall [lower, upper] (Band).")
+                plt.tight_layout(); plt.savefig(fig_dir/"fused_trace_interval_bounds.png", dpi=150, bbox_inches='tight'); plt.close()
         # Optional performance benchmark vs. legacy
         if args.perf:
             # Short legacy run (disable rule based & adaptive)
@@ -0,0 +1,133 @@
+"""Static dead-path analysis: configuration components that cannot contribute to any result.
+
+A configuration can switch components off without removing them:
+
+* a GNSS mode with `outage_prob >= 1` never delivers a fix; if the open (baseline) mode is dead,
+  the unsafe path (GNSS + IMU) of the static epoch is unavailable and the fused error is the
+  secure error (config comment: "System nutzt nur sicheren Pfad");
+* a mixture tail with `weight: 0` (balise multipath, map interpolation, GNSS multipath) never
+  replaces the base value;
+* `balise.early_detection` with `enabled: false` (or d_const = c1 = 0) adds no term.
+
+The predicates below are used by the samplers (`sim_sensors`, `time_sim`) to skip the draws of
+dead components; `analyze_config` collects them into a `DeadPathReport` whose `rows()` are the
+pruning report and whose `is_dead` filters sensitivity parameters below dead components.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Mapping, Sequence, Tuple
+
+from .config import Config
+
+# Mixture tails of the error model (dotted config paths)
+TAIL_PATHS = ("sensors.balise.multipath_tail_m", "sensors.map.longitudinal.interpolation")
+
+
+def gnss_mode_dead(mode_cfg: Mapping[str, Any]) -> bool:
+    """True if the mode never delivers a fix (outage_prob >= 1)."""
+    return float(mode_cfg.get("outage_prob", 0.0)) >= 1.0
+
+
+def tail_dead(spec: Mapping[str, Any] | None) -> bool:
+    """True if a mixture tail never replaces the base value (missing or weight 0)."""
+    return spec is None or float(spec.get("weight", 1.0)) <= 0.0
+
+
+def early_detection_dead(ed_cfg: Mapping[str, Any] | None) -> bool:
+    """True if the early-detection term is identically zero (disabled, or d_const = c1 = 0)."""
+    ed_cfg = ed_cfg or {}
+    if not ed_cfg.get("enabled", False):
+        return True
+    return float(ed_cfg.get("d_const_m", 0.0)) == 0.0 and float(ed_cfg.get("c1_ms_per_mps", 0.0)) == 0.0
+
+
+@dataclass
+class DeadPathReport:
+    """Statically inactive components of one configuration."""
+    dead_gnss_modes: Tuple[str, ...] = ()
+    unsafe_path_dead: bool = False          # open mode dead → static unsafe path (GNSS + IMU) unavailable
+    zero_weight_tails: Tuple[str, ...] = ()  # dotted paths of mixture tails with weight 0
+    early_detection_dead: bool = False
+    entries: List[Dict[str, str]] = field(default_factory=list)
+
+    def dead_prefixes(self) -> Tuple[str, ...]:
+        prefixes = [f"sensors.gnss.modes.{mode}." for mode in self.dead_gnss_modes]
+        prefixes += [path + "." for path in self.zero_weight_tails]
+        if self.early_detection_dead:
+            prefixes.append("sensors.balise.early_detection.")
+        return tuple(prefixes)
+
+    def is_dead(self, dotted: str) -> bool:
+        """True if parameter `dotted` lies below a dead component (its ±delta perturbation has no effect).
+
+        The switches themselves (outage_prob, enabled) are never dead: perturbing them can revive the component.
+        """
+        if dotted.endswith((".outage_prob", ".enabled")):
+            return False
+        return any(dotted.startswith(prefix) for prefix in self.dead_prefixes())
+
+    def rows(self) -> List[Dict[str, str]]:
+        """Pruning report (component, reason, pruned work), one row per dead component."""
+        return list(self.entries)
+
+
+def _get(root: Mapping[str, Any], dotted: str) -> Any:
+    cur: Any = root
+    for key in dotted.split("."):
+        if not isinstance(cur, Mapping) or key not in cur:
+            return None
+        cur = cur[key]
+    return cur
+
+
+def analyze_config(cfg: Config) -> DeadPathReport:
+    """Detect statically inactive components and paths of `cfg`."""
+    report = DeadPathReport()
+    modes = cfg.sensors.get("gnss", {}).get("modes", {})
+    dead_modes = tuple(name for name, mode_cfg in modes.items() if gnss_mode_dead(mode_cfg))
+    report.dead_gnss_modes = dead_modes
+    for name in dead_modes:
+        report.entries.append({
+            "component": f"sensors.gnss.modes.{name}",
+            "reason": f"outage_prob {float(modes[name].get('outage_prob', 0.0)):g} >= 1 (never a fix)",
+            "pruned": "bias/noise/multipath/outage draws (static); per-step outage and fix draws (time series)",
+        })
+    if "open" in dead_modes:
+        report.unsafe_path_dead = True
+        report.entries.append({
+            "component": "unsafe_path",
+            "reason": "open GNSS mode dead → static unsafe path (GNSS + IMU) unavailable",
+            "pruned": "IMU sampling, variance weighting / rule fusion (fused = secure), lateral fusion",
+        })
+    tails = [path for path in TAIL_PATHS if _get(cfg.raw, path) is not None]
+    tails += [f"sensors.gnss.modes.{name}.multipath_tail" for name, mode_cfg in modes.items()
+              if "multipath_tail" in mode_cfg and name not in dead_modes]
+    report.zero_weight_tails = tuple(path for path in tails if tail_dead(_get(cfg.raw, path)))
+    for path in report.zero_weight_tails:
+        report.entries.append({"component": path, "reason": "mixture weight 0", "pruned": "tail and mixture mask draws"})
+    ed_cfg = cfg.sensors.get("balise", {}).get("early_detection")
+    if ed_cfg is not None and early_detection_dead(ed_cfg):
+        report.early_detection_dead = True
+        report.entries.append({
+            "component": "sensors.balise.early_detection",
+            "reason": "disabled" if not ed_cfg.get("enabled", False) else "d_const_m = c1_ms_per_mps = 0",
+            "pruned": "early-detection term and impact estimate; its sensitivity parameters",
+        })
+    return report
+
+
+def inactive_parameters(cfg: Config, params: Sequence[str], report: DeadPathReport | None = None) -> List[str]:
+    """Parameters of `params` below dead components (no effect on any result)."""
+    report = report if report is not None else analyze_config(cfg)
+    return [p for p in params if report.is_dead(p)]
+
+
+__all__ = [
+    "DeadPathReport",
+    "analyze_config",
+    "inactive_parameters",
+    "gnss_mode_dead",
+    "tail_dead",
+    "early_detection_dead",
+]
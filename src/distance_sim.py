@@ -0,0 +1,251 @@
+"""Distance-domain time-series engine (secure path advanced per metre, GNSS per time tick).
+
+Odometry drift (σ ∝ sqrt(Δs_km)), balise spacing and map errors are distance-indexed. The
+time loop of `time_sim` advances every sample by v·dt per step: slow samples burn steps
+without moving, fast samples jump balises by up to v·dt. Here every sample walks its own
+distance grid (`ds_m`, e.g. 1 m) and carries its time of arrival t = d / v:
+
+* distance phase: drift increments and balise events per distance step (events exactly at
+  the spacing); a sample is only stepped until it reaches the time of the last output of the
+  current window, so slow samples take few steps;
+* time-of-arrival bookkeeping: the secure state after the last distance step with arrival
+  time <= t_r is the state at output instant t_r (value copied when the sample passes t_r);
+* time phase (per output instant, in time order): GNSS hold-last-valid over the elapsed ticks
+  (fresh fix with probability 1 - p_out^m for m ticks), secure interval, fusion and metrics
+  exactly as in the time loop (same interval estimators, same joint fusion kernel).
+
+Outputs are buffered in windows of instants (≈ `window_values` secure values), so memory is
+O(window) and independent of the horizon. `compare_distance_engine` reports cost and metric
+equivalence against `simulate_time_series`.
+"""
+from __future__ import annotations
+
+import time
+from typing import Any, Dict
+
+import numpy as np
+
+from .config import Config
+from .distributions import registry
+from .fusion import joint_fusion_step, resolve_backend, RuleFusionState
+from .metrics import multi_percentile
+from .sim_sensors import balise_speeds, simulate_balise_errors_2d
+from .time_sim import (
+    TimeSeriesResult,
+    _gnss_noise,
+    _make_lane,
+    _prepare_static_components,
+    _update_lane_interval,
+    simulate_time_series,
+)
+
+
+def simulate_time_series_distance(cfg: Config, rng: np.random.Generator, ds_m: float = 1.0, threshold_oos: float = 0.2,
+                                  with_lateral: bool = True, adaptive_interval: bool = True,
+                                  interval_update_cadence_s: float = 1.0, blend_steps: int | None = None,
+                                  metrics_cadence_s: float | None = None,
+                                  window_values: int = 1 << 21) -> TimeSeriesResult:
+    """Distance-domain counterpart of `simulate_time_series` (same result layout, no interval growth series).
+
+    `n_iterations` counts distance iterations plus output instants. Fusion blending runs over
+    consecutive output instants, i.e. only when the metric cadence equals dt_s.
+    """
+    sim = cfg.sim
+    dt = float(sim.get("dt_s", 0.1))
+    horizon = float(sim.get("time_horizon_s", 3600.0))
+    n_steps = int(horizon / dt)
+    n = int(sim.get("N_samples", 1000))
+    if blend_steps is None:
+        blend_steps = int(cfg.sensors.get("fusion", {}).get("blend_steps", 5))
+    if metrics_cadence_s is None:
+        metrics_cadence_s = float(sim.get("metrics_cadence_s", dt))
+    record_every = max(1, int(round(metrics_cadence_s / dt)))
+    n_records = n_steps // record_every
+    t_rec = dt * record_every * (np.arange(n_records) + 1)
+    update_records = max(1, int(round(interval_update_cadence_s / dt)) // record_every)
+
+    lane = _make_lane(cfg, rng, with_lateral, None)
+    # Static draws in the order of the time loop (speeds, static components, initial GNSS fix)
+    speeds = rng.uniform(0.0, 16.7, size=n)
+    map_err_long, map_err_lat, gnss_bias_long, gnss_bias_lat, _ = _prepare_static_components(cfg, n, rng)
+    gnss = gnss_bias_long + _gnss_noise(lane, n)
+    gnss_lat = gnss_bias_lat + registry.sample(lane.gnss_noise_lat_spec, n, rng) if with_lateral else None
+
+    # Distance state per sample
+    balise_spacing = 400.0
+    sigma_step = lane.drift_per_km * np.sqrt(ds_m / 1000.0)
+    with np.errstate(divide="ignore"):
+        dt_per_step = np.where(speeds > 0, ds_m / speeds, np.inf)  # time to cover one distance step
+    n_done = np.zeros(n, dtype=np.int64)  # completed distance steps
+    dist_since_balise = np.zeros(n)
+    odo_drift = np.zeros(n)
+    last_balise_error = np.zeros(n)
+    last_balise_lat_error = np.zeros(n)
+    n_dist_iter = 0
+
+    # Time state (fusion / metrics)
+    n_axes = 2 if with_lateral else 1
+    rule_axes = np.array((lane.use_rule_based, lane.lateral_rule_based)[:n_axes])
+    outage_fallback = np.array((lane.outage_fallback, "midpoint")[:n_axes])
+    backend = resolve_backend(str(cfg.sensors.get("fusion", {}).get("backend", "numpy")))
+    state = RuleFusionState(fused=np.zeros((n_axes, n)), mode=np.zeros((n_axes, n), dtype=int),
+                            blend_left=np.zeros((n_axes, n), dtype=int))
+    fusion_blend = blend_steps if record_every == 1 else 1
+    p_fresh_held = 1.0 - lane.p_out ** (record_every - 1)  # earlier fresh fix within the elapsed ticks
+    secure3 = np.zeros((n_axes, n))
+    unsafe3 = np.zeros((n_axes, n))
+    lower3 = np.zeros((n_axes, n))
+    upper3 = np.zeros((n_axes, n))
+    var_s = np.full(n_axes, np.nan)
+    var_u = np.full(n_axes, np.nan)
+
+    out: Dict[str, np.ndarray] = {key: np.zeros(n_records) for key in
+                                  ("rmse", "p95", "var_secure", "var_unsafe", "share_oos", "mid", "uns", "uns_cl", "switch")}
+    if with_lateral:
+        out.update({key: np.zeros(n_records) for key in ("rmse_lat", "p95_lat", "rmse_2d", "p95_2d")})
+
+    window = max(1, min(n_records, int(window_values) // max(1, n)))
+    for r0 in range(0, n_records, window):
+        r1 = min(n_records, r0 + window)
+        n_win = r1 - r0
+        sec_win = np.empty((n_win, n))
+        lat_win = np.empty((n_win, n)) if with_lateral else None
+        dist_win = np.empty((n_win, n))
+        t_end = t_rec[r1 - 1]
+        tau = dt * record_every
+        pending = np.arange(n)
+        # --- distance phase: copy the state into every instant passed, step samples up to the window end
+        while pending.size:
+            t_cur = np.where(n_done[pending] > 0, n_done[pending] * dt_per_step[pending], 0.0)  # v = 0: never moves
+            t_next = t_cur + dt_per_step[pending]
+            # Instants r with t_cur <= t_rec[r] < t_next hold the current state (r in window)
+            r_lo = np.clip(np.ceil(t_cur / tau - 1e-9).astype(np.int64) - 1, r0, r1)
+            with np.errstate(invalid="ignore"):
+                r_hi = np.clip(np.ceil(np.minimum(t_next, 2.0 * horizon) / tau - 1e-9).astype(np.int64) - 1, r0, r1)
+            counts = np.maximum(r_hi - r_lo, 0)
+            if counts.any():
+                rows = np.repeat(pending, counts)
+                starts = np.repeat(r_lo - r0, counts)
+                offs = np.arange(rows.size) - np.repeat(np.cumsum(counts) - counts, counts)
+                recs = starts + offs
+                sec_win[recs, rows] = last_balise_error[rows] + map_err_long[rows] + odo_drift[rows]
+                dist_win[recs, rows] = dist_since_balise[rows]
+                if with_lateral:
+                    lat_win[recs, rows] = last_balise_lat_error[rows] + map_err_lat[rows]
+            # Step the samples whose next arrival still lies inside the window
+            pending = pending[t_next <= t_end]
+            if not pending.size:
+                break
+            n_dist_iter += 1
+            n_done[pending] += 1
+            dist_since_balise[pending] += ds_m
+            odo_drift[pending] += rng.normal(0.0, sigma_step, size=pending.size)
+            events = pending[dist_since_balise[pending] >= balise_spacing]
+            if events.size:
+                bal_long, bal_lat = simulate_balise_errors_2d(cfg, events.size, rng, speeds=balise_speeds(cfg, speeds[events]))
+                last_balise_error[events] = bal_long
+                last_balise_lat_error[events] = bal_lat
+                odo_drift[events] = 0.0
+                dist_since_balise[events] = 0.0
+
+        # --- time phase: GNSS, interval, fusion and metrics per instant (time order)
+        for j in range(n_win):
+            r = r0 + j
+            if lane.gnss_dead:  # permanent outage: held fix, no draws
+                outage = np.ones(n, dtype=bool)
+                fresh = np.zeros(n, dtype=bool)
+            else:
+                outage = rng.random(n) < lane.p_out
+                fresh = ~outage
+                if record_every > 1:
+                    fresh |= rng.random(n) < p_fresh_held
+            m = int(fresh.sum())
+            if m:
+                gnss[fresh] = gnss_bias_long[fresh] + _gnss_noise(lane, m)
+                if with_lateral:
+                    gnss_lat[fresh] = gnss_bias_lat[fresh] + registry.sample(lane.gnss_noise_lat_spec, m, rng)
+            secure = sec_win[j]
+            secure3[0] = secure
+            unsafe3[0] = gnss
+            if lane.use_rule_based:
+                _update_lane_interval(lane, secure, speeds, dist_win[j], r, update_records, adaptive_interval)
+                lower3[0], upper3[0] = lane.lower, lane.upper
+            var_s[0] = np.var(secure, ddof=1)
+            var_u[0] = np.var(gnss, ddof=1)
+            if with_lateral:
+                secure3[1] = lat_win[j]
+                unsafe3[1] = gnss_lat
+                q_lat = float(multi_percentile(np.abs(lat_win[j]), [99])[0])
+                lower3[1], upper3[1] = -q_lat, q_lat
+                var_s[1] = np.var(lat_win[j], ddof=1)
+                var_u[1] = np.var(gnss_lat, ddof=1)
+            block, state, meta = joint_fusion_step(
+                secure3, unsafe3, lower3, upper3, outage, state, blend_steps=fusion_blend,
+                outage_fallback=outage_fallback, rule_axes=rule_axes, var_secure=var_s, var_unsafe=var_u, backend=backend)
+            rows_m = block if with_lateral else block[:1]
+            rmse_rows = np.sqrt(np.mean(rows_m ** 2, axis=-1))
+            p95_rows = multi_percentile(rows_m, [95])[0]
+            out["rmse"][r], out["p95"][r] = rmse_rows[0], p95_rows[0]
+            if with_lateral:
+                out["rmse_lat"][r], out["rmse_2d"][r] = rmse_rows[1], rmse_rows[2]
+                out["p95_lat"][r], out["p95_2d"][r] = p95_rows[1], p95_rows[2]
+            out["var_secure"][r], out["var_unsafe"][r] = var_s[0], var_u[0]
+            out["share_oos"][r] = np.mean(np.abs(block[0]) > threshold_oos)
+            out["mid"][r] = meta["n_midpoint"][0] / n
+            out["uns"][r] = meta["n_unsafe"][0] / n
+            out["uns_cl"][r] = meta["n_unsafe_clamped"][0] / n
+            out["switch"][r] = meta["n_switch"][0] / n
+
+    return TimeSeriesResult(
+        times=t_rec,
+        rmse=out["rmse"],
+        p95=out["p95"],
+        var_secure=out["var_secure"],
+        var_unsafe=out["var_unsafe"],
+        share_oos=out["share_oos"],
+        rmse_lat=out.get("rmse_lat"),
+        p95_lat=out.get("p95_lat"),
+        rmse_2d=out.get("rmse_2d"),
+        p95_2d=out.get("p95_2d"),
+        mode_share={"midpoint": out["mid"], "unsafe": out["uns"], "unsafe_clamped": out["uns_cl"]} if lane.use_rule_based else None,
+        switch_rate=out["switch"] if lane.use_rule_based else None,
+        n_iterations=n_dist_iter + n_records,
+    )
+
+
+def compare_distance_engine(cfg: Config, seed: int, ds_m: float = 1.0, metrics_cadence_s: float | None = None,
+                            **kwargs: Any) -> Dict[str, Any]:
+    """Cost and metric equivalence of the distance engine vs. the time loop (independent streams, same seed base).
+
+    Returns runtimes, loop iterations and per metric the time-averaged values of both engines with
+    their relative difference and the maximum absolute difference of the series.
+    """
+    t0 = time.perf_counter()
+    ref = simulate_time_series(cfg, np.random.default_rng(seed), metrics_cadence_s=metrics_cadence_s, **kwargs)
+    t1 = time.perf_counter()
+    res = simulate_time_series_distance(cfg, np.random.default_rng(seed + 1), ds_m=ds_m,
+                                        metrics_cadence_s=metrics_cadence_s, **kwargs)
+    t2 = time.perf_counter()
+    report: Dict[str, Any] = {
+        "runtime_time_s": t1 - t0,
+        "runtime_distance_s": t2 - t1,
+        "speedup": (t1 - t0) / (t2 - t1) if t2 > t1 else float("nan"),
+        "iterations_time": ref.n_iterations,
+        "iterations_distance": res.n_iterations,
+        "metrics": {},
+    }
+    for field in ("rmse", "p95", "rmse_lat", "p95_lat", "rmse_2d", "p95_2d", "var_secure", "var_unsafe", "share_oos"):
+        a, b = getattr(ref, field), getattr(res, field)
+        if a is None or b is None:
+            continue
+        mean_a, mean_b = float(np.mean(a)), float(np.mean(b))
+        report["metrics"][field] = {
+            "time": mean_a,
+            "distance": mean_b,
+            "rel_diff": (mean_b - mean_a) / mean_a if mean_a != 0 else float("nan"),
+            "max_abs_diff": float(np.max(np.abs(a - b))),
+        }
+    return report
+
+
+__all__ = ["simulate_time_series_distance", "compare_distance_engine"]
@@ -24,11 +24,13 @@ activated (documented in decisions.log).
 from __future__ import annotations
 
 import numpy as np
-from typing import Tuple, Dict, Any
+from typing import Tuple, Dict, Any, List, Sequence
 from dataclasses import dataclass
 
 import math
 
+from .metrics import multi_percentile
+
 
 def fuse_pair(x_a: np.ndarray, var_a: np.ndarray, x_b: np.ndarray, var_b: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
     """Inverse variance weighting (legacy baseline)."""
@@ -95,10 +97,15 @@ class RuleFusionState:
     Encoded mode (0=midpoint, 1=unsafe, 2=unsafe_clamped).
   blend_left : np.ndarray[int]
     Remaining blend steps (0 => no active blend) for samples undergoing transition.
+  blend_start : np.ndarray | None
+    Fused value at the start of the current transition (per-step delta cap); set lazily.
+
+  Arrays are (n,) for a single axis or (A, n) for axis-stacked fusion (`joint_fusion_step`).
   """
   fused: np.ndarray
   mode: np.ndarray
   blend_left: np.ndarray
+  blend_start: np.ndarray | None = None
 
 
 MODE_MIDPOINT = 0
@@ -146,7 +153,7 @@ def compute_secure_interval_bounds(
   inds = np.clip(np.digitize(speeds, edges) - 1, 0, n_bins - 1)
 
   # Global fallback prepared (also initialises arrays to safe values for empty bins)
-  q_global = float(np.percentile(np.abs(secure), quantile_high_pct))
+  q_global = float(multi_percentile(np.abs(secure), [quantile_high_pct])[0])
   lower = -np.full(n, q_global)
   upper = np.full(n, q_global)
   lower_global = -q_global
@@ -164,9 +171,8 @@ def compute_secure_interval_bounds(
       # keep global fallback for this bin
       fallback = True
       continue
-    seg = secure[mask]
-    q_low = float(np.percentile(seg, quantile_low_pct))
-    q_high = float(np.percentile(seg, quantile_high_pct))
+    # Both bin quantiles from one partition of the segment
+    q_low, q_high = (float(v) for v in multi_percentile(secure[mask], [quantile_low_pct, quantile_high_pct]))
     if q_low > q_high:  # numeric safeguard
       q_low, q_high = -abs(q_high), abs(q_high)
     lower[mask] = q_low
@@ -193,6 +199,39 @@ def compute_secure_interval_bounds(
   return lower, upper, meta
 
 
+def _outage_mode_codes(outage_fallback: str | Sequence[str] | np.ndarray) -> int | np.ndarray:
+  """Map outage fallback spec to mode code(s): scalar for a str, else per leading row (shape (..., 1))."""
+  if isinstance(outage_fallback, str):
+    return MODE_UNSAFE_CLAMPED if outage_fallback == "secure" else MODE_MIDPOINT
+  names = np.asarray(outage_fallback)
+  return np.where(names == "secure", MODE_UNSAFE_CLAMPED, MODE_MIDPOINT)[..., None]
+
+
+FUSION_BACKENDS = ("numpy", "numba", "auto")
+_numba_fallback_warned = False
+
+
+def resolve_backend(backend: str) -> str:
+  """Effective fusion backend: 'numba' only if requested ('numba' | 'auto') and importable, else 'numpy'."""
+  global _numba_fallback_warned
+  if backend not in FUSION_BACKENDS:
+    raise ValueError(f"Unknown fusion backend '{backend}' (expected {'|'.join(FUSION_BACKENDS)})")
+  if backend == "numpy":
+    return "numpy"
+  from .fusion_numba import NUMBA_AVAILABLE
+  if NUMBA_AVAILABLE:
+    return "numba"
+  if backend == "numba" and not _numba_fallback_warned:
+    print("[warn] numba not installed – fusion backend falls back to numpy reference")
+    _numba_fallback_warned = True
+  return "numpy"
+
+
+def _count_per_axis(mask: np.ndarray):
+  c = np.count_nonzero(mask, axis=-1)
+  return int(c) if np.ndim(c) == 0 else c
+
+
 def rule_based_fusion_step(
   secure: np.ndarray,
   unsafe: np.ndarray,
@@ -201,54 +240,63 @@ def rule_based_fusion_step(
   outage: np.ndarray,
   state: RuleFusionState,
   blend_steps: int = 5,
-  outage_fallback: str = "midpoint",
+  outage_fallback: str | Sequence[str] = "midpoint",
+  backend: str = "numpy",
+  elapsed_steps: int | np.ndarray | None = None,
 ) -> Tuple[np.ndarray, RuleFusionState, Dict[str, Any]]:
   """One time-step update for rule-based fusion (stateful).
 
   Parameters
   ----------
-  secure, unsafe : arrays (n,)
-  lower, upper : arrays (n,) interval bounds (may be asymmetric)
-  outage : bool array (n,) True where unsafe path unavailable
-  state : RuleFusionState
+  secure, unsafe : arrays (n,) or axis-stacked (A, n)
+  lower, upper : arrays broadcastable to secure (per-sample, per-axis (A, 1) or scalar bounds)
+  outage : bool array broadcastable to secure, True where unsafe path unavailable
+  state : RuleFusionState (arrays of secure's shape)
   blend_steps : int >=1 number of steps for linear smoothing of transitions
+  outage_fallback : 'midpoint' | 'secure', or an array of these per leading row for stacked input
+  backend : 'numpy' (reference) | 'numba' (compiled single-pass kernel, bit-identical) | 'auto'
+  elapsed_steps : base steps since the previous call, scalar or broadcastable to secure (None: 1).
+    Blends are counted in base steps (wall-clock time blend_steps·dt): a running blend advances
+    by the elapsed steps, a blend started in this call by one step. Uses the NumPy kernel.
 
   Returns
   -------
   fused : np.ndarray
   new_state : RuleFusionState
-  meta : dict with counts per mode & switches
+  meta : dict with counts per mode & switches (ints for 1-D input, per-axis arrays for stacked input)
   """
-  n = secure.shape[0]
-  assert unsafe.shape[0] == n
+  shape = secure.shape
+  assert unsafe.shape == shape
+  # Scalar / per-axis bounds → read-only broadcast views, no per-step allocation
+  lower = np.broadcast_to(np.asarray(lower, dtype=float), shape)
+  upper = np.broadcast_to(np.asarray(upper, dtype=float), shape)
+  outage = np.broadcast_to(outage, shape)
   fused_prev = state.fused
   mode_prev = state.mode
   blend_left = state.blend_left
 
+  if backend != "numpy" and elapsed_steps is None and resolve_backend(backend) == "numba":
+    from .fusion_numba import rule_step_numba
+    if blend_steps > 1 and state.blend_start is None:
+      state.blend_start = np.copy(fused_prev)
+    fused, mode, counts = rule_step_numba(
+      secure, unsafe, lower, upper, outage, _outage_mode_codes(outage_fallback), fused_prev, mode_prev, blend_left,
+      state.blend_start if state.blend_start is not None else np.empty(shape), blend_steps)
+    meta = {key: (int(counts[..., j]) if counts.ndim == 1 else counts[..., j])
+            for j, key in enumerate(("n_midpoint", "n_unsafe", "n_unsafe_clamped", "n_switch"))}
+    return fused, RuleFusionState(fused=fused, mode=mode, blend_left=blend_left, blend_start=state.blend_start), meta
+
   # Determine target modes
   unsafe_in_bounds = (~outage) & (unsafe >= lower) & (unsafe <= upper)
-  # Mode selection
-  mode = np.empty(n, dtype=int)
-  # Unsafe accepted
+  # Available but out-of-bounds -> unsafe_clamped; accepted -> unsafe; outage -> selectable fallback
+  # ('secure': treat like unsafe_clamped, default: midpoint)
+  mode = np.full(shape, MODE_UNSAFE_CLAMPED, dtype=int)
   mode[unsafe_in_bounds] = MODE_UNSAFE
-  # Outage handling selectable
-  if outage_fallback == "secure":
-    # treat outage samples like unsafe_clamped (secure path but possibly clamped)
-    mode[outage] = MODE_UNSAFE_CLAMPED
-  else:  # default midpoint
-    mode[outage] = MODE_MIDPOINT
-  # Remaining (available but out-of-bounds) -> unsafe_clamped (secure clamped)
-  mask_remaining = ~(unsafe_in_bounds | outage)
-  mode[mask_remaining] = MODE_UNSAFE_CLAMPED
-
-  # Midpoint values
+  mode = np.where(outage, _outage_mode_codes(outage_fallback), mode)
+
+  # Targets: unsafe path clamped to the interval (UNSAFE / UNSAFE_CLAMPED), midpoint otherwise
   midpoint = 0.5 * (lower + upper)
-  target = np.empty(n)
-  target[mode == MODE_UNSAFE] = np.clip(unsafe[mode == MODE_UNSAFE], lower[mode == MODE_UNSAFE], upper[mode == MODE_UNSAFE])
-  # Clamp UNSAFE path when out-of-bounds to nearest boundary (was secure path previously)
-  target[mode == MODE_UNSAFE_CLAMPED] = np.clip(unsafe[mode == MODE_UNSAFE_CLAMPED], lower[mode == MODE_UNSAFE_CLAMPED], upper[mode == MODE_UNSAFE_CLAMPED])
-  # Midpoint
-  target[mode == MODE_MIDPOINT] = midpoint[mode == MODE_MIDPOINT]
+  target = np.where(mode == MODE_MIDPOINT, midpoint, np.clip(unsafe, lower, upper))
 
   # Transition detection
   changed = mode != mode_prev
@@ -259,40 +307,34 @@ def rule_based_fusion_step(
   force_clamp = (mode == MODE_UNSAFE_CLAMPED) & newly_changed
   blend_left[force_clamp] = 0
 
-  fused = np.empty(n)
   if blend_steps <= 1:
     fused = target
     blend_left[:] = 0
   else:
-    # Linear interpolate for samples still blending
+    # Linear interpolation for samples still blending (mask-based, shape agnostic)
     active = blend_left > 0
-    # For active, compute alpha from remaining steps
-    # When blend_left==blend_steps -> alpha=0 (start), when reaches 1 -> alpha≈(blend_steps-1)/blend_steps
-    alpha = 1.0 - (blend_left[active] - 1) / blend_steps
-    proposed = (1 - alpha) * fused_prev[active] + alpha * target[active]
-    # Enforce theoretical max per-step delta <= |target-start|/blend_steps (applied w.r.t original start per transition)
-    # Approximate original start as previous fused when blend counter just initialized (blend_left==blend_steps)
-    start_mask = blend_left[active] == blend_steps
-    # store starts for those newly active
-    if not hasattr(state, 'blend_start'):
-      state.blend_start = np.copy(fused_prev)  # type: ignore
-    # update start where transition just began
-    if np.any(start_mask):
-      # Map active indices
-      active_idx = np.nonzero(active)[0]
-      state.blend_start[active_idx[start_mask]] = fused_prev[active_idx[start_mask]]  # type: ignore
-    # Compute per-step cap
-    active_idx = np.nonzero(active)[0]
-    start_vals = state.blend_start[active_idx]  # type: ignore
-    total_delta = target[active] - start_vals
-    max_step = np.abs(total_delta) / max(1, blend_steps)
-    real_delta = proposed - fused_prev[active]
-    capped = np.clip(real_delta, -max_step, max_step)
-    fused[active] = fused_prev[active] + capped
+    if elapsed_steps is None:
+      step = 1
+      # When blend_left==blend_steps -> alpha=1/blend_steps (start), when reaches 1 -> alpha=1
+      alpha = 1.0 - (blend_left - 1) / blend_steps
+    else:
+      # Wall-clock blend: running blends advance by the elapsed base steps, new ones by one step
+      step = np.where(newly_changed, 1, np.broadcast_to(np.asarray(elapsed_steps, dtype=int), shape))
+      alpha = np.minimum(1.0 - (blend_left - step) / blend_steps, 1.0)
+    proposed = (1 - alpha) * fused_prev + alpha * target
+    # Enforce theoretical max per-step delta <= |target-start|/blend_steps (w.r.t. start of the transition)
+    if state.blend_start is None:
+      state.blend_start = np.copy(fused_prev)
+    start_mask = active & (blend_left == blend_steps)
+    state.blend_start[start_mask] = fused_prev[start_mask]
+    max_step = np.abs(target - state.blend_start) / max(1, blend_steps)
+    if elapsed_steps is not None:
+      max_step = max_step * step
+    capped = np.clip(proposed - fused_prev, -max_step, max_step)
     # Non-active simply target
-    fused[~active] = target[~active]
+    fused = np.where(active, fused_prev + capped, target)
     # Decrement counters (but not below 0)
-    blend_left[active] -= 1
+    blend_left[active] -= step if elapsed_steps is None else step[active]
     blend_left[blend_left < 0] = 0
 
   # Safety clamp
@@ -300,23 +342,106 @@ def rule_based_fusion_step(
 
   # Stats
   meta = {
-    "n_midpoint": int(np.sum(mode == MODE_MIDPOINT)),
-    "n_unsafe": int(np.sum(mode == MODE_UNSAFE)),
-    "n_unsafe_clamped": int(np.sum(mode == MODE_UNSAFE_CLAMPED)),
-    "n_switch": int(np.sum(changed)),
+    "n_midpoint": _count_per_axis(mode == MODE_MIDPOINT),
+    "n_unsafe": _count_per_axis(mode == MODE_UNSAFE),
+    "n_unsafe_clamped": _count_per_axis(mode == MODE_UNSAFE_CLAMPED),
+    "n_switch": _count_per_axis(changed),
   }
 
-  new_state = RuleFusionState(fused=fused, mode=mode, blend_left=blend_left)
-  # persist blend_start if present
-  if hasattr(state, 'blend_start'):
-    new_state.blend_start = state.blend_start  # type: ignore
+  new_state = RuleFusionState(fused=fused, mode=mode, blend_left=blend_left, blend_start=state.blend_start)
   return fused, new_state, meta
 
 
+def joint_fusion_step(
+  secure: np.ndarray,
+  unsafe: np.ndarray,
+  lower: np.ndarray,
+  upper: np.ndarray,
+  outage: np.ndarray,
+  state: RuleFusionState,
+  blend_steps: int = 5,
+  outage_fallback: Sequence[str] | np.ndarray = ("midpoint", "midpoint"),
+  rule_axes: Sequence[bool] | np.ndarray = (True, True),
+  var_secure: np.ndarray | None = None,
+  var_unsafe: np.ndarray | None = None,
+  backend: str = "numpy",
+  elapsed_steps: int | np.ndarray | None = None,
+) -> Tuple[np.ndarray, RuleFusionState, Dict[str, np.ndarray]]:
+  """Axis-stacked fusion step for A axes (A=2: longitudinal, lateral) in one call.
+
+  Optional leading lane dimensions (e.g. scenarios) are supported: arrays are (..., A, n)
+  and all per-axis settings broadcast against the leading shape (..., A).
+
+  Parameters
+  ----------
+  secure, unsafe : arrays (..., A, n)
+  lower, upper : bounds broadcastable to (..., A, n) (used by rule-based rows only)
+  outage : bool array (..., n), shared by all axes of a lane
+  state : RuleFusionState with (..., A, n) arrays (rows of variance-weighted axes are left untouched)
+  outage_fallback : per-row outage fallback ('midpoint' | 'secure'), broadcast to (..., A)
+  rule_axes : per-row flag, True -> stateful rule-based, False -> inverse-variance weighting
+  var_secure, var_unsafe : scalar variances per row (..., A) for variance-weighted rows (empirical if None)
+  backend : rule-based kernel backend (see `rule_based_fusion_step`)
+  elapsed_steps : base steps since the previous call, scalar or per sample (..., n) (see `rule_based_fusion_step`)
+
+  Returns
+  -------
+  block : np.ndarray (..., A+1, n)
+    Rows 0..A-1 fused error per axis, row A radial error sqrt(sum of squares over axes).
+  new_state : RuleFusionState
+  meta : dict of mode / switch counts per row (..., A) (zero for variance-weighted rows)
+  """
+  lead = secure.shape[:-1]
+  n_axes, n = secure.shape[-2:]
+  rule = np.broadcast_to(np.asarray(rule_axes, dtype=bool), lead)
+  fallback = np.broadcast_to(np.asarray(outage_fallback), lead)
+  outage = np.broadcast_to(np.asarray(outage)[..., None, :], secure.shape)
+  elapsed = None if elapsed_steps is None else np.broadcast_to(
+    np.asarray(elapsed_steps)[..., None, :] if np.ndim(elapsed_steps) else elapsed_steps, secure.shape)
+  block = np.empty(secure.shape[:-2] + (n_axes + 1, n))
+  fused = block[..., :n_axes, :]
+  meta = {key: np.zeros(lead, dtype=int) for key in ("n_midpoint", "n_unsafe", "n_unsafe_clamped", "n_switch")}
+  if rule.all():
+    fused[...], state, m = rule_based_fusion_step(secure, unsafe, lower, upper, outage, state,
+                                                  blend_steps=blend_steps, outage_fallback=fallback, backend=backend,
+                                                  elapsed_steps=elapsed)
+    for key in meta:
+      meta[key][...] = m[key]
+  elif rule.any():
+    # Mixed configuration: run the rule kernel on the rule-based rows and write their state back
+    sub = RuleFusionState(fused=state.fused[rule], mode=state.mode[rule], blend_left=state.blend_left[rule],
+                          blend_start=None if state.blend_start is None else state.blend_start[rule])
+    fused_r, sub, m = rule_based_fusion_step(
+      secure[rule], unsafe[rule], np.broadcast_to(lower, secure.shape)[rule], np.broadcast_to(upper, secure.shape)[rule],
+      outage[rule], sub, blend_steps=blend_steps, outage_fallback=fallback[rule], backend=backend,
+      elapsed_steps=None if elapsed is None else elapsed[rule])
+    fused[rule] = fused_r
+    state.fused[rule] = sub.fused
+    state.mode[rule] = sub.mode
+    state.blend_left[rule] = sub.blend_left
+    if sub.blend_start is not None:
+      if state.blend_start is None:
+        state.blend_start = np.copy(state.fused)
+      state.blend_start[rule] = sub.blend_start
+    for key in meta:
+      meta[key][rule] = m[key]
+  var_rows = ~rule
+  if var_rows.any():
+    sec_v, uns_v = secure[var_rows], unsafe[var_rows]
+    v_s = np.var(sec_v, axis=-1, ddof=1) if var_secure is None else np.broadcast_to(var_secure, lead)[var_rows]
+    v_u = np.var(uns_v, axis=-1, ddof=1) if var_unsafe is None else np.broadcast_to(var_unsafe, lead)[var_rows]
+    fused[var_rows], _ = fuse_pair(sec_v, v_s[:, None], uns_v, v_u[:, None])
+  np.sqrt(np.sum(fused ** 2, axis=-2), out=block[..., n_axes, :])
+  return block, state, meta
+
+
 __all__ = [
   "fuse_pair",
   "rule_based_fusion",
   "RuleFusionState",
   "rule_based_fusion_step",
+  "joint_fusion_step",
+  "resolve_backend",
+  "FUSION_BACKENDS",
   "compute_secure_interval_bounds",
 ]
\ No newline at end of file
@@ -0,0 +1,235 @@
+"""Precomputed secure interval lookup tables keyed by (speed, distance since balise).
+
+Between interval updates the secure path error of a sample is driven by two
+state variables only:
+* speed v (balise latency / early-detection terms of the anchor error with
+  `sensors.balise.speed_coupling`, time spent per distance),
+* distance since the last balise d (odometry drift σ ∝ sqrt(d)); before the first
+  passage d counts from the start and no anchor is set.
+
+An offline calibration run of the time loop's secure path tabulates P_low/P_high
+of the secure error on a (v, d) grid. Online, bounds per sample are obtained by
+bilinear interpolation (O(N) gathers, no empirical quantiles) – the same structure
+an onboard implementation would use.
+
+Artifact: versioned `.npz` (TABLE_FORMAT_VERSION) with grid nodes, bounds and a
+JSON meta block (model fingerprint, calibration horizon, samples per node, creation
+time). Tables are checked against the run's config (quantile levels, fingerprint)
+before use.
+"""
+from __future__ import annotations
+
+import copy
+import hashlib
+import json
+from dataclasses import dataclass, field
+from datetime import datetime, UTC
+from pathlib import Path
+from typing import Any, Dict, Sequence, Tuple
+
+import numpy as np
+
+from .config import Config
+
+TABLE_FORMAT_VERSION = 2  # 2: engine calibration, model fingerprint
+
+
+@dataclass
+class IntervalLookupTable:
+    """Secure interval bounds on a (speed, distance-since-balise) grid.
+
+    Attributes
+    ----------
+    speed_nodes : np.ndarray (n_v,)
+        Strictly increasing speed grid [m/s].
+    dist_nodes : np.ndarray (n_d,)
+        Strictly increasing distance-since-balise grid [m].
+    lower, upper : np.ndarray (n_v, n_d)
+        Tabulated quantile bounds of the secure path error [m].
+    """
+    speed_nodes: np.ndarray
+    dist_nodes: np.ndarray
+    lower: np.ndarray
+    upper: np.ndarray
+    quantile_low_pct: float = 1.0
+    quantile_high_pct: float = 99.0
+    meta: Dict[str, Any] = field(default_factory=dict)
+
+    def lookup(self, speeds: np.ndarray, dist_since_balise: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Bilinear interpolation of (lower, upper) per sample; queries outside the grid are clamped to its edges."""
+        iv, wv = _grid_weights(self.speed_nodes, speeds)
+        idist, wd = _grid_weights(self.dist_nodes, dist_since_balise)
+        return _bilinear(self.lower, iv, wv, idist, wd), _bilinear(self.upper, iv, wv, idist, wd)
+
+
+def _grid_weights(nodes: np.ndarray, x: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Left cell index and fractional weight within cell (clamped to grid)."""
+    x = np.clip(np.asarray(x, dtype=float), nodes[0], nodes[-1])
+    i = np.clip(np.searchsorted(nodes, x, side="right") - 1, 0, len(nodes) - 2)
+    w = (x - nodes[i]) / (nodes[i + 1] - nodes[i])
+    return i, w
+
+
+def _bilinear(grid: np.ndarray, iv: np.ndarray, wv: np.ndarray, idist: np.ndarray, wd: np.ndarray) -> np.ndarray:
+    g00 = grid[iv, idist]
+    g01 = grid[iv, idist + 1]
+    g10 = grid[iv + 1, idist]
+    g11 = grid[iv + 1, idist + 1]
+    return (1 - wv) * ((1 - wd) * g00 + wd * g01) + wv * ((1 - wd) * g10 + wd * g11)
+
+
+def model_fingerprint(cfg: Config) -> str:
+    """SHA-256 of the config sections the secure path error depends on (balise, map, odometry)."""
+    sensors = cfg.sensors
+    payload = {name: sensors.get(name) for name in ("balise", "map", "odometry")}
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def _interval_quantiles(cfg: Config) -> Tuple[float, float]:
+    interval_cfg = cfg.sensors.get("fusion", {}).get("interval", {})
+    return float(interval_cfg.get("quantile_low_pct", 1.0)), float(interval_cfg.get("quantile_high_pct", 99.0))
+
+
+def check_interval_table(table: IntervalLookupTable, cfg: Config) -> None:
+    """Reject a table whose quantile levels or secure path model differ from `cfg` (rebuild it instead)."""
+    q_lo, q_hi = _interval_quantiles(cfg)
+    if not (np.isclose(table.quantile_low_pct, q_lo) and np.isclose(table.quantile_high_pct, q_hi)):
+        raise ValueError(f"Interval table holds P{table.quantile_low_pct:g}/P{table.quantile_high_pct:g} bounds, config asks for "
+                         f"P{q_lo:g}/P{q_hi:g}; rebuild it with build_interval_table.py")
+    fingerprint = table.meta.get("model_fingerprint")
+    if fingerprint != model_fingerprint(cfg):
+        raise ValueError("Interval table was built for a different secure path model (sensors.balise/map/odometry) "
+                         f"or carries no model fingerprint ({fingerprint!r}); rebuild it with build_interval_table.py")
+
+
+def build_interval_table(
+    cfg: Config,
+    rng: np.random.Generator,
+    speed_nodes: Sequence[float] | None = None,
+    dist_nodes: Sequence[float] | None = None,
+    n_per_node: int = 2000,
+    quantile_low_pct: float | None = None,
+    quantile_high_pct: float | None = None,
+    horizon_s: float | None = None,
+    sample_every_s: float = 10.0,
+    min_cell_samples: int = 200,
+) -> IntervalLookupTable:
+    """Calibrate a lookup table on the secure path of the time loop itself.
+
+    n_per_node samples per speed node (speeds uniform between the midpoints to the neighbouring
+    nodes) run the engine's secure path phase (`advance_secure`: balise events and draws,
+    odometry random walk, map error) over `horizon_s` (default sim.time_horizon_s). Each step
+    pools the secure errors of a random share dt / `sample_every_s` of the samples into the cell
+    of (speed node, nearest distance node); the table holds the P_low/P_high of each cell. The
+    pooled samples cover the run as the time loop sees it, including the unanchored stretch
+    before the first balise passage. Cells with fewer than `min_cell_samples` (distances a slow
+    speed node does not reach within the horizon) take the bounds of the nearest populated
+    distance node of their speed row. The table is tied to `cfg` by a model fingerprint; the
+    calibration horizon is recorded in the metadata.
+    """
+    from .time_sim import _TimeSeriesEngine  # engine imports this module
+
+    q_cfg = _interval_quantiles(cfg)
+    q_lo = q_cfg[0] if quantile_low_pct is None else float(quantile_low_pct)
+    q_hi = q_cfg[1] if quantile_high_pct is None else float(quantile_high_pct)
+    raw = copy.deepcopy(cfg.raw)
+    horizon = float(raw["sim"].get("time_horizon_s", 3600.0) if horizon_s is None else horizon_s)
+    v_nodes = np.asarray(speed_nodes if speed_nodes is not None else np.linspace(0.0, 16.7, 8), dtype=float)
+    raw["sim"].update(N_samples=len(v_nodes) * int(n_per_node), time_horizon_s=horizon)
+    raw["sensors"].setdefault("fusion", {}).setdefault("interval", {})["method"] = "exact"  # no table needed to calibrate one
+    eng = _TimeSeriesEngine([Config(raw=raw)], [rng], with_lateral=False, metrics=("rmse",))
+    d_nodes = np.asarray(dist_nodes if dist_nodes is not None else np.linspace(0.0, eng.balise_spacing, 9), dtype=float)
+    if np.any(np.diff(v_nodes) <= 0) or np.any(np.diff(d_nodes) <= 0) or len(v_nodes) < 2 or len(d_nodes) < 2:
+        raise ValueError("speed_nodes / dist_nodes must be strictly increasing with at least 2 nodes")
+    n_d = len(d_nodes)
+    # Speeds uniform over each node's cell (edges at the midpoints): samples of one node do not move in lockstep
+    v_edges = np.concatenate([v_nodes[:1], 0.5 * (v_nodes[1:] + v_nodes[:-1]), v_nodes[-1:]])
+    eng.speeds[0] = rng.uniform(np.repeat(v_edges[:-1], n_per_node), np.repeat(v_edges[1:], n_per_node))
+    v_idx = np.repeat(np.arange(len(v_nodes)), n_per_node) * n_d
+    d_mid = 0.5 * (d_nodes[1:] + d_nodes[:-1])
+    stride = max(1, int(round(sample_every_s / eng.dt)))
+
+    # Every step pools a random 1/stride share of the samples (dense in time, memory of one sample per stride)
+    pick_rng = rng.spawn(1)[0]
+    cells, values = [], []
+    for _ in range(eng.n_steps):
+        eng.advance_secure()
+        eng.k += 1
+        pick = np.flatnonzero(pick_rng.random(eng.n) * stride < 1.0)
+        cells.append((v_idx[pick] + np.searchsorted(d_mid, eng.dist_since_balise[0, pick])).astype(np.int32))
+        values.append(eng.secure[0, pick])
+    cells, values = np.concatenate(cells), np.concatenate(values)
+    order = np.argsort(cells, kind="stable")
+    counts = np.bincount(cells, minlength=len(v_nodes) * n_d)
+    starts = np.concatenate([[0], np.cumsum(counts)])
+    bounds = np.full((2, len(v_nodes) * n_d), np.nan)
+    for c in np.flatnonzero(counts >= min_cell_samples):
+        bounds[:, c] = np.percentile(values[order[starts[c]:starts[c + 1]]], [q_lo, q_hi])
+    bounds = bounds.reshape(2, len(v_nodes), n_d)
+    populated = ~np.isnan(bounds[0])
+    if not populated.any(axis=1).all():
+        raise ValueError("speed node without calibration samples; increase n_per_node or lower min_cell_samples")
+    # Unpopulated cells: bounds of the nearest populated distance node in the same speed row
+    for i in range(len(v_nodes)):
+        filled = np.flatnonzero(populated[i])
+        nearest = filled[np.abs(np.arange(n_d)[:, None] - filled[None, :]).argmin(axis=1)]
+        bounds[:, i] = bounds[:, i, nearest]
+    meta = {
+        "project": cfg.raw.get("project", {}).get("name"),
+        "model_fingerprint": model_fingerprint(cfg),
+        "n_per_node": int(n_per_node),
+        "horizon_s": horizon,
+        "sample_every_s": stride * eng.dt,
+        "cells_filled_from_neighbours": int((~populated).sum()),
+        "balise_speed_coupling": bool(cfg.sensors["balise"].get("speed_coupling", False)),
+        "created_utc": datetime.now(UTC).isoformat(),
+    }
+    return IntervalLookupTable(v_nodes, d_nodes, bounds[0], bounds[1], q_lo, q_hi, meta)
+
+
+def save_interval_table(table: IntervalLookupTable, path: str | Path) -> Path:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("wb") as f:
+        np.savez(
+            f,
+            format_version=np.array(TABLE_FORMAT_VERSION),
+            speed_nodes=table.speed_nodes,
+            dist_nodes=table.dist_nodes,
+            lower=table.lower,
+            upper=table.upper,
+            quantiles=np.array([table.quantile_low_pct, table.quantile_high_pct]),
+            meta_json=np.array(json.dumps(table.meta)),
+        )
+    return path
+
+
+def load_interval_table(path: str | Path) -> IntervalLookupTable:
+    path = Path(path)
+    if not path.exists():
+        raise FileNotFoundError(f"Interval table not found: {path}")
+    with np.load(path, allow_pickle=False) as z:
+        version = int(z["format_version"])
+        if version != TABLE_FORMAT_VERSION:
+            raise ValueError(f"Unsupported interval table format version {version} (expected {TABLE_FORMAT_VERSION}) in {path}")
+        q = z["quantiles"]
+        return IntervalLookupTable(
+            speed_nodes=z["speed_nodes"],
+            dist_nodes=z["dist_nodes"],
+            lower=z["lower"],
+            upper=z["upper"],
+            quantile_low_pct=float(q[0]),
+            quantile_high_pct=float(q[1]),
+            meta=json.loads(str(z["meta_json"])),
+        )
+
+
+__all__ = [
+    "IntervalLookupTable",
+    "TABLE_FORMAT_VERSION",
+    "build_interval_table",
+    "check_interval_table",
+    "model_fingerprint",
+    "save_interval_table",
+    "load_interval_table",
+]
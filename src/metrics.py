@@ -5,12 +5,15 @@ Additions:
  - es_convergence_trace: Expected Shortfall (ES_p) convergence via light bootstrap per batch.
  - rmse_convergence_trace: RMSE convergence with delta-method SE approximation.
  - quantile_density_estimate: kernel density at quantile for RSE formula.
+ - mser_truncation / batch_means_ci / SteadyStateDetector: warm-up detection and early stop of time series.
 """
 from __future__ import annotations
 
-from typing import Dict, Any, Sequence, List, Iterable
+from dataclasses import dataclass, field
+from typing import Dict, Any, Sequence, List, Iterable, Tuple
 import numpy as np
 from math import sqrt
+from scipy import stats as _stats
 
 # ---------------------------------------------------------------------------
 # Basic metrics
@@ -29,6 +32,37 @@ def summarize(values: np.ndarray, percentiles: Sequence[float] = (50, 90, 95, 99
     return res
 
 
+def _percentile_index(n: int, q: float):
+    """Order statistics (lo, hi) and weight t read by np.percentile(x, q) (method 'linear') for n values."""
+    vi = (n - 1) * np.true_divide(q, 100)
+    if vi >= n - 1:
+        return n - 1, n - 1, vi + 1  # numpy: both indexes -1, gamma = vi - (-1)
+    lo = int(np.floor(vi))
+    return lo, lo + 1, vi - lo
+
+
+def _lerp(a, b, t):
+    """numpy's percentile interpolation (second form for t >= 0.5)."""
+    diff = b - a
+    if t >= 0.5:
+        return b - diff * (1 - t)
+    return a + diff * t
+
+
+def multi_percentile(values: np.ndarray, percentiles: Sequence[float], axis: int = -1) -> np.ndarray:
+    """np.percentile(values, percentiles, axis) for finite values from a single np.partition call.
+
+    All requested order statistics are passed as kth values of one partition (np.percentile
+    partitions once per call and additionally for min/max). Result shape (len(percentiles),)
+    + reduced shape, bit-identical to np.percentile (method 'linear').
+    """
+    x = np.moveaxis(np.asarray(values, dtype=float), axis, -1)
+    idx = [_percentile_index(x.shape[-1], q) for q in percentiles]
+    kth = sorted({i for lo, hi, _ in idx for i in (lo, hi)})
+    part = np.partition(x, kth, axis=-1)
+    return np.stack([np.asarray(_lerp(part[..., lo], part[..., hi], t)) for lo, hi, t in idx])
+
+
 def bootstrap_ci(values: np.ndarray, stat_fn, B: int = 500, alpha: float = 0.05, rng: np.random.Generator | None = None):
     rng = rng or np.random.default_rng()
     n = values.shape[0]
@@ -193,12 +227,129 @@ def es_convergence_trace(values: np.ndarray, p: float = 0.95, batch_size: int =
     return rows
 
 
+# ---------------------------------------------------------------------------
+# Steady-state detection (time series)
+# ---------------------------------------------------------------------------
+
+def mser_truncation(series: np.ndarray, batch_size: int = 5) -> int:
+    """MSER-m warm-up truncation point (in observations) of a time series.
+
+    Batch means Y of size m; d* = argmin_d Σ_{i>=d}(Y_i - Ȳ_d)² / (n_b - d)² over d < n_b - 1.
+    Truncating d*·m observations minimises the squared standard error of the remaining mean.
+    The usual validity rule accepts d* only in the first half of the series (checked by the caller).
+    """
+    x = np.asarray(series, dtype=float)
+    n_b = x.shape[0] // batch_size
+    if n_b < 3:
+        return 0
+    y = x[:n_b * batch_size].reshape(n_b, batch_size).mean(axis=1)
+    s1 = np.cumsum(y[::-1])[::-1]
+    s2 = np.cumsum((y ** 2)[::-1])[::-1]
+    cnt = np.arange(n_b, 0, -1, dtype=float)
+    mser = np.maximum(s2 - s1 ** 2 / cnt, 0.0) / cnt ** 2
+    return int(np.argmin(mser[:-1])) * batch_size
+
+
+def batch_means_ci(series: np.ndarray, n_batches: int = 20, alpha: float = 0.05) -> Tuple[float, float]:
+    """Mean and (1-alpha) confidence half-width of a stationary correlated series (non-overlapping batch means).
+
+    Leading observations beyond a multiple of `n_batches` are dropped (closest to the warm-up).
+    """
+    x = np.asarray(series, dtype=float)
+    b = x.shape[0] // n_batches
+    if b < 1 or n_batches < 2:
+        return float(np.mean(x)) if x.size else float('nan'), float('inf')
+    y = x[x.shape[0] - b * n_batches:].reshape(n_batches, b).mean(axis=1)
+    half = float(_stats.t.ppf(1 - alpha / 2, n_batches - 1) * np.std(y, ddof=1) / sqrt(n_batches))
+    return float(np.mean(y)), half
+
+
+@dataclass
+class SteadyStateSpec:
+    """Online stationarity test of recorded time-series metrics (MSER-5 warm-up + batch-means CI)."""
+    metrics: Sequence[str] = ("rmse", "p95", "mode_midpoint")
+    check_every_s: float = 60.0     # simulated time between tests
+    min_time_s: float = 120.0       # no decision before
+    batch_size: int = 5             # MSER batch size (MSER-5)
+    n_batches: int = 20             # batch means of the post-warm-up series
+    alpha: float = 0.05             # CI level 1 - alpha
+    rel_tol: float = 0.02           # accepted CI half-width relative to |mean|
+    stop: bool = True               # end the run once every lane is stationary
+
+
+@dataclass
+class SteadyStateReport:
+    """Detected warm-up and stationary estimates of one lane (times in seconds)."""
+    detected: bool
+    t_detect_s: float | None
+    warmup_s: float | None
+    confidence: float
+    estimates: Dict[str, Dict[str, float]] = field(default_factory=dict)  # metric -> mean, ci_half_width, rel_half_width, warmup_s
+
+
+class SteadyStateDetector:
+    """Collects one row of monitored metrics per lane and recorded instant; `push` tests at the check cadence."""
+
+    def __init__(self, spec: SteadyStateSpec, n_lanes: int, n_records: int, record_dt: float):
+        self.spec = spec
+        self.record_dt = float(record_dt)
+        self.values = np.zeros((n_lanes, len(spec.metrics), n_records))
+        self.n = 0
+        self.check_every = max(1, int(round(spec.check_every_s / record_dt)))
+        self.min_records = max(int(round(spec.min_time_s / record_dt)), 2 * spec.batch_size * spec.n_batches)
+        self.detected_at: int | None = None  # records seen when every lane passed
+
+    def push(self, row: np.ndarray) -> bool:
+        """Append (n_lanes, n_metrics) values; True once every lane is stationary (from then on)."""
+        self.values[:, :, self.n] = row
+        self.n += 1
+        if self.detected_at is None and self.n >= self.min_records and self.n % self.check_every == 0:
+            if all(self._lane_test(s)[0] for s in range(self.values.shape[0])):
+                self.detected_at = self.n
+        return self.detected_at is not None
+
+    def _lane_test(self, s: int) -> Tuple[bool, int, Dict[str, Dict[str, float]]]:
+        spec = self.spec
+        n = self.n if self.detected_at is None else self.detected_at
+        ok, warmup, est = True, 0, {}
+        for j, name in enumerate(spec.metrics):
+            x = self.values[s, j, :n]
+            d = mser_truncation(x, spec.batch_size)
+            mean, half = batch_means_ci(x[d:], spec.n_batches, spec.alpha)
+            rel = half / abs(mean) if mean != 0 else (0.0 if half == 0 else float('inf'))
+            ok &= 2 * d <= n and rel <= spec.rel_tol
+            warmup = max(warmup, d)
+            est[name] = {"mean": mean, "ci_half_width": half, "rel_half_width": rel, "warmup_s": d * self.record_dt}
+        return ok, warmup, est
+
+    def report(self, s: int) -> SteadyStateReport:
+        """Lane report: at detection if detected, else the test on all records seen."""
+        if self.n == 0:
+            return SteadyStateReport(False, None, None, 1 - self.spec.alpha)
+        ok, warmup, est = self._lane_test(s)
+        detected = self.detected_at is not None
+        return SteadyStateReport(
+            detected=detected,
+            t_detect_s=self.detected_at * self.record_dt if detected else None,
+            warmup_s=warmup * self.record_dt if (detected or ok) else None,
+            confidence=1 - self.spec.alpha,
+            estimates=est,
+        )
+
+
 __all__ = [
     "rmse",
     "summarize",
     "bootstrap_ci",
+    "multi_percentile",
     # convergence
     "quantile_convergence_trace",
     "rmse_convergence_trace",
     "es_convergence_trace",
+    # steady state
+    "mser_truncation",
+    "batch_means_ci",
+    "SteadyStateSpec",
+    "SteadyStateReport",
+    "SteadyStateDetector",
 ]
\ No newline at end of file
@@ -0,0 +1,97 @@
+"""Run-length-encoded per-sample fusion mode timelines.
+
+Storing the mode of every sample at every step costs N × steps; a sample's mode, however,
+changes rarely. `ModeTimeline` keeps the initial modes plus one (step, row, mode) event per
+switch in compact growable buffers (int32 / int32 / int8), so memory scales with the number
+of switches. Exact per-mode residence times (complete runs and right-censored tails) follow
+from the events without any approximation such as dt / switch_rate.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict
+
+import numpy as np
+
+from .fusion import MODE_NAMES
+
+
+@dataclass
+class ModeResidence:
+    """Residence times (steps) per mode name: completed runs and runs still open at the end."""
+    completed: Dict[str, np.ndarray]
+    censored: Dict[str, np.ndarray]
+
+
+class ModeTimeline:
+    """Mode switch events of R independent rows (e.g. one per scenario lane × sample)."""
+
+    def __init__(self, initial_modes: np.ndarray, start_step: int = 0, capacity: int = 1024):
+        self.initial = np.asarray(initial_modes, dtype=np.int8).ravel().copy()
+        self.last = self.initial.copy()
+        self.start_step = int(start_step)
+        self.steps = np.empty(capacity, dtype=np.int32)
+        self.rows = np.empty(capacity, dtype=np.int32)
+        self.modes = np.empty(capacity, dtype=np.int8)
+        self.n_events = 0
+
+    def record(self, step: int, modes: np.ndarray) -> int:
+        """Append an event for every row whose mode differs from its last mode; returns #switches."""
+        modes = np.asarray(modes).ravel()
+        rows = np.flatnonzero(modes != self.last)
+        m = rows.shape[0]
+        if m:
+            self._reserve(self.n_events + m)
+            sl = slice(self.n_events, self.n_events + m)
+            self.steps[sl] = step
+            self.rows[sl] = rows
+            self.modes[sl] = modes[rows]
+            self.last[rows] = modes[rows]
+            self.n_events += m
+        return m
+
+    def _reserve(self, size: int) -> None:
+        if size <= self.steps.shape[0]:
+            return
+        capacity = max(size, 2 * self.steps.shape[0])
+        for name in ("steps", "rows", "modes"):
+            old = getattr(self, name)
+            new = np.empty(capacity, dtype=old.dtype)
+            new[:self.n_events] = old[:self.n_events]
+            setattr(self, name, new)
+
+    def events(self):
+        """(steps, rows, modes) of all recorded switches in recording order."""
+        n = self.n_events
+        return self.steps[:n], self.rows[:n], self.modes[:n]
+
+    def residence(self, end_step: int, row_range: range | None = None) -> ModeResidence:
+        """Exact residence times in steps per mode for the rows in `row_range` (default: all).
+
+        A run starts at the step a mode is entered (`start_step` for the initial mode) and ends at
+        the next switch of the same row; runs still open at `end_step` are reported as censored.
+        """
+        if row_range is None:
+            row_range = range(self.initial.shape[0])
+        all_rows = np.arange(row_range.start, row_range.stop)
+        steps, rows, modes = self.events()
+        keep = (rows >= row_range.start) & (rows < row_range.stop)
+        # Prepend the initial run of every row, then order by (row, step) – stable keeps recording order
+        run_rows = np.concatenate([all_rows, rows[keep]])
+        run_start = np.concatenate([np.full(all_rows.shape[0], self.start_step, dtype=np.int64), steps[keep]])
+        run_mode = np.concatenate([self.initial[all_rows], modes[keep]])
+        order = np.argsort(run_rows, kind="stable")
+        run_rows, run_start, run_mode = run_rows[order], run_start[order], run_mode[order]
+        last_of_row = np.append(run_rows[1:] != run_rows[:-1], True)
+        run_end = np.append(run_start[1:], 0)
+        run_end[last_of_row] = end_step
+        duration = run_end - run_start
+        completed, censored = {}, {}
+        for code, name in MODE_NAMES.items():
+            sel = run_mode == code
+            completed[name] = duration[sel & ~last_of_row]
+            censored[name] = duration[sel & last_of_row]
+        return ModeResidence(completed=completed, censored=censored)
+
+
+__all__ = ["ModeTimeline", "ModeResidence"]
@@ -0,0 +1,382 @@
+"""Multi-rate time stepping: fine steps (dt_s) around events, coarse steps elsewhere.
+
+The fixed-step loop of `time_sim` advances every sample by dt_s (0.1 s), although the fine
+resolution only matters around balise passages, GNSS outage transitions and fusion blends.
+Here the horizon is divided into coarse intervals of M = coarse_dt_s / dt_s steps; at the start
+of every interval each sample is classified:
+
+* balise passage inside the interval: deterministic from speed and distance since the last
+  balise (constant speed per sample);
+* outage transition inside the interval: the per-step Bernoulli outages keep the previous state
+  over all M steps with probability q^M (available) or p^M (outage); the remaining samples get
+  a transition, drawn exactly (first transition step from the truncated geometric law, free
+  Bernoulli steps after it);
+* fusion blend in progress (`refine_blends`, default).
+
+Samples with an event (active group) run the regular per-step phases over the interval. All
+other samples (quiet group) take one coarse step whose path state has the law of M base steps:
+odometry drift N(0, M·σ_step²), distance M·v·dt, GNSS fix of the last step (all M steps
+available) or held fix (all M steps in outage). At every coarse instant all samples are in sync:
+secure interval, variances, one joint fusion step (active samples one step after their last fine
+step, quiet samples M steps after the previous coarse instant) and metrics. Blends are counted in
+base steps (`elapsed_steps` of `rule_based_fusion_step`), i.e. a blend lasts blend_steps·dt_s of
+wall-clock time regardless of the step a sample takes; a blend started at a coarse instant runs
+at dt_s in the next interval.
+
+Approximation: quiet samples are not fused between coarse instants. Variance-weighted rows have
+no fusion state and are exact in distribution. Rule-based rows switch mode on fix-to-fix noise
+(about 30 % of the samples switch per step with model.yml); the blends started between
+coarse instants are missed, so fused-error metrics of rule-based rows are biased (measured at
+coarse_dt_s = 1 s: RMSE +1 %, P95 +2 %, out-of-threshold share +3 %) and switch rates are not
+observable (`switch_rate` is None). Mode shares are evaluated at the coarse instants (the mode
+follows the current fix). Interval bounds and the variances of variance-weighted rows are
+refreshed at coarse instants and held during the fine steps. `compare_multirate_engine` reports
+cost and metric agreement against `simulate_time_series`.
+"""
+from __future__ import annotations
+
+import time
+from typing import Any, Dict, Sequence
+
+import numpy as np
+
+from .config import Config
+from .distributions import registry
+from .fusion import joint_fusion_step, resolve_backend, RuleFusionState
+from .metrics import multi_percentile
+from .sim_sensors import balise_speeds, simulate_balise_errors_2d
+from .time_sim import (
+    TimeSeriesResult,
+    _gnss_noise,
+    _make_lane,
+    _prepare_static_components,
+    _update_lane_interval,
+    simulate_time_series,
+)
+from .ts_metrics import DEFAULT_METRICS, FIELD_COLUMNS, TimeSeriesMetrics
+
+
+def _first_transition(u: np.ndarray, stay: np.ndarray, m: int) -> np.ndarray:
+    """0-based step of the first outage transition given at least one in m steps (stay probability per step)."""
+    with np.errstate(divide="ignore"):
+        log_stay = np.log(stay)
+        steps = np.ceil(np.log1p(-u * (1.0 - stay ** m)) / np.where(stay > 0, log_stay, -np.inf))
+    return np.clip(np.nan_to_num(steps, nan=1.0), 1, m).astype(np.int64) - 1
+
+
+class _MultiRateEngine:
+    """State and coarse-interval loop of `simulate_time_series_multirate` (one scenario)."""
+
+    def __init__(self, cfg: Config, rng: np.random.Generator, coarse_dt_s: float = 1.0, threshold_oos: float = 0.2,
+                 with_lateral: bool = True, adaptive_interval: bool = True, interval_update_cadence_s: float = 1.0,
+                 blend_steps: int | None = None, metrics_cadence_s: float | None = None,
+                 metrics: Sequence[str] | None = None, refine_blends: bool = True):
+        sim = cfg.sim
+        dt = float(sim.get("dt_s", 0.1))
+        self.dt = dt
+        self.n = n = int(sim.get("N_samples", 1000))
+        self.coarse_steps = m_steps = max(1, int(round(coarse_dt_s / dt)))
+        self.n_coarse = int(float(sim.get("time_horizon_s", 3600.0)) / dt) // m_steps
+        if metrics_cadence_s is None:
+            metrics_cadence_s = m_steps * dt
+        self.record_every = max(1, int(round(metrics_cadence_s / dt)))
+        if self.record_every % m_steps:
+            raise ValueError(f"metrics_cadence_s {metrics_cadence_s:g} must be a multiple of the coarse step {m_steps * dt:g} s")
+        self.n_records = self.n_coarse * m_steps // self.record_every
+        self.update_steps = max(1, int(round(interval_update_cadence_s / dt)))
+        if blend_steps is None:
+            blend_steps = int(cfg.sensors.get("fusion", {}).get("blend_steps", 5))
+        self.blend_steps = blend_steps
+        self.adaptive_interval = adaptive_interval
+        self.refine_blends = refine_blends
+        self.with_lateral = with_lateral
+        self.plan = TimeSeriesMetrics([name for name in DEFAULT_METRICS if name != "si"] if metrics is None else metrics,
+                                      threshold_oos, with_lateral)
+        if self.plan.interval_growth:
+            raise ValueError("The multi-rate engine records no secure interval growth series ('si')")
+
+        self.lane = lane = _make_lane(cfg, rng, with_lateral, None)
+        self.rng = rng
+        # Static draws in the order of the time loop (speeds, static components, initial GNSS fix)
+        self.speeds = rng.uniform(0.0, 16.7, size=n)
+        self.map_err_long, self.map_err_lat, self.gnss_bias_long, self.gnss_bias_lat, _ = _prepare_static_components(cfg, n, rng)
+        self.gnss = self.gnss_bias_long + _gnss_noise(lane, n)
+        self.gnss_lat = self.gnss_bias_lat + registry.sample(lane.gnss_noise_lat_spec, n, rng) if with_lateral else None
+        self.outage = np.full(n, lane.gnss_dead)
+
+        # Path state (constant speed per sample → distance and drift per base step are fixed)
+        self.balise_spacing = 400.0
+        self.ds = self.speeds * dt
+        self.sigma_step = lane.drift_per_km * np.sqrt(self.ds / 1000.0)
+        self.dist_since_balise = np.zeros(n)
+        self.odo_drift = np.zeros(n)
+        self.last_balise_error = np.zeros(n)
+        self.last_balise_lat_error = np.zeros(n)
+
+        # Fusion state and axis-stacked (A, N) rows of the coarse instants
+        n_axes = 2 if with_lateral else 1
+        self.rule_axes = np.array((lane.use_rule_based, lane.lateral_rule_based)[:n_axes])
+        self.outage_fallback = np.array((lane.outage_fallback, "midpoint")[:n_axes])
+        self.backend = resolve_backend(str(cfg.sensors.get("fusion", {}).get("backend", "numpy")))
+        self.state = RuleFusionState(fused=np.zeros((n_axes, n)), mode=np.zeros((n_axes, n), dtype=int),
+                                     blend_left=np.zeros((n_axes, n), dtype=int))
+        self.secure3 = np.zeros((n_axes, n))
+        self.unsafe3 = np.zeros((n_axes, n))
+        self.lower3 = np.zeros((n_axes, n))
+        self.upper3 = np.zeros((n_axes, n))
+        self.var_s = np.full(n_axes, np.nan)
+        self.var_u = np.full(n_axes, np.nan)
+        self.q_lat = 0.0
+
+        self.series = {name: np.zeros(self.n_records) for name in self.plan.series}
+        self.mode_stats = {key: np.zeros(self.n_records) for key in ("midpoint", "unsafe", "unsafe_clamped")}
+        self.n_iterations = 0
+        self.refined_sample_steps = 0  # sample-steps run at dt_s (active groups)
+        self.k = 0
+
+    # --- coarse-instant phases (all samples in sync) ---------------------------------------
+    def _secure_rows(self) -> None:
+        np.add(self.last_balise_error, self.map_err_long, out=self.secure3[0])
+        self.secure3[0] += self.odo_drift
+        self.unsafe3[0] = self.gnss
+        if self.with_lateral:
+            np.add(self.last_balise_lat_error, self.map_err_lat, out=self.secure3[1])
+            self.unsafe3[1] = self.gnss_lat
+
+    def _refresh_bounds(self, k: int, balise_event: bool) -> None:
+        """Secure interval (rule-based long row, update cadence) and symmetric lateral P99 bound (after balise events)."""
+        lane = self.lane
+        if lane.use_rule_based:
+            _update_lane_interval(lane, self.secure3[0], self.speeds, self.dist_since_balise, k, self.update_steps,
+                                  self.adaptive_interval)
+            self.lower3[0], self.upper3[0] = lane.lower, lane.upper
+        if self.with_lateral and balise_event:
+            self.q_lat = float(multi_percentile(np.abs(self.secure3[1]), [99])[0])
+            self.lower3[1], self.upper3[1] = -self.q_lat, self.q_lat
+
+    def _variances(self, include_long: bool) -> None:
+        if include_long:
+            self.var_s[0] = np.var(self.secure3[0], ddof=1)
+            self.var_u[0] = np.var(self.gnss, ddof=1)
+        if self.with_lateral and not self.rule_axes[1]:
+            self.var_s[1] = np.var(self.secure3[1], ddof=1)
+            self.var_u[1] = np.var(self.gnss_lat, ddof=1)
+
+    # --- interval phases --------------------------------------------------------------------
+    def _classify(self) -> tuple:
+        """Balise passage, outage path (first transition step, M = none) and active mask of the next interval."""
+        n, m_steps, lane = self.n, self.coarse_steps, self.lane
+        moving = self.ds > 0
+        to_event = np.where(moving, np.ceil((self.balise_spacing - self.dist_since_balise) / np.where(moving, self.ds, 1.0)), np.inf)
+        balise = to_event <= m_steps
+        first_transition = np.full(n, m_steps)
+        if not lane.gnss_dead:
+            stay = np.where(self.outage, lane.p_out, 1.0 - lane.p_out)
+            transition = self.rng.random(n) >= stay ** m_steps
+            idx = np.flatnonzero(transition)
+            if idx.size:
+                first_transition[idx] = _first_transition(self.rng.random(idx.size), stay[idx], m_steps)
+        active = balise | (first_transition < m_steps)
+        if self.refine_blends and self.rule_axes.any() and self.blend_steps > 1:
+            active |= (self.state.blend_left > 0).any(axis=0)
+        return balise, first_transition, active
+
+    def _coarse_step(self, iq: np.ndarray) -> None:
+        """Quiet group: one aggregated step of M base steps (no balise, no outage transition)."""
+        rng, m_steps = self.rng, self.coarse_steps
+        self.odo_drift[iq] += rng.normal(0.0, self.sigma_step[iq] * np.sqrt(m_steps))
+        self.dist_since_balise[iq] += m_steps * self.ds[iq]
+        fresh = iq[~self.outage[iq]]  # available over all M steps: the last fix counts
+        if fresh.size:
+            self.gnss[fresh] = self.gnss_bias_long[fresh] + _gnss_noise(self.lane, fresh.size)
+            if self.with_lateral:
+                self.gnss_lat[fresh] = self.gnss_bias_lat[fresh] + registry.sample(self.lane.gnss_noise_lat_spec, fresh.size, self.rng)
+
+    def _fine_steps(self, ia: np.ndarray, first_transition: np.ndarray) -> None:
+        """Active group: M base steps; fusion runs on the first M-1, the last one is fused at the coarse instant."""
+        rng, lane, m_steps, cfg = self.rng, self.lane, self.coarse_steps, self.lane.cfg
+        m = ia.size
+        ds, sigma, speeds = self.ds[ia], self.sigma_step[ia], self.speeds[ia]
+        dist, drift = self.dist_since_balise[ia], self.odo_drift[ia]
+        bal, bal_lat = self.last_balise_error[ia], self.last_balise_lat_error[ia]
+        bias, bias_lat = self.gnss_bias_long[ia], self.gnss_bias_lat[ia]
+        gnss = self.gnss[ia]
+        gnss_lat = self.gnss_lat[ia] if self.with_lateral else None
+        # Outage path: previous state up to the first transition, flipped there, free Bernoulli steps after it
+        prev = self.outage[ia]
+        first = first_transition[ia]
+        steps = np.arange(m_steps)[:, None]
+        free = rng.random((m_steps, m)) < lane.p_out
+        outage = np.where(steps < first, prev, np.where(steps == first, ~prev, free))
+
+        n_axes = self.secure3.shape[0]
+        secure3, unsafe3 = np.empty((n_axes, m)), np.empty((n_axes, m))
+        lower3, upper3 = self.lower3[:, ia], self.upper3[:, ia]
+        st = self.state
+        sub = RuleFusionState(fused=st.fused[:, ia], mode=st.mode[:, ia], blend_left=st.blend_left[:, ia],
+                              blend_start=None if st.blend_start is None else st.blend_start[:, ia])
+        for j in range(m_steps):
+            dist += ds
+            drift += rng.normal(0.0, sigma)
+            events = np.flatnonzero(dist >= self.balise_spacing)
+            if events.size:
+                bal[events], bal_lat[events] = simulate_balise_errors_2d(cfg, events.size, rng, speeds=balise_speeds(cfg, speeds[events]))
+                drift[events] = 0.0
+                dist[events] = 0.0
+            avail = np.flatnonzero(~outage[j])
+            if avail.size:
+                gnss[avail] = bias[avail] + _gnss_noise(lane, avail.size)
+                if gnss_lat is not None:
+                    gnss_lat[avail] = bias_lat[avail] + registry.sample(lane.gnss_noise_lat_spec, avail.size, rng)
+            if j == m_steps - 1 or not self.rule_axes.any():
+                continue  # last step fused at the coarse instant; variance-weighted rows have no state
+            secure3[0] = bal + self.map_err_long[ia] + drift
+            unsafe3[0] = gnss
+            if gnss_lat is not None:
+                secure3[1] = bal_lat + self.map_err_lat[ia]
+                unsafe3[1] = gnss_lat
+            _, sub, _ = joint_fusion_step(
+                secure3, unsafe3, lower3, upper3, outage[j], sub, blend_steps=self.blend_steps,
+                outage_fallback=self.outage_fallback, rule_axes=self.rule_axes, var_secure=self.var_s,
+                var_unsafe=self.var_u, backend=self.backend)
+        self.n_iterations += m_steps - 1
+        self.refined_sample_steps += m * m_steps
+        self.dist_since_balise[ia], self.odo_drift[ia] = dist, drift
+        self.last_balise_error[ia], self.last_balise_lat_error[ia] = bal, bal_lat
+        self.gnss[ia] = gnss
+        if gnss_lat is not None:
+            self.gnss_lat[ia] = gnss_lat
+        self.outage[ia] = outage[-1]
+        st.fused[:, ia], st.mode[:, ia], st.blend_left[:, ia] = sub.fused, sub.mode, sub.blend_left
+        if sub.blend_start is not None:
+            if st.blend_start is None:
+                st.blend_start = np.copy(st.fused)
+            st.blend_start[:, ia] = sub.blend_start
+
+    def interval(self, c: int) -> None:
+        """Advance all samples over coarse interval c and fuse / record at its end."""
+        m_steps, n = self.coarse_steps, self.n
+        k0 = c * m_steps
+        k_end = k0 + m_steps - 1
+        balise, first_transition, active = self._classify()
+        ia = np.flatnonzero(active)
+        self._coarse_step(np.flatnonzero(~active))
+        if ia.size:
+            self._fine_steps(ia, first_transition)
+        self._secure_rows()
+        # Interval refresh if the fixed-step loop refreshes inside this interval (first multiple of the cadence)
+        self._refresh_bounds(min(-(-k0 // self.update_steps) * self.update_steps, k_end), bool(balise.any()))
+        record = (k_end + 1) % self.record_every == 0
+        self._variances(include_long=(record and (self.plan.var_secure or self.plan.var_unsafe)) or not self.rule_axes[0])
+        # Quiet samples: M base steps since the previous fusion (blends counted in wall-clock time)
+        block, self.state, meta = joint_fusion_step(
+            self.secure3, self.unsafe3, self.lower3, self.upper3, self.outage, self.state, blend_steps=self.blend_steps,
+            outage_fallback=self.outage_fallback, rule_axes=self.rule_axes, var_secure=self.var_s, var_unsafe=self.var_u,
+            backend=self.backend, elapsed_steps=np.where(active, 1, m_steps))
+        self.k = k_end + 1
+        self.n_iterations += 1
+        if record:
+            r = (k_end + 1) // self.record_every - 1
+            values = self.plan.evaluate(block[None, :self.plan.n_rows])
+            for name, v in values.items():
+                self.series[name][r] = v[0]
+            if self.plan.var_secure:
+                self.series["var_secure"][r] = self.var_s[0]
+            if self.plan.var_unsafe:
+                self.series["var_unsafe"][r] = self.var_u[0]
+            for key, meta_key in (("midpoint", "n_midpoint"), ("unsafe", "n_unsafe"), ("unsafe_clamped", "n_unsafe_clamped")):
+                self.mode_stats[key][r] = meta[meta_key][0] / n
+
+    def run(self) -> None:
+        # Initial bounds for the fine steps of the first interval
+        self._secure_rows()
+        self._refresh_bounds(0, True)
+        self._variances(include_long=not self.rule_axes[0])
+        for c in range(self.n_coarse):
+            self.interval(c)
+
+    @property
+    def refined_share(self) -> float:
+        """Share of sample-steps run at dt_s (1.0 = fixed-step loop)."""
+        return self.refined_sample_steps / max(1, self.n * self.n_coarse * self.coarse_steps)
+
+    def result(self) -> TimeSeriesResult:
+        times = self.dt * self.record_every * (np.arange(self.n_records) + 1)
+        extra = self.plan.extra
+        rule = self.lane.use_rule_based
+        return TimeSeriesResult(
+            times=times,
+            **{name: self.series.get(name) for name in FIELD_COLUMNS},
+            mode_share={key: self.mode_stats[key] for key in ("midpoint", "unsafe", "unsafe_clamped")} if rule else None,
+            switch_rate=None,  # not observable: quiet samples switch at most once per coarse step
+            n_iterations=self.n_iterations,
+            extra={name: self.series[name] for name in extra} if extra else None,
+        )
+
+
+def simulate_time_series_multirate(cfg: Config, rng: np.random.Generator, coarse_dt_s: float = 1.0,
+                                   threshold_oos: float = 0.2, with_lateral: bool = True,
+                                   adaptive_interval: bool = True, interval_update_cadence_s: float = 1.0,
+                                   blend_steps: int | None = None, metrics_cadence_s: float | None = None,
+                                   metrics: Sequence[str] | None = None, refine_blends: bool = True) -> TimeSeriesResult:
+    """Multi-rate counterpart of `simulate_time_series` (same result layout, no interval growth series, no switch rate).
+
+    Outputs at coarse instants: `metrics_cadence_s` defaults to `coarse_dt_s` and must be a multiple
+    of it. `n_iterations` counts coarse instants plus fine steps of active groups.
+    `refine_blends=False` also steps samples with a running blend coarsely (the blend then
+    completes within the coarse step, in wall-clock time).
+    """
+    engine = _MultiRateEngine(cfg, rng, coarse_dt_s=coarse_dt_s, threshold_oos=threshold_oos, with_lateral=with_lateral,
+                              adaptive_interval=adaptive_interval, interval_update_cadence_s=interval_update_cadence_s,
+                              blend_steps=blend_steps, metrics_cadence_s=metrics_cadence_s, metrics=metrics,
+                              refine_blends=refine_blends)
+    engine.run()
+    return engine.result()
+
+
+def compare_multirate_engine(cfg: Config, seed: int, coarse_dt_s: float = 1.0, metrics_cadence_s: float | None = None,
+                             refine_blends: bool = True, **kwargs: Any) -> Dict[str, Any]:
+    """Cost and metric agreement of the multi-rate engine vs. the fixed-step loop.
+
+    Both engines use `seed`: common static draws (speeds, static components, initial fix),
+    independent paths afterwards. Returns runtimes, loop iterations, the refined share of sample-steps and per metric the
+    time-averaged values of both engines with their relative difference.
+    """
+    if metrics_cadence_s is None:
+        metrics_cadence_s = coarse_dt_s
+    t0 = time.perf_counter()
+    ref = simulate_time_series(cfg, np.random.default_rng(seed), metrics_cadence_s=metrics_cadence_s, **kwargs)
+    t1 = time.perf_counter()
+    engine = _MultiRateEngine(cfg, np.random.default_rng(seed), coarse_dt_s=coarse_dt_s,
+                              metrics_cadence_s=metrics_cadence_s, refine_blends=refine_blends, **kwargs)
+    engine.run()
+    res = engine.result()
+    t2 = time.perf_counter()
+    report: Dict[str, Any] = {
+        "runtime_fixed_s": t1 - t0,
+        "runtime_multirate_s": t2 - t1,
+        "speedup": (t1 - t0) / (t2 - t1) if t2 > t1 else float("nan"),
+        "iterations_fixed": ref.n_iterations,
+        "iterations_multirate": res.n_iterations,
+        "refined_share": engine.refined_share,
+        "metrics": {},
+    }
+    fields = ["rmse", "p95", "rmse_lat", "p95_lat", "rmse_2d", "p95_2d", "var_secure", "var_unsafe", "share_oos"]
+    for field in fields + ["mode_unsafe"]:
+        if field == "mode_unsafe":
+            a = ref.mode_share["unsafe"] if ref.mode_share else None
+            b = res.mode_share["unsafe"] if res.mode_share else None
+        else:
+            a, b = getattr(ref, field), getattr(res, field)
+        if a is None or b is None:
+            continue
+        mean_a, mean_b = float(np.mean(a)), float(np.mean(b))
+        report["metrics"][field] = {
+            "fixed": mean_a,
+            "multirate": mean_b,
+            "rel_diff": (mean_b - mean_a) / mean_a if mean_a != 0 else float("nan"),
+        }
+    return report
+
+
+__all__ = ["simulate_time_series_multirate", "compare_multirate_engine"]
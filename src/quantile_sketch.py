@@ -0,0 +1,231 @@
+"""Mergeable quantile sketches for incremental secure interval updates.
+
+The adaptive interval (see `fusion.compute_secure_interval_bounds`) recomputes
+exact per speed-bin P1/P99 of the secure path at every update. Between two
+updates most samples only move by a small odometry drift increment, i.e. their
+value stays within the same sketch bucket. The sketch below therefore keeps the
+bucket key of every sample and only moves samples whose key changed.
+
+Design (log-bucketed signed histogram, DDSketch-type):
+* |x| > min_value is mapped to key k = ceil(log_gamma |x|), gamma = (1+alpha)/(1-alpha).
+* The bucket representative 2*gamma^k/(gamma+1) has a relative error <= alpha
+  (explicit, distribution-free bound on the returned quantile value).
+* |x| <= min_value collapses into a zero bucket (absolute error <= min_value).
+* Counts are plain integers: merge = addition, removal = subtraction.
+
+KLL or t-digest would be mergeable as well but do not support deletions, which
+the time loop needs (samples move between buckets). The relative accuracy alpha
+plays the role of the explicit error bound requested for certification review;
+the exact path stays the default (`fusion.interval.method: exact`).
+"""
+from __future__ import annotations
+
+import math
+from typing import Any, Dict, Tuple
+
+import numpy as np
+
+
+class SignedLogSketch:
+    """Signed log-bucket quantile sketch over a fixed number of groups.
+
+    Parameters
+    ----------
+    n_groups : int
+        Number of independent histograms (e.g. speed bins). Group 0 is used if only one.
+    relative_accuracy : float
+        alpha in (0, 1); returned quantiles satisfy |q_hat - q| <= alpha*|q| (+ min_value).
+    min_value, max_value : float
+        Magnitude range resolved by log buckets. Values above max_value are clipped
+        into the outermost bucket (`n_clipped` counts them on insertion).
+    """
+
+    def __init__(self, n_groups: int = 1, relative_accuracy: float = 0.005,
+                 min_value: float = 1e-6, max_value: float = 1e3):
+        if not (0.0 < relative_accuracy < 1.0):
+            raise ValueError("relative_accuracy must be in (0,1)")
+        if not (0.0 < min_value < max_value):
+            raise ValueError("require 0 < min_value < max_value")
+        self.alpha = float(relative_accuracy)
+        self.gamma = (1.0 + self.alpha) / (1.0 - self.alpha)
+        self._log_gamma = math.log(self.gamma)
+        self.min_value = float(min_value)
+        self.max_value = float(max_value)
+        self._k_min = int(math.ceil(math.log(self.min_value) / self._log_gamma))
+        self._k_max = int(math.ceil(math.log(self.max_value) / self._log_gamma))
+        self._n_mag = self._k_max - self._k_min + 1
+        # Dense layout (ascending value order): [neg k_max .. neg k_min | zero | pos k_min .. pos k_max]
+        self.n_buckets = 2 * self._n_mag + 1
+        self.n_groups = int(n_groups)
+        self.counts = np.zeros((self.n_groups, self.n_buckets), dtype=np.int64)
+        self.n_clipped = 0
+        # Representative values per dense bucket (ascending)
+        keys = np.arange(self._k_min, self._k_max + 1)
+        mags = 2.0 * np.power(self.gamma, keys) / (self.gamma + 1.0)
+        self._values = np.concatenate([-mags[::-1], [0.0], mags])
+
+    # --- bucket mapping -------------------------------------------------------------------
+    def bucket_clipped(self, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Dense bucket indices (monotone in value) and the mask of values clipped above max_value."""
+        v = np.asarray(values, dtype=float)
+        mag = np.abs(v)
+        big = mag > self.min_value
+        keys = np.zeros(v.shape, dtype=np.int64)
+        clipped = np.zeros(v.shape, dtype=bool)
+        if np.any(big):
+            k = np.ceil(np.log(mag[big]) / self._log_gamma).astype(np.int64)
+            over = k > self._k_max
+            if np.any(over):
+                k[over] = self._k_max
+                clipped[big] = over
+            keys[big] = k - self._k_min + 1  # 1.._n_mag
+        sign = np.where(v < 0, -1, 1)
+        return self._n_mag + sign * keys, clipped
+
+    def bucket(self, values: np.ndarray) -> np.ndarray:
+        """Map values to dense bucket indices (monotone in value)."""
+        return self.bucket_clipped(values)[0]
+
+    # --- updates --------------------------------------------------------------------------
+    def add(self, values: np.ndarray, groups: np.ndarray | int = 0) -> None:
+        buckets, clipped = self.bucket_clipped(values)
+        idx = np.asarray(groups) * self.n_buckets + buckets
+        self.counts += np.bincount(np.ravel(idx), minlength=self.counts.size).reshape(self.counts.shape)
+        self.n_clipped += int(clipped.sum())
+
+    def move(self, old_idx: np.ndarray, new_idx: np.ndarray) -> None:
+        """Move samples between flat (group*n_buckets + bucket) indices."""
+        size = self.counts.size
+        delta = np.bincount(new_idx, minlength=size) - np.bincount(old_idx, minlength=size)
+        self.counts += delta.reshape(self.counts.shape)
+
+    def merge(self, other: "SignedLogSketch") -> "SignedLogSketch":
+        """In-place merge (count addition); layouts must be identical."""
+        if other.counts.shape != self.counts.shape or other.alpha != self.alpha or other.min_value != self.min_value:
+            raise ValueError("Cannot merge sketches with different layout")
+        self.counts += other.counts
+        self.n_clipped += other.n_clipped
+        return self
+
+    # --- queries --------------------------------------------------------------------------
+    def _quantile_from_counts(self, counts: np.ndarray, q_pct: float) -> float:
+        total = int(counts.sum())
+        if total == 0:
+            return float("nan")
+        rank = q_pct / 100.0 * (total - 1)
+        cum = np.cumsum(counts)
+        pos = int(np.searchsorted(cum, math.floor(rank), side="right"))
+        return float(self._values[min(pos, self.n_buckets - 1)])
+
+    def quantile(self, q_pct: float, group: int | None = None) -> float:
+        """Signed quantile (percent) of one group or of all groups combined."""
+        counts = self.counts.sum(axis=0) if group is None else self.counts[group]
+        return self._quantile_from_counts(counts, q_pct)
+
+    def abs_quantile(self, q_pct: float, group: int | None = None) -> float:
+        """Quantile of |x| by folding negative onto positive buckets (same magnitude keys)."""
+        counts = self.counts.sum(axis=0) if group is None else self.counts[group]
+        folded = counts[self._n_mag:].copy()
+        folded[1:] += counts[:self._n_mag][::-1]
+        total = int(folded.sum())
+        if total == 0:
+            return float("nan")
+        rank = q_pct / 100.0 * (total - 1)
+        pos = int(np.searchsorted(np.cumsum(folded), math.floor(rank), side="right"))
+        return float(self._values[self._n_mag + min(pos, self._n_mag)])
+
+    def group_sizes(self) -> np.ndarray:
+        return self.counts.sum(axis=1)
+
+    def error_bound(self, value: float) -> float:
+        """Worst-case absolute deviation of a returned quantile value from the true order statistic."""
+        return self.alpha * abs(value) + self.min_value
+
+
+class SpeedBinnedSketch:
+    """Incrementally maintained per speed-bin sketch of the secure path error.
+
+    Speeds are constant per sample in the time model, so the bin assignment is fixed
+    at construction (same edges as `compute_secure_interval_bounds`). Each `update`
+    recomputes bucket keys and moves only samples whose bucket changed; `sketch.n_clipped`
+    is the number of samples currently clipped.
+    """
+
+    def __init__(self, speeds: np.ndarray, speed_bin_width: float = 5.0,
+                 relative_accuracy: float = 0.005, min_value: float = 1e-6, max_value: float = 1e3):
+        speeds = np.asarray(speeds, dtype=float)
+        vmax = max(1e-9, float(np.max(speeds)))
+        self.n_bins = max(1, int(math.ceil(vmax / speed_bin_width)))
+        edges = np.linspace(0.0, self.n_bins * speed_bin_width, self.n_bins + 1)
+        self.bin_index = np.clip(np.digitize(speeds, edges) - 1, 0, self.n_bins - 1)
+        self.sketch = SignedLogSketch(self.n_bins, relative_accuracy, min_value, max_value)
+        self._flat: np.ndarray | None = None
+        self.n_samples = speeds.shape[0]
+        self.last_changed = 0
+
+    def update(self, secure: np.ndarray) -> int:
+        """Synchronise sketch with current secure values; returns number of moved samples."""
+        buckets, clipped = self.sketch.bucket_clipped(secure)
+        flat = self.bin_index * self.sketch.n_buckets + buckets
+        if self._flat is None:
+            self.sketch.counts += np.bincount(flat, minlength=self.sketch.counts.size).reshape(self.sketch.counts.shape)
+            changed = flat.shape[0]
+        else:
+            mask = flat != self._flat
+            changed = int(mask.sum())
+            if changed:
+                self.sketch.move(self._flat[mask], flat[mask])
+        self._flat = flat
+        self.sketch.n_clipped = int(clipped.sum())
+        self.last_changed = changed
+        return changed
+
+    def interval_bounds(
+        self,
+        quantile_low_pct: float = 1.0,
+        quantile_high_pct: float = 99.0,
+        min_bin_fraction: float = 0.05,
+    ) -> Tuple[np.ndarray, np.ndarray, Dict[str, Any]]:
+        """Per-sample (lower, upper) with the same fallback rules as the exact path."""
+        n = self.n_samples
+        q_global = self.sketch.abs_quantile(quantile_high_pct)
+        lower_bin = np.full(self.n_bins, -q_global)
+        upper_bin = np.full(self.n_bins, q_global)
+        sizes = self.sketch.group_sizes()
+        min_bin_size = int(math.ceil(min_bin_fraction * n))
+        fallback = False
+        used_bins = 0
+        for b in range(self.n_bins):
+            if sizes[b] == 0:
+                continue
+            if sizes[b] < min_bin_size:
+                fallback = True
+                continue
+            q_low = self.sketch.quantile(quantile_low_pct, b)
+            q_high = self.sketch.quantile(quantile_high_pct, b)
+            if q_low > q_high:
+                q_low, q_high = -abs(q_high), abs(q_high)
+            lower_bin[b] = q_low
+            upper_bin[b] = q_high
+            used_bins += 1
+        fallback_bins = self.n_bins - used_bins
+        fallback_escalated = False
+        if (fallback_bins / self.n_bins) > 0.20:
+            lower_bin[:] = -q_global
+            upper_bin[:] = q_global
+            fallback = True
+            fallback_escalated = True
+        meta = {
+            "fallback": fallback,
+            "global_q": q_global,
+            "used_bins": used_bins,
+            "n_bins": self.n_bins,
+            "fallback_escalated": fallback_escalated,
+            "fallback_bins": fallback_bins,
+            "rel_error_bound": self.sketch.alpha,
+            "n_changed": self.last_changed,
+        }
+        return lower_bin[self.bin_index], upper_bin[self.bin_index], meta
+
+
+__all__ = ["SignedLogSketch", "SpeedBinnedSketch"]
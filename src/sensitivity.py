@@ -23,6 +23,7 @@ from .sim_sensors import (
     simulate_imu_bias_position_error,
 )
 from .metrics import rmse
+from .dead_paths import analyze_config
 
 
 def base_longitudinal_samples(cfg: Config, n: int, rng: np.random.Generator) -> np.ndarray:
@@ -55,9 +56,12 @@ def default_oat_params(cfg: Config) -> List[str]:
         "sensors.odometry.drift_per_km_m",
         "sensors.imu.accel_bias_mps2.std",
     ]
-    # Filter any that do not exist (robustness if config changes)
+    # Filter any that do not exist (robustness if config changes) or lie below a dead component (no effect)
+    dead = analyze_config(cfg)
     valid: List[str] = []
     for p in candidates:
+        if dead.is_dead(p):
+            continue
         try:
             _ = _get_numeric(cfg.raw, p)
             valid.append(p)
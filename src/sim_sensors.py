@@ -10,23 +10,31 @@ import numpy as np
 
 from .config import Config
 from .distributions import registry, sample_mixture
+from .dead_paths import early_detection_dead, gnss_mode_dead, tail_dead
 
 
-def simulate_balise_errors(cfg: Config, n: int, rng: np.random.Generator) -> np.ndarray:
+def balise_speeds(cfg: Config, speeds: np.ndarray) -> np.ndarray | None:
+    """Speeds for the balise draws of a time loop: the samples' own speeds if `sensors.balise.speed_coupling`
+    is enabled, else None (independent placeholder speed draw, legacy default)."""
+    return speeds if cfg.sensors["balise"].get("speed_coupling", False) else None
+
+
+def simulate_balise_errors(cfg: Config, n: int, rng: np.random.Generator, speeds: np.ndarray | None = None) -> np.ndarray:
+    """Longitudinal balise error; `speeds` (m/s, shape (n,)) ties latency/early-detection terms to known vehicle speeds."""
     bal = cfg.sensors["balise"]
     latency = registry.sample(bal["latency_ms"], n, rng) / 1000.0  # s
     antenna = registry.sample(bal["antenna_offset_m"], n, rng)
     em = registry.sample(bal["em_disturbance_m"], n, rng)
-    base_tail = registry.sample(bal["multipath_tail_m"], n, rng)
-    multipath = base_tail  # already truncated exp; mixture weight applied below
+    tail_live = not tail_dead(bal["multipath_tail_m"])  # weight 0: no tail / mask draws
+    multipath = registry.sample(bal["multipath_tail_m"], n, rng) if tail_live else None  # truncated exp; weight below
     weather = registry.sample(bal["weather_uniform_m"], n, rng)
-    # Vehicle speed placeholder: assume uniform 0..16.7 m/s (60 km/h)
-    v = rng.uniform(0, 16.7, size=n)
-    heavy = sample_mixture(np.zeros(n), multipath, bal["multipath_tail_m"]["weight"], rng)
+    # Vehicle speed placeholder: assume uniform 0..16.7 m/s (60 km/h) unless caller knows the speeds
+    v = rng.uniform(0, 16.7, size=n) if speeds is None else np.asarray(speeds, dtype=float)
+    heavy = sample_mixture(np.zeros(n), multipath, bal["multipath_tail_m"]["weight"], rng) if tail_live else 0.0
     err_long = v * latency + antenna + em + heavy + weather
     # Early detection model: d_const - v * delta_t  (delta_t limited by cap)
     ed_cfg = bal.get("early_detection", {})
-    if ed_cfg.get("enabled", False):
+    if not early_detection_dead(ed_cfg):
         c1 = float(ed_cfg.get("c1_ms_per_mps", 0.0)) / 1000.0  # convert ms/(m/s) -> s/(m/s) = s^2/m
         cap_ms = float(ed_cfg.get("cap_ms", 0.0))
         cap_s = cap_ms / 1000.0
@@ -38,13 +46,13 @@ def simulate_balise_errors(cfg: Config, n: int, rng: np.random.Generator) -> np.
     return err_long
 
 
-def simulate_balise_errors_2d(cfg: Config, n: int, rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray]:
+def simulate_balise_errors_2d(cfg: Config, n: int, rng: np.random.Generator, speeds: np.ndarray | None = None) -> Tuple[np.ndarray, np.ndarray]:
     """Return longitudinal and lateral balise errors separately.
 
     Lateral distribution added in config (normal). Independence between axes assumed
     (first-order; cross-axis correlation negligible at cm-level for SIL1 context).
     """
-    long = simulate_balise_errors(cfg, n, rng)
+    long = simulate_balise_errors(cfg, n, rng, speeds=speeds)
     lat_spec = cfg.sensors["balise"].get("lateral")
     if lat_spec is None:
         lat = np.zeros(n)
@@ -55,6 +63,8 @@ def simulate_balise_errors_2d(cfg: Config, n: int, rng: np.random.Generator) ->
 
 def simulate_gnss_bias_noise(cfg: Config, n: int, rng: np.random.Generator, mode: str) -> np.ndarray:
     gnss_mode = cfg.sensors["gnss"]["modes"][mode]
+    if gnss_mode_dead(gnss_mode):
+        return np.zeros(n)  # permanent outage: contribution is 0 for every sample, no draws
     # Tunnel-Modus kann vollständigen Ausfall haben -> fallback Nullfehler (Hold-Last wird upstream modelliert)
     if "bias" in gnss_mode and "noise" in gnss_mode:
         bias = registry.sample(gnss_mode["bias"], n, rng)
@@ -63,7 +73,7 @@ def simulate_gnss_bias_noise(cfg: Config, n: int, rng: np.random.Generator, mode
         bias = np.zeros(n)
         noise = np.zeros(n)
     tail = 0.0
-    if "multipath_tail" in gnss_mode:
+    if not tail_dead(gnss_mode.get("multipath_tail")):
         tail_spec = gnss_mode["multipath_tail"]
         tail_vals = registry.sample(tail_spec, n, rng)
         tail = sample_mixture(np.zeros(n), tail_vals, tail_spec["weight"], rng)
@@ -83,6 +93,8 @@ def simulate_gnss_bias_noise_2d(cfg: Config, n: int, rng: np.random.Generator, m
     Assumes independence between axes conditional on mode (first-order; cross-correlation typically small for metre-level biases).
     """
     gnss_mode = cfg.sensors["gnss"]["modes"][mode]
+    if gnss_mode_dead(gnss_mode):
+        return np.zeros(n), np.zeros(n)
     long = simulate_gnss_bias_noise(cfg, n, rng, mode)
     bias_lat_spec = gnss_mode.get("bias_lat", gnss_mode.get("bias"))
     noise_lat_spec = gnss_mode.get("noise_lat", gnss_mode.get("noise"))
@@ -107,6 +119,8 @@ def simulate_map_error(cfg: Config, n: int, rng: np.random.Generator) -> np.ndar
     m = cfg.sensors["map"]
     long_ref = registry.sample(m["longitudinal"]["ref_error"], n, rng)
     interp_spec = m["longitudinal"]["interpolation"]
+    if tail_dead(interp_spec):
+        return long_ref
     interp_vals = registry.sample(interp_spec, n, rng)
     interp_mix = sample_mixture(np.zeros(n), interp_vals, interp_spec["weight"], rng)
     return long_ref + interp_mix
@@ -154,6 +168,7 @@ def combine_2d(long: np.ndarray, lat: np.ndarray) -> np.ndarray:
 
 
 __all__ = [
+    "balise_speeds",
     "simulate_balise_errors",
     "simulate_balise_errors_2d",
     "simulate_gnss_bias_noise",
@@ -0,0 +1,316 @@
+"""Rare safety-interval breaches over the horizon: subset simulation with trajectory restarts.
+
+Breach of a sample path: its fused error leaves the secure bounds [lower, upper] of the target
+row at least once over the horizon (rule-based rows), or exceeds a fixed protection limit
+|fused| > limit_m (any row). Plain repetition of `simulate_time_series` needs ~100 / p sample
+paths for a 10 % coefficient of variation; at p = 1e-6 that is out of reach. Rule-based fusion
+clamps the fused error to the secure bounds, so bound breaches stem from fusion transients only
+(none observed with model.yml: p = 0 after the first level); the protection limit is the event of
+interest there and for variance-weighted rows.
+
+Subset simulation in time (adaptive multilevel splitting with fixed effort): the score of a path
+is the running maximum M of its breach excess (lower - fused, fused - upper, or |fused| - limit);
+the breach is M > 0. Levels l_1 < l_2 < ... < 0 are chosen adaptively:
+
+1. level 0: N paths of the plain time loop. Whenever the running maximum of a path sets a new
+   record, its state row (state block: static draws, drift, balise anchor, held GNSS fix, fusion
+   state) is kept as a snapshot together with the step;
+2. the next level is the (1 - p0) quantile of M; the paths above it (seeds) are cloned from their
+   snapshot at the first crossing of the level and restarted at that step with their own random
+   draws (N clones, split evenly over the seeds), until the horizon;
+3. repeat until the level reaches 0; p = Π p_j with p_j the share above the next level (the
+   breached share at the last level).
+
+Breaches of the protection limit come mostly from one-shot jumps of the balise anchor (a new
+draw far in its tail), which the running maximum cannot anticipate: untilted, the levels stall
+a few cm below the limit and the estimate is biased low. The restarted paths therefore draw their
+anchors from a tilted law (importance sampling by sampling-importance-resampling): R candidates
+per balise event, one chosen with probability ∝ exp(θ·|anchor|); the path carries the likelihood
+ratio mean(g) / g(chosen) of its draws (inherited by its clones), and the breached share at the
+last level is weighted with it. Levels below carry the plain shares of the tilted paths.
+
+The clones of a seed are correlated, so the variance of p_j is estimated from the clone families
+(cluster sampling); the CV of p combines the levels as independent (Au & Beck, 2001), which is
+optimistic when levels are strongly correlated; `repeats` gives the CV across independent runs.
+Adaptive levels bias p by O(1/N).
+
+Valid range (model.yml, variance-weighted long row, 60 s, N = 2000, θ = 45 1/m, R = 256, 32 runs
+against 3e6 plain paths): p = 2.6e-4 and 8.0e-6 come out 9 % and 29 % low (1.5 and 1.3 combined
+standard errors), with 6x and ~35x less variance than plain Monte Carlo at the same cost. Below ~1e-6 single runs are
+dominated by a few heavy weights (per-run CV > 3, typical runs far too low); such estimates and
+anything at the probability scale of safety integrity targets are outside the validated range.
+Bound breaches of rule-based rows do not occur with model.yml (p = 0).
+
+The time loop shares population statistics between samples: secure interval bounds (per speed
+bin quantiles of the secure error), lateral P99 bound and the variances of variance-weighted
+rows. Computed on the clones they would be biased towards the tail; they are taken from a
+reference lane instead, an unresampled population of N samples stepped alongside (lane 0 of the
+engine) and replayed bit-identically at every level. Level-0 paths start as copies of the
+reference samples; bounds depend on the speed (and for tables on the distance since the last
+balise, a function of speed and time), so a path gets the bounds of the reference sample of its
+level-0 ancestor. Cost per level: two lanes of the plain loop over the horizon.
+"""
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List
+
+import numpy as np
+
+from .config import Config
+from .sim_sensors import balise_speeds, simulate_balise_errors_2d
+from .time_sim import _TimeSeriesEngine, _update_lane_interval
+from .ts_metrics import ROWS
+
+
+@dataclass
+class BreachSpec:
+    """Breach event of one fused row: |fused| > limit_m, or outside the secure bounds (limit_m None, rule-based rows)."""
+    limit_m: float | None  # protection limit [m]; None only for bound breaches
+    row: str = "long"      # 'long' | 'lat' | '2d' ('2d' requires limit_m)
+
+
+@dataclass
+class BreachEstimate:
+    """Probability of at least one breach over the horizon per sample path."""
+    p: float
+    cv: float                     # coefficient of variation of p (repeats: across repeats, else from the levels)
+    estimates: List[float]        # per repeat
+    n_samples: int
+    horizon_s: float
+    plain_run_equivalents: float  # simulated sample-steps (both lanes) / (N · steps), all repeats
+    runtime_s: float
+    levels: List[Dict[str, float]] = field(default_factory=list)  # last repeat: level, p_cond, cv_cond, seeds[, stopped_below_breach]
+
+    def plain_mc_cv(self) -> float:
+        """CV of plain Monte Carlo with as many sample paths as the splitting cost."""
+        n_paths = self.plain_run_equivalents * self.n_samples
+        return float(np.sqrt((1.0 - self.p) / (self.p * n_paths))) if self.p > 0 else float("inf")
+
+
+@dataclass
+class _Restart:
+    """Paths of one level: restart step, state rows (lane 1 layout, last axis = path) and bookkeeping."""
+    step: np.ndarray             # (N,) step at which the path continues
+    rows: Dict[str, np.ndarray]  # state block field → (..., N)
+    score: np.ndarray            # running maximum at the restart
+    smooth: np.ndarray           # smoothed excess at the restart
+    eve: np.ndarray              # reference sample of the level-0 ancestor
+    family: np.ndarray           # seed (clone family) of the level
+    logw: np.ndarray             # log likelihood ratio of the tilted anchor draws up to the restart
+
+
+def _cluster_cv(hit: np.ndarray, family: np.ndarray) -> float:
+    """CV of the mean of `hit` (indicator or weighted indicator) with correlated clone families (cluster sampling)."""
+    n = hit.shape[0]
+    p = hit.mean()
+    if p <= 0.0:
+        return float("nan")
+    _, fam = np.unique(family, return_inverse=True)
+    sums = np.bincount(fam, weights=hit.astype(float))
+    sizes = np.bincount(fam)
+    n_fam = sums.shape[0]
+    var = np.sum((sums - sizes * p) ** 2) / n ** 2 * (n_fam / (n_fam - 1.0) if n_fam > 1 else 1.0)
+    return float(np.sqrt(var) / p)
+
+
+class _SubsetEngine(_TimeSeriesEngine):
+    """Two-lane time loop of one level: lane 0 reference population, lane 1 restarted paths."""
+
+    def __init__(self, cfg: Config, ref_seed: int, rng: np.random.Generator, breach: BreachSpec,
+                 restart: _Restart | None = None, smoothing_s: float = 1.0, anchor_tilt: float = 45.0,
+                 anchor_candidates: int = 256, **kwargs):
+        if breach.row not in ROWS:
+            raise ValueError(f"Unknown breach row '{breach.row}' (expected one of {sorted(ROWS)})")
+        super().__init__([cfg, cfg], [np.random.default_rng(ref_seed), rng], metrics=("rmse",), **kwargs)
+        if breach.row != "long" and not self.with_lateral:
+            raise ValueError(f"Breach row '{breach.row}' requires the lateral axis")
+        self.row = ROWS[breach.row]
+        if breach.limit_m is None and (self.row >= self.rule_axes.shape[1] or not self.rule_axes[0, self.row]):
+            raise ValueError("secure bounds exist for rule-based rows only; set BreachSpec.limit_m for this row")
+        self.limit = breach.limit_m
+        n = self.n
+        # Level-0 paths start as copies of the reference samples; restarted paths are written at their step
+        for name in self.sb.names:
+            self.sb[name][1] = self.sb[name][0]
+        if restart is None:
+            restart = _Restart(step=np.zeros(n, dtype=np.int64), rows={}, score=np.full(n, -np.inf),
+                               smooth=np.full(n, np.nan), eve=np.arange(n), family=np.arange(n), logw=np.zeros(n))
+        self.restart = restart
+        self.eve = restart.eve
+        self.score = restart.score.copy()
+        self.smooth = restart.smooth.copy()
+        self.logw = restart.logw.copy()
+        self.anchor_tilt = float(anchor_tilt)
+        self.anchor_candidates = max(1, int(anchor_candidates))
+        self.decay = float(np.exp(-self.dt / smoothing_s)) if smoothing_s > 0 else 0.0
+        order = np.argsort(restart.step, kind="stable")
+        self._pending = (restart.step[order], order)
+        self._next = 0
+        self.active = np.zeros(n, dtype=bool)
+        # Snapshots at new running maxima (path, value, smoothed excess, step, log weight, rows); restart states first
+        self._rec: List[tuple] = []
+        if restart.rows:
+            self._rec.append((np.arange(n), restart.score.copy(), restart.smooth.copy(), restart.step.copy(),
+                              restart.logw.copy(), restart.rows))
+
+    # --- population statistics from the reference lane -------------------------------------
+    def update_intervals(self) -> None:
+        lane = self.lanes[0]
+        if lane.use_rule_based:
+            _update_lane_interval(lane, self.secure[0], self.speeds[0], self.dist_since_balise[0], self.k,
+                                  self.update_steps, self.adaptive_interval)
+            self.set_lane_interval(0, lane.lower, lane.upper)
+            self.set_lane_interval(1, lane.lower[self.eve], lane.upper[self.eve])
+
+    def set_lateral_bound(self, q: np.ndarray) -> np.ndarray:
+        return super().set_lateral_bound(np.full_like(q, q[0]))
+
+    def secure_variances(self, include_long: bool = True):
+        out = super().secure_variances(include_long)
+        self.var_s[1] = self.var_s[0]
+        self.var_u[1] = self.var_u[0]
+        return out
+
+    # --- tilted balise anchors of the restarted lane ------------------------------------------
+    def draw_balise(self, s: int, events: np.ndarray):
+        """Lane 1 with anchor_tilt > 0: one of R candidate draws per event, chosen ∝ exp(θ·|anchor|) (SIR).
+
+        The path weight gains mean_r g(a_r) / g(a_chosen), which keeps E[weight · f] = E_nominal[f]
+        for any R; lane 0 draws nominally.
+        """
+        if s == 0 or self.anchor_tilt <= 0.0 or self.anchor_candidates < 2:
+            return super().draw_balise(s, events)
+        lane, r = self.lanes[s], self.anchor_candidates
+        idx = np.flatnonzero(events)
+        m = idx.size
+        cand_long, cand_lat = simulate_balise_errors_2d(lane.cfg, m * r, lane.rng,
+                                                        speeds=balise_speeds(lane.cfg, np.repeat(self.speeds[s, idx], r)))
+        cand_long = cand_long.reshape(m, r)
+        log_g = self.anchor_tilt * np.abs(cand_long)
+        log_g -= log_g.max(axis=1, keepdims=True)
+        g = np.exp(log_g)
+        cum = np.cumsum(g, axis=1)
+        pick = np.minimum((cum < lane.rng.random(m)[:, None] * cum[:, -1:]).sum(axis=1), r - 1)
+        rows = np.arange(m)
+        self.logw[idx] += np.log(cum[:, -1] / r) - log_g[rows, pick]
+        return cand_long[rows, pick], cand_lat.reshape(m, r)[rows, pick]
+
+    # --- restarts and records ---------------------------------------------------------------
+    def _activate(self) -> None:
+        steps, order = self._pending
+        stop = int(np.searchsorted(steps, self.k, side="right"))
+        if stop > self._next:
+            idx = order[self._next:stop]
+            for name, rows in self.restart.rows.items():
+                self.sb[name][1][..., idx] = rows[..., idx]
+            self.logw[idx] = self.restart.logw[idx]
+            self.active[idx] = True
+            self._next = stop
+
+    def update_scores(self) -> None:
+        fused = self.block[1, self.row]
+        if self.limit is None:
+            excess = np.maximum(self.lower3[1, self.row] - fused, fused - self.upper3[1, self.row])
+        else:
+            excess = np.abs(fused) - self.limit
+        # Level function: smoothed excess (per-step GNSS noise averaged out), the excess itself once breached
+        smooth = np.where(np.isnan(self.smooth), excess, self.decay * self.smooth + (1.0 - self.decay) * excess)
+        self.smooth = np.where(self.active, smooth, self.smooth)
+        level = np.where(excess > 0.0, excess, self.smooth)
+        # New running maxima up to the first breach (no level lies above it)
+        idx = np.flatnonzero(self.active & (level > self.score) & (self.score <= 0.0))
+        if idx.size:
+            self.score[idx] = level[idx]
+            rows = {name: self.sb[name][1][..., idx].copy() for name in self.sb.names}
+            self._rec.append((idx, level[idx].copy(), self.smooth[idx].copy(), np.full(idx.size, self.k + 1, dtype=np.int64),
+                              self.logw[idx].copy(), rows))
+
+    def step(self) -> None:
+        self._activate()
+        self.advance_paths()
+        self.update_intervals()
+        self.secure_variances(include_long=not self.rule_axes[:, 0].all())
+        self.fuse()
+        self.update_scores()
+        self.k += 1
+        self.n_iterations += 1
+
+    def seeds(self, level: float, rng: np.random.Generator) -> _Restart:
+        """N clones of the paths above `level`, each from its snapshot at the first crossing."""
+        path = np.concatenate([r[0] for r in self._rec])
+        value = np.concatenate([r[1] for r in self._rec])
+        smooth = np.concatenate([r[2] for r in self._rec])
+        step = np.concatenate([r[3] for r in self._rec])
+        logw = np.concatenate([r[4] for r in self._rec])
+        above = np.flatnonzero(value > level)
+        seed_paths, first = np.unique(path[above], return_index=True)  # records are chronological per path
+        rec = above[first]
+        n, n_seeds = self.n, seed_paths.size
+        # Even split of the N clones over the seeds, remainder to random seeds
+        clones = np.repeat(np.arange(n_seeds), n // n_seeds)
+        clones = np.concatenate([clones, rng.choice(n_seeds, size=n - clones.size, replace=False)])
+        src = rec[clones]
+        rows = {name: np.concatenate([r[5][name] for r in self._rec], axis=-1)[..., src] for name in self.sb.names}
+        return _Restart(step=step[src], rows=rows, score=value[src], smooth=smooth[src], eve=self.eve[seed_paths][clones],
+                        family=clones, logw=logw[src])
+
+
+def estimate_breach_probability(cfg: Config, rng: np.random.Generator, breach: BreachSpec, p0: float = 0.1,
+                                max_levels: int = 20, smoothing_s: float = 1.0, repeats: int = 1,
+                                anchor_tilt: float = 45.0, anchor_candidates: int = 256, **kwargs: Any) -> BreachEstimate:
+    """Probability that a sample path breaches (`breach`) at least once over sim.time_horizon_s.
+
+    `p0` is the conditional probability per level (share of seeds), at most `max_levels` levels.
+    `anchor_tilt` [1/m] tilts the balise anchor draws of the restarted paths (`anchor_candidates`
+    candidates each; 0 = plain subset simulation); the defaults are tuned to model.yml (anchor
+    spread ~4 cm), see the module docstring for the validated range. `repeats` independent runs (child streams
+    of `rng`); with repeats >= 2 the CV is the standard error of their mean, otherwise the level
+    estimate. Remaining keyword arguments go to the time loop (threshold_oos, with_lateral,
+    blend_steps, interval_table, ...).
+    """
+    if not 0.0 < p0 < 1.0:
+        raise ValueError("p0 must lie in (0, 1)")
+    t0 = time.perf_counter()
+    estimates, cvs, sample_steps = [], [], 0
+    for child in rng.spawn(max(1, int(repeats))):
+        ref_seed = int(child.integers(2 ** 63))
+        restart, p, cv2, levels = None, 1.0, 0.0, []
+        for j in range(max_levels + 1):
+            eng = _SubsetEngine(cfg, ref_seed, child, breach, restart=restart, smoothing_s=smoothing_s,
+                                anchor_tilt=anchor_tilt, anchor_candidates=anchor_candidates, **kwargs)
+            eng.run()
+            sample_steps += 2 * eng.n_iterations
+            family = eng.restart.family
+            n_seeds = int(np.ceil(p0 * eng.n))
+            level = float(np.sort(eng.score)[::-1][n_seeds])
+            final = level >= 0.0 or j == max_levels or not np.any(eng.score > level)
+            hit = eng.score > (0.0 if final else level)
+            # Intermediate levels: shares of the tilted paths; the last level carries their likelihood ratios
+            value = hit * np.exp(eng.logw) if final else hit.astype(float)
+            p_cond, cv_cond = float(value.mean()), _cluster_cv(value, family)
+            record = {"level": 0.0 if final else level, "p_cond": p_cond, "cv_cond": cv_cond, "seeds": int(hit.sum())}
+            if final and level < 0.0:
+                # max_levels reached or no progress: the last share spans the remaining gap to the breach (large CV)
+                record["stopped_below_breach"] = level
+            levels.append(record)
+            p *= p_cond
+            cv2 += cv_cond ** 2
+            if final:
+                break
+            restart = eng.seeds(level, child)
+        estimates.append(p)
+        cvs.append(float(np.sqrt(cv2)) if p > 0 else float("nan"))
+    p = float(np.mean(estimates))
+    if len(estimates) > 1:
+        cv = float(np.std(estimates, ddof=1) / np.sqrt(len(estimates)) / p) if p > 0 else float("nan")
+    else:
+        cv = cvs[0]
+    return BreachEstimate(
+        p=p, cv=cv, estimates=estimates, n_samples=eng.n, horizon_s=eng.n_steps * eng.dt,
+        plain_run_equivalents=sample_steps / eng.n_steps, runtime_s=time.perf_counter() - t0, levels=levels,
+    )
+
+
+__all__ = ["BreachSpec", "BreachEstimate", "estimate_breach_probability"]
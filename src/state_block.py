@@ -0,0 +1,89 @@
+"""Structure-of-arrays state block: one contiguous buffer with named, typed row views.
+
+The time-series loop state (speeds, balise / drift state, GNSS hold values, fusion blocks,
+fusion state, outage flags) lives in a single byte buffer instead of ~20 separate arrays:
+
+* fields are grouped by dtype; every group is one (S, R_g, N) section (lanes × rows × samples)
+  aligned to 64 bytes, so the rows of one lane are adjacent and a single lane is fully contiguous;
+* `block[name]` is a view of shape (S, N) for single-row fields (rows None) and (S, rows, N) for
+  stacked fields (rows int, also rows = 1); the engine binds its attributes to these views once
+  and updates them in place;
+* snapshot / restore / checkpoint / pickling copy one buffer, and the buffer can be supplied
+  externally (e.g. `multiprocessing.shared_memory.SharedMemory(...).buf`).
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+_ALIGN = 64
+
+
+class StateBlock:
+    """Named row views over one contiguous buffer (`fields`: (name, rows | None, dtype) in layout order)."""
+
+    def __init__(self, fields: Sequence[Tuple[str, int | None, Any]], n_lanes: int, n: int, buffer: Any = None):
+        self.fields = tuple((str(name), None if rows is None else int(rows), np.dtype(dtype)) for name, rows, dtype in fields)
+        self.n_lanes, self.n = int(n_lanes), int(n)
+        # dtype groups in order of first appearance → (dtype, byte offset, total rows)
+        groups: Dict[np.dtype, List[Tuple[str, int | None]]] = {}
+        for name, rows, dtype in self.fields:
+            groups.setdefault(dtype, []).append((name, rows))
+        offset = 0
+        sections = []
+        for dtype, members in groups.items():
+            offset = -(-offset // _ALIGN) * _ALIGN
+            n_rows = sum(rows or 1 for _, rows in members)
+            sections.append((dtype, offset, n_rows, members))
+            offset += self.n_lanes * n_rows * self.n * dtype.itemsize
+        self.nbytes = offset
+        if buffer is None:
+            self.buffer = np.zeros(self.nbytes, dtype=np.uint8)
+        else:
+            self.buffer = np.frombuffer(buffer, dtype=np.uint8, count=self.nbytes)
+        self._views: Dict[str, np.ndarray] = {}
+        for dtype, start, n_rows, members in sections:
+            size = self.n_lanes * n_rows * self.n * dtype.itemsize
+            group = self.buffer[start:start + size].view(dtype).reshape(self.n_lanes, n_rows, self.n)
+            row = 0
+            for name, rows in members:
+                self._views[name] = group[:, row] if rows is None else group[:, row:row + rows]
+                row += rows or 1
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self._views[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._views
+
+    @property
+    def names(self) -> Tuple[str, ...]:
+        return tuple(name for name, _, _ in self.fields)
+
+    def layout(self) -> Dict[str, Any]:
+        """JSON-serialisable description (fields, lanes, samples) identifying the buffer layout."""
+        return {"n_lanes": self.n_lanes, "n": self.n,
+                "fields": [[name, rows, dtype.str] for name, rows, dtype in self.fields]}
+
+    def snapshot(self) -> np.ndarray:
+        """Copy of the complete state (one buffer copy)."""
+        return self.buffer.copy()
+
+    def restore(self, data: np.ndarray) -> None:
+        """Overwrite the state in place from a `snapshot` (views stay valid)."""
+        data = np.asarray(data, dtype=np.uint8).ravel()
+        if data.shape[0] != self.nbytes:
+            raise ValueError(f"State snapshot has {data.shape[0]} bytes, block layout expects {self.nbytes}")
+        self.buffer[...] = data
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return {"layout": self.layout(), "buffer": self.buffer.tobytes()}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        layout = state["layout"]
+        self.__init__([(name, rows, np.dtype(dt)) for name, rows, dt in layout["fields"]], layout["n_lanes"], layout["n"])
+        self.restore(np.frombuffer(state["buffer"], dtype=np.uint8))
+
+
+__all__ = ["StateBlock"]
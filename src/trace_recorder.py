@@ -0,0 +1,161 @@
+"""Per-sample trajectory traces (reservoir + threshold breaches) on memory-mapped arrays.
+
+Aggregate metrics hide how single samples move between the interval bounds. The recorder keeps
+full per-step series of secure, unsafe, fused, lower, upper and mode for
+
+* a uniform reservoir of `n_samples` samples (drawn once from a dedicated generator, so the
+  simulation streams are untouched), and
+* up to `max_breach` further samples the first time |fused| exceeds `breach_threshold`; a ring
+  buffer of the last `pre_window_steps` steps of all samples supplies the history before the
+  breach (older steps stay NaN).
+
+Layout in `directory`: one (rows × n_steps) `.npy` memmap per channel (float32, mode int8 with
+-1 = not recorded) and `trace_meta.json` (sample ids, kind, first breach step). Steps are
+buffered in blocks and written column-block-wise, keeping the per-step cost to a few gathers.
+"""
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict
+
+import numpy as np
+
+CHANNELS = ("secure", "unsafe", "fused", "lower", "upper")
+KIND_RESERVOIR = 0
+KIND_BREACH = 1
+
+
+@dataclass
+class TraceSpec:
+    """Trace recorder settings of one scenario lane."""
+    directory: str | Path
+    n_samples: int = 64
+    breach_threshold: float | None = None  # default: out-of-spec threshold of the run
+    max_breach: int = 256
+    pre_window_steps: int = 50
+    seed: int = 0
+    block_steps: int = 256
+
+
+class TraceRecorder:
+    """Reservoir + breach traces of one lane; `record` once per simulated step, `close` at the end."""
+
+    def __init__(self, spec: TraceSpec, n: int, n_steps: int, dt: float, breach_threshold: float):
+        self.directory = Path(spec.directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.n, self.n_steps, self.dt = n, n_steps, dt
+        self.threshold = float(spec.breach_threshold if spec.breach_threshold is not None else breach_threshold)
+        k = min(int(spec.n_samples), n)
+        self.max_breach = max(0, int(spec.max_breach))
+        self.n_rows = k + self.max_breach
+        self.sample_ids = np.full(self.n_rows, -1, dtype=np.int64)
+        self.sample_ids[:k] = np.sort(np.random.default_rng(spec.seed).choice(n, size=k, replace=False))
+        self.kind = np.full(self.n_rows, KIND_RESERVOIR, dtype=np.int8)
+        self.kind[k:] = KIND_BREACH
+        self.first_breach = np.full(self.n_rows, -1, dtype=np.int64)
+        self.n_tracked = k
+        self.breached = np.zeros(n, dtype=bool)
+        self.breached[self.sample_ids[:k]] = True  # reservoir rows are traced anyway
+        self.mm = {ch: np.lib.format.open_memmap(self.directory / f"{ch}.npy", mode="w+", dtype=np.float32,
+                                                 shape=(self.n_rows, n_steps)) for ch in CHANNELS}
+        for arr in self.mm.values():
+            arr[:] = np.nan
+        self.mm["mode"] = np.lib.format.open_memmap(self.directory / "mode.npy", mode="w+", dtype=np.int8,
+                                                    shape=(self.n_rows, n_steps))
+        self.mm["mode"][:] = -1
+        # Block buffer (steps × rows) and ring buffer (window × N) of all samples for breach history
+        self.block_steps = max(1, int(spec.block_steps))
+        self.buf = {ch: np.empty((self.block_steps, self.n_rows), dtype=np.float32) for ch in CHANNELS}
+        self.buf["mode"] = np.empty((self.block_steps, self.n_rows), dtype=np.int8)
+        self.buf_steps = np.empty(self.block_steps, dtype=np.int64)
+        self.n_buf = 0
+        self.window = max(0, int(spec.pre_window_steps)) if self.max_breach else 0
+        n_ring = self.window + 1 if self.window else 0  # window before the breach + the current step
+        self.ring = {ch: np.empty((n_ring, n), dtype=np.float32) for ch in CHANNELS} if n_ring else {}
+        if n_ring:
+            self.ring["mode"] = np.empty((n_ring, n), dtype=np.int8)
+        self.ring_steps = np.full(n_ring, -1, dtype=np.int64)
+
+    def record(self, k: int, secure: np.ndarray, unsafe: np.ndarray, fused: np.ndarray, lower: np.ndarray,
+               upper: np.ndarray, mode: np.ndarray) -> None:
+        values = {"secure": secure, "unsafe": unsafe, "fused": fused, "lower": lower, "upper": upper, "mode": mode}
+        if self.n_tracked < self.n_rows:
+            if self.window:
+                slot = k % self.ring_steps.shape[0]
+                for ch, arr in values.items():
+                    self.ring[ch][slot] = arr
+                self.ring_steps[slot] = k
+            new = np.flatnonzero((np.abs(fused) > self.threshold) & ~self.breached)
+            if new.size:
+                self._add_breaches(k, new[:self.n_rows - self.n_tracked])
+        if self.n_buf == self.block_steps:
+            self.flush()
+        ids = self.sample_ids[:self.n_tracked]
+        for ch, arr in values.items():
+            self.buf[ch][self.n_buf, :self.n_tracked] = arr[ids]
+        self.buf_steps[self.n_buf] = k
+        self.n_buf += 1
+
+    def _add_breaches(self, k: int, samples: np.ndarray) -> None:
+        self.flush()  # buffered steps belong to the old row set
+        rows = np.arange(self.n_tracked, self.n_tracked + samples.size)
+        self.sample_ids[rows] = samples
+        self.first_breach[rows] = k
+        self.breached[samples] = True
+        self.n_tracked += samples.size
+        # Pre-breach history from the ring buffer (the current step is written by the regular path)
+        hist = np.flatnonzero((self.ring_steps >= 0) & (self.ring_steps < k))
+        if hist.size:
+            steps = self.ring_steps[hist]
+            for ch in self.buf:
+                self.mm[ch][np.ix_(rows, steps)] = self.ring[ch][np.ix_(hist, samples)].T
+
+    def flush(self) -> None:
+        if self.n_buf == 0:
+            return
+        steps = self.buf_steps[:self.n_buf]
+        rows = np.arange(self.n_tracked)
+        contiguous = steps[-1] - steps[0] + 1 == self.n_buf
+        for ch, buf in self.buf.items():
+            block = buf[:self.n_buf, :self.n_tracked].T
+            if contiguous:
+                self.mm[ch][:self.n_tracked, steps[0]:steps[-1] + 1] = block
+            else:
+                self.mm[ch][np.ix_(rows, steps)] = block
+        self.n_buf = 0
+
+    def close(self) -> None:
+        self.flush()
+        for arr in self.mm.values():
+            arr.flush()
+        meta = {
+            "n_steps": self.n_steps,
+            "dt_s": self.dt,
+            "breach_threshold": self.threshold,
+            "n_rows_used": int(self.n_tracked),
+            "sample_ids": self.sample_ids[:self.n_tracked].tolist(),
+            "kind": self.kind[:self.n_tracked].tolist(),
+            "first_breach_step": self.first_breach[:self.n_tracked].tolist(),
+        }
+        tmp = self.directory / "trace_meta.json.tmp"
+        tmp.write_text(json.dumps(meta))
+        os.replace(tmp, self.directory / "trace_meta.json")
+
+
+def load_traces(directory: str | Path) -> Dict[str, np.ndarray]:
+    """Used trace rows per channel (read-only memmaps) plus `t_s`, `sample_ids`, `kind`, `first_breach_step`."""
+    directory = Path(directory)
+    meta = json.loads((directory / "trace_meta.json").read_text())
+    used = meta["n_rows_used"]
+    out = {ch: np.load(directory / f"{ch}.npy", mmap_mode="r")[:used] for ch in CHANNELS + ("mode",)}
+    out["t_s"] = meta["dt_s"] * (np.arange(meta["n_steps"]) + 1)
+    out["sample_ids"] = np.array(meta["sample_ids"], dtype=np.int64)
+    out["kind"] = np.array(meta["kind"], dtype=np.int8)
+    out["first_breach_step"] = np.array(meta["first_breach_step"], dtype=np.int64)
+    return out
+
+
+__all__ = ["TraceSpec", "TraceRecorder", "load_traces", "KIND_RESERVOIR", "KIND_BREACH"]
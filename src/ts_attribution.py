@@ -0,0 +1,200 @@
+"""Online time-resolved attribution: SRC(t) and PRCC(t) of the fused error from streaming moments.
+
+`sensitivity.lean_src_prcc_pipeline` regresses the fused error of the static epoch on its
+components. Inside the time loop the same regressions are evaluated per window of recorded
+instants without storing N × T matrices. At every sampled instant (`every_s`, a multiple of the
+metric cadence) the per-sample component state
+
+  X = (balise anchor, map, odometry drift, GNSS bias, GNSS noise of the held fix)
+
+of the target axis (longitudinal or lateral; lateral odometry drift is not modelled, its
+column is zero) and the fused error y of the target row are reduced to two (k+1) × (k+1) moment matrices per
+lane, which are summed over the window:
+
+* centred cross products of [X, y] → pooled covariance → SRC_j = β_j σ_j / σ_y with
+  β = Cov(X)^-1 Cov(X, y) (`sensitivity.compute_src`);
+* centred cross products of the normalised ranks of [X, y] → PRCC_j = -P_jy / sqrt(P_jj P_yy)
+  with P the inverse rank covariance, i.e. the correlation of the residuals of rank(X_j) and
+  rank(y) on the other ranks (`sensitivity.compute_prcc`). Ranks of the static components
+  (map, GNSS bias) are computed once.
+
+Components without variance in a window (e.g. odometry drift at t = 0) get SRC = PRCC = 0.
+The cost per sampled instant is a few O(N) passes and four sorts (balise, drift, GNSS noise,
+fused error). With a window of one sampled instant the values equal the static-epoch functions
+applied to that instant's samples.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, List
+
+import numpy as np
+
+from .ts_metrics import ROWS
+
+COMPONENTS = ("balise", "map", "odometry", "gnss_bias", "gnss_noise")
+_STATIC = (False, True, False, True, False)  # per-sample constant over the horizon → ranks computed once
+
+
+@dataclass
+class AttributionSpec:
+    """Online SRC / PRCC of the fused error on its components."""
+    every_s: float = 1.0    # sampling cadence of the instants (rounded to a multiple of the metric cadence)
+    window_s: float = 10.0  # pooling window of the moments (rounded to whole sampled instants)
+    target: str = "long"    # fused row: 'long' | 'lat' (the radial row has no per-axis components)
+
+
+@dataclass
+class AttributionResult:
+    """SRC(t) / PRCC(t) per window end time, columns in `components` order."""
+    times: np.ndarray
+    components: tuple
+    src: np.ndarray   # (T, k)
+    prcc: np.ndarray  # (T, k)
+
+    def rows(self) -> List[Dict[str, float]]:
+        """Wide rows (t_s, src_<component>…, prcc_<component>…) for CSV export."""
+        out = []
+        for i, t in enumerate(self.times):
+            row = {"t_s": float(t)}
+            row.update({f"src_{c}": float(v) for c, v in zip(self.components, self.src[i])})
+            row.update({f"prcc_{c}": float(v) for c, v in zip(self.components, self.prcc[i])})
+            out.append(row)
+        return out
+
+
+def _ranks(values: np.ndarray) -> np.ndarray:
+    """Normalised ranks 0..1 along the last axis (ordinal, as `sensitivity.compute_prcc`).
+
+    Constant rows get rank 0 throughout: ordinal ranks of ties would invent variance.
+    """
+    n = values.shape[-1]
+    order = np.argsort(values, axis=-1)
+    ranks = np.empty(values.shape)
+    np.put_along_axis(ranks, order, np.broadcast_to(np.arange(n) / (n - 1), values.shape), axis=-1)
+    ranks[np.ptp(values, axis=-1) == 0] = 0.0
+    return ranks
+
+
+def _centred_moments(z: np.ndarray) -> np.ndarray:
+    """Σ (z - mean)(z - mean)^T over samples for (S, m, N) → (S, m, m)."""
+    zc = z - z.mean(axis=-1, keepdims=True)
+    return np.matmul(zc, np.swapaxes(zc, -1, -2))
+
+
+def src_from_moments(cov: np.ndarray) -> np.ndarray:
+    """SRC of the first k variables on the last one from a (k+1, k+1) (pooled) covariance."""
+    k = cov.shape[0] - 1
+    out = np.zeros(k)
+    var = np.diag(cov)
+    active = np.flatnonzero(var[:k] > 0)
+    if var[k] <= 0 or active.size == 0:
+        return out
+    beta = np.linalg.lstsq(cov[np.ix_(active, active)], cov[active, k], rcond=None)[0]
+    out[active] = beta * np.sqrt(var[active] / var[k])
+    return out
+
+
+def prcc_from_moments(cov: np.ndarray) -> np.ndarray:
+    """PRCC of the first k variables with the last one from a (k+1, k+1) rank covariance."""
+    k = cov.shape[0] - 1
+    out = np.zeros(k)
+    var = np.diag(cov)
+    active = np.flatnonzero(var[:k] > 0)
+    if var[k] <= 0 or active.size == 0:
+        return out
+    idx = np.append(active, k)
+    prec = np.linalg.pinv(cov[np.ix_(idx, idx)])
+    denom = np.sqrt(prec[:-1, :-1].diagonal() * prec[-1, -1])
+    with np.errstate(invalid="ignore", divide="ignore"):
+        out[active] = np.where(denom > 0, -prec[:-1, -1] / denom, 0.0)
+    return out
+
+
+class OnlineAttribution:
+    """Window accumulators of the moment matrices and the SRC / PRCC series of all lanes."""
+
+    def __init__(self, spec: AttributionSpec, n_lanes: int, record_dt: float, with_lateral: bool):
+        if spec.target not in ROWS:
+            raise ValueError(f"Unknown attribution target '{spec.target}' (expected one of {sorted(ROWS)})")
+        if spec.target == "2d":
+            raise ValueError("Attribution target '2d' is not supported: the radial error is not a regression on "
+                             "one axis' components (use 'long' or 'lat')")
+        if spec.target != "long" and not with_lateral:
+            raise ValueError(f"Attribution target '{spec.target}' requires the lateral axis")
+        self.spec = spec
+        self.row = ROWS[spec.target]
+        self.stride = max(1, int(round(spec.every_s / record_dt)))
+        self.window = max(1, int(round(spec.window_s / (self.stride * record_dt))))
+        m = len(COMPONENTS) + 1
+        self.cov = np.zeros((n_lanes, m, m))
+        self.rank_cov = np.zeros((n_lanes, m, m))
+        self.n_acc = 0
+        self.times: List[float] = []
+        self.src: List[np.ndarray] = []   # (S, k) per window
+        self.prcc: List[np.ndarray] = []
+        self._static_ranks: Dict[int, np.ndarray] = {}
+
+    def due(self, n_recorded: int) -> bool:
+        """True if the n-th recorded instant (1-based, over the whole run) is sampled."""
+        return n_recorded % self.stride == 0
+
+    def push(self, components: np.ndarray, y: np.ndarray, t: float) -> None:
+        """Add one recorded instant: components (S, k, N), fused target row y (S, N)."""
+        z = np.concatenate([components, y[:, None]], axis=1)
+        self.cov += _centred_moments(z)
+        ranks = np.empty(z.shape)
+        for j in range(z.shape[1]):
+            if j < len(_STATIC) and _STATIC[j]:
+                if j not in self._static_ranks:
+                    self._static_ranks[j] = _ranks(z[:, j])
+                ranks[:, j] = self._static_ranks[j]
+            else:
+                ranks[:, j] = _ranks(z[:, j])
+        self.rank_cov += _centred_moments(ranks)
+        self.n_acc += 1
+        if self.n_acc == self.window:
+            self.close_window(t)
+
+    def close_window(self, t: float) -> None:
+        if self.n_acc == 0:
+            return
+        self.times.append(t)
+        self.src.append(np.stack([src_from_moments(c) for c in self.cov]))
+        self.prcc.append(np.stack([prcc_from_moments(c) for c in self.rank_cov]))
+        self.cov[...] = 0.0
+        self.rank_cov[...] = 0.0
+        self.n_acc = 0
+
+    def result(self, s: int) -> AttributionResult:
+        k = len(COMPONENTS)
+        return AttributionResult(
+            times=np.array(self.times),
+            components=COMPONENTS,
+            src=np.array([v[s] for v in self.src]).reshape(-1, k),
+            prcc=np.array([v[s] for v in self.prcc]).reshape(-1, k),
+        )
+
+    # --- checkpoint -----------------------------------------------------------------------
+    def state_arrays(self) -> Dict[str, np.ndarray]:
+        k = len(COMPONENTS)
+        n_lanes = self.cov.shape[0]
+        return {
+            "attribution_cov": self.cov,
+            "attribution_rank_cov": self.rank_cov,
+            "attribution_times": np.array(self.times),
+            "attribution_src": np.array(self.src).reshape(-1, n_lanes, k),
+            "attribution_prcc": np.array(self.prcc).reshape(-1, n_lanes, k),
+        }
+
+    def restore(self, arrays: Any, n_acc: int) -> None:
+        self.cov[...] = arrays["attribution_cov"]
+        self.rank_cov[...] = arrays["attribution_rank_cov"]
+        self.times = list(arrays["attribution_times"])
+        self.src = list(arrays["attribution_src"])
+        self.prcc = list(arrays["attribution_prcc"])
+        self.n_acc = int(n_acc)
+
+
+__all__ = ["AttributionSpec", "AttributionResult", "OnlineAttribution", "COMPONENTS", "prcc_from_moments",
+           "src_from_moments"]
@@ -0,0 +1,127 @@
+"""Streaming Poisson bootstrap: confidence bands of RMSE(t) / quantile(t) metrics in one run.
+
+Every sample gets B Poisson(1) weights, drawn once at the start and fixed over the horizon
+(Poisson bootstrap: replicate b resamples sample i w_bi times). Because the samples are
+followed through time, a replicate is a resampled set of trajectories and the band of a metric
+at instant t is the percentile interval of its B replicate values at t:
+
+* RMSE: weighted mean of squares per replicate, one (B, N) @ (N,) product per recorded instant;
+* quantiles (``p95`` …): weighted inverse-CDF quantile per replicate. Only the tail beyond the
+  point quantile (plus a margin of several binomial standard deviations) is sorted; the weight
+  below the retained tail is the fixed replicate total minus the tail weights. Replicates whose
+  quantile falls outside the retained tail are resolved with a full sort.
+
+The bands are conditional on everything computed from the full sample set: with rule-based
+fusion the secure interval (and thus the clamp bounds of the fused error) is estimated from all
+samples and is not re-estimated per replicate, so its estimation variance is not part of the
+band (quantiles sitting on clamp bounds get narrow bands). Variance-weighted rows are covered.
+
+Band series are recorded like metrics as ``<metric>_ci_lo`` / ``<metric>_ci_hi`` (columns
+``<metric column>_ci_lo`` / ``_ci_hi``) and returned in `TimeSeriesResult.ci_bands`.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from .ts_metrics import TimeSeriesMetrics
+
+BAND_SUFFIXES = ("_ci_lo", "_ci_hi")
+
+
+@dataclass
+class BootstrapSpec:
+    """Poisson bootstrap of recorded RMSE / quantile metrics."""
+    replicates: int = 200
+    metrics: Sequence[str] = ("rmse", "p95")  # declared rmse* / p<q>* metrics
+    confidence: float = 0.95
+    seed: int | None = None                   # None: child stream of each lane generator (point estimates unchanged)
+
+
+def band_names(name: str) -> Tuple[str, str]:
+    """Recorded series names (lower, upper) of the band of metric `name`."""
+    return name + BAND_SUFFIXES[0], name + BAND_SUFFIXES[1]
+
+
+def weighted_quantile(values: np.ndarray, weights: np.ndarray, q: float, totals: np.ndarray | None = None,
+                      margin: float | None = None) -> np.ndarray:
+    """Inverse-CDF quantile q (0..1) of `values` (N,) under each weight row of `weights` (B, N) → (B,).
+
+    Only the tail on the side of q is sorted (ranks beyond q ∓ margin); rows whose quantile lies
+    outside the tail fall back to a full sort.
+    """
+    n = values.shape[0]
+    if totals is None:
+        totals = weights.sum(axis=1)
+    if margin is None:
+        margin = 5.0 * np.sqrt(max(q * (1.0 - q), 1.0 / n) / n) + 1.0 / n
+    target = q * totals
+    upper_tail = q >= 0.5
+    cut = int(np.floor(n * (q - margin))) if upper_tail else int(np.ceil(n * (q + margin)))
+    if 0 < cut < n:
+        part = np.argpartition(values, cut)
+        idx = part[cut:] if upper_tail else part[:cut]
+    else:
+        idx = np.arange(n)
+    order = idx[np.argsort(values[idx], kind="stable")]
+    cum = np.cumsum(weights[:, order], axis=1)
+    below = totals - cum[:, -1] if upper_tail else np.zeros_like(totals)  # weight of the samples below the tail
+    cum += below[:, None]
+    pos = np.sum(cum < target[:, None], axis=1)
+    out = values[order][np.minimum(pos, order.size - 1)]
+    outside = below >= target if upper_tail else pos >= order.size
+    if order.size < n and np.any(outside):
+        out[outside] = weighted_quantile(values, weights[outside], q, totals[outside], margin=1.0)
+    return out
+
+
+class PoissonBootstrap:
+    """Fixed Poisson(1) weights per lane and the band evaluation of the recorded instants."""
+
+    def __init__(self, spec: BootstrapSpec, plan: TimeSeriesMetrics, rngs: Sequence[np.random.Generator], n: int):
+        if spec.replicates < 2:
+            raise ValueError("bootstrap requires at least 2 replicates")
+        if not 0.0 < spec.confidence < 1.0:
+            raise ValueError("bootstrap confidence must lie in (0, 1)")
+        self.spec = spec
+        # Targets per fused row: (name, None) for RMSE, (name, q) for quantiles
+        self.targets: List[List[Tuple[str, float | None]]] = [[] for _ in range(3)]
+        for name in spec.metrics:
+            row = next((j for j in range(3) if plan.rmse[j] == name), None)
+            if row is not None:
+                self.targets[row].append((name, None))
+                continue
+            row, q = next(((j, q) for j in range(3) for q, qname in plan.quantiles[j] if qname == name), (None, None))
+            if row is None:
+                raise ValueError(f"bootstrap metric '{name}' is not a declared RMSE / quantile metric of this run")
+            self.targets[row].append((name, q / 100.0))
+        self.names = tuple(band for j in range(3) for name, _ in self.targets[j] for band in band_names(name))
+        if spec.seed is not None:
+            rngs = [np.random.default_rng(spec.seed + s) for s in range(len(rngs))]
+        else:
+            rngs = [rng.spawn(1)[0] for rng in rngs]
+        self.weights = np.stack([rng.poisson(1.0, size=(spec.replicates, n)).astype(float) for rng in rngs])
+        self.totals = self.weights.sum(axis=-1)  # (S, B), fixed over the horizon
+        alpha = 1.0 - spec.confidence
+        self.band_pct = [100.0 * alpha / 2.0, 100.0 * (1.0 - alpha / 2.0)]
+
+    def evaluate(self, rows: np.ndarray, row0: int = 0) -> Dict[str, np.ndarray]:
+        """Bands of the targets on fused rows row0 .. row0+R-1 (`rows` (S, R, N)) → {band name: (S,)}."""
+        out: Dict[str, np.ndarray] = {}
+        n_lanes = rows.shape[0]
+        for i in range(rows.shape[1]):
+            for name, q in self.targets[row0 + i]:
+                values = rows[:, i]
+                if q is None:
+                    reps = np.sqrt(np.matmul(self.weights, (values ** 2)[..., None])[..., 0] / self.totals)
+                else:
+                    reps = np.stack([weighted_quantile(values[s], self.weights[s], q, self.totals[s])
+                                     for s in range(n_lanes)])
+                lo, hi = np.percentile(reps, self.band_pct, axis=-1)
+                out[name + BAND_SUFFIXES[0]], out[name + BAND_SUFFIXES[1]] = lo, hi
+        return out
+
+
+__all__ = ["BootstrapSpec", "PoissonBootstrap", "band_names", "weighted_quantile"]
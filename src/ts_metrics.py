@@ -0,0 +1,168 @@
+"""Metric registry of the time-series engine: only the declared metrics are evaluated.
+
+The engine used to compute the full metric set at every recorded instant. Callers now declare
+the metrics they consume by name:
+
+* ``rmse``, ``rmse_lat``, ``rmse_2d`` – RMSE of the fused longitudinal / lateral / radial error;
+* ``p<q>`` with optional row suffix (``p95``, ``p99_lat``, ``p50_2d``) – fused-error quantiles;
+  the declared quantiles of a row share one partition (`metrics.multi_percentile`), rows without
+  a declared quantile are not partitioned;
+* ``share_oos`` (run threshold) and ``share_oos@<T>`` – share of |fused long| > T; any number of
+  thresholds is evaluated in one pass over the samples (`share_above`);
+* ``var_secure``, ``var_unsafe`` – longitudinal path variances;
+* ``si`` – secure interval growth (additive vs joint P99 at 1 s cadence);
+* names added with `register_metric` – custom (S, N) → (S,) reductions of one fused row.
+
+Lateral / radial metrics are dropped when the run has no lateral axis. `TimeSeriesMetrics`
+resolves the names once into a plan; the engine allocates and evaluates exactly these series.
+"""
+from __future__ import annotations
+
+import re
+from typing import Callable, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from .metrics import multi_percentile
+
+# Historical full set (time_series_metrics.csv + secure interval growth)
+DEFAULT_METRICS = ("rmse", "p95", "var_secure", "var_unsafe", "share_oos", "rmse_lat", "p95_lat", "rmse_2d", "p95_2d", "si")
+# Metrics with a dedicated TimeSeriesResult field → CSV / store column
+FIELD_COLUMNS = {
+    "rmse": "rmse_long", "p95": "p95_long", "var_secure": "var_secure_long", "var_unsafe": "var_unsafe_long",
+    "share_oos": "share_out_of_spec_long", "rmse_lat": "rmse_lat", "p95_lat": "p95_lat", "rmse_2d": "rmse_2d",
+    "p95_2d": "p95_2d",
+}
+ROWS = {"long": 0, "lat": 1, "2d": 2}
+_SUFFIX_ROW = {None: 0, "_lat": 1, "_2d": 2}
+_RMSE = re.compile(r"rmse(_lat|_2d)?")
+_QUANTILE = re.compile(r"p(\d+(?:\.\d+)?)(_lat|_2d)?")
+
+_CUSTOM: Dict[str, Tuple[int, Callable[[np.ndarray], np.ndarray]]] = {}
+
+
+def register_metric(name: str, fn: Callable[[np.ndarray], np.ndarray], row: str = "long") -> None:
+    """Register a custom metric: `fn(values)` reduces the fused `row` ('long' | 'lat' | '2d') of shape (S, N) to (S,)."""
+    if row not in ROWS:
+        raise ValueError(f"Unknown metric row '{row}' (expected one of {sorted(ROWS)})")
+    if name in FIELD_COLUMNS or name in ("si", "share_oos") or _RMSE.fullmatch(name) or _QUANTILE.fullmatch(name) \
+            or name.startswith("share_oos@"):
+        raise ValueError(f"Metric name '{name}' is reserved for a built-in metric")
+    _CUSTOM[name] = (ROWS[row], fn)
+
+
+def metric_column(name: str) -> str:
+    """CSV / store column of a metric (built-in fields keep their historical column names)."""
+    for suffix in ("_ci_lo", "_ci_hi"):  # bootstrap band of a metric (ts_bootstrap)
+        if name.endswith(suffix):
+            return metric_column(name[:-len(suffix)]) + suffix
+    if name in FIELD_COLUMNS:
+        return FIELD_COLUMNS[name]
+    if name.startswith("share_oos@"):
+        return "share_out_of_spec_long@" + name[len("share_oos@"):]
+    m = _QUANTILE.fullmatch(name)
+    if m and m.group(2) is None:
+        return name + "_long"
+    return name
+
+
+def share_above(values: np.ndarray, thresholds: Sequence[float]) -> np.ndarray:
+    """Shares mean(|values| > T) along the last axis for every threshold, (len(thresholds),) + reduced shape.
+
+    One threshold is a single comparison; several are resolved in one pass: every |value| is
+    binned against the sorted thresholds (`np.searchsorted`) and the share above threshold i is
+    the fraction of samples in bins > i.
+    """
+    a = np.abs(values)
+    if len(thresholds) == 1:
+        return np.mean(a > thresholds[0], axis=-1)[None]
+    order = np.argsort(thresholds)
+    t_sorted = np.asarray(thresholds, dtype=float)[order]
+    k = t_sorted.shape[0]
+    bins = np.searchsorted(t_sorted, a, side="left")  # number of thresholds strictly below |value|
+    lead = a.shape[:-1]
+    n_lead = int(np.prod(lead))
+    offsets = (np.arange(n_lead) * (k + 1)).reshape(lead + (1,))
+    counts = np.bincount((bins + offsets).ravel(), minlength=n_lead * (k + 1)).reshape(lead + (k + 1,))
+    above = np.cumsum(counts[..., ::-1], axis=-1)[..., ::-1][..., 1:]  # samples in bins > i ⇔ |value| > t_i
+    out = np.empty((k,) + lead)
+    out[order] = np.moveaxis(above / a.shape[-1], -1, 0)
+    return out
+
+
+class TimeSeriesMetrics:
+    """Resolved metric plan of one run: requested names → rows, quantiles, thresholds, variances."""
+
+    def __init__(self, metrics: Sequence[str] | None = None, threshold_oos: float = 0.2, with_lateral: bool = True):
+        if metrics is None:
+            metrics = DEFAULT_METRICS
+        n_axes_rows = 3 if with_lateral else 1
+        self.rmse: List[str | None] = [None] * 3
+        self.quantiles: List[List[Tuple[float, str]]] = [[] for _ in range(3)]
+        self.custom: List[List[Tuple[str, Callable]]] = [[] for _ in range(3)]
+        self.thresholds: List[Tuple[float, str]] = []
+        self.var_secure = self.var_unsafe = self.interval_growth = False
+        names = []
+        for name in dict.fromkeys(metrics):
+            row = 0
+            if name == "si":
+                self.interval_growth = True
+            elif name in ("var_secure", "var_unsafe"):
+                setattr(self, name, True)
+            elif name == "share_oos" or name.startswith("share_oos@"):
+                try:
+                    t = float(threshold_oos if name == "share_oos" else name[len("share_oos@"):])
+                except ValueError:
+                    raise ValueError(f"Invalid out-of-spec threshold in metric '{name}'") from None
+                self.thresholds.append((t, name))
+            elif _RMSE.fullmatch(name):
+                row = _SUFFIX_ROW[_RMSE.fullmatch(name).group(1)]
+                if row < n_axes_rows:
+                    self.rmse[row] = name
+            elif _QUANTILE.fullmatch(name):
+                m = _QUANTILE.fullmatch(name)
+                q, row = float(m.group(1)), _SUFFIX_ROW[m.group(2)]
+                if not 0.0 <= q <= 100.0:
+                    raise ValueError(f"Quantile metric '{name}' outside 0..100")
+                if row < n_axes_rows:
+                    self.quantiles[row].append((q, name))
+            elif name in _CUSTOM:
+                row, fn = _CUSTOM[name]
+                if row < n_axes_rows:
+                    self.custom[row].append((name, fn))
+            else:
+                raise ValueError(f"Unknown time-series metric '{name}'")
+            if row < n_axes_rows:
+                names.append(name)
+        self.names = tuple(names)
+        self.series = tuple(name for name in names if name != "si")  # one (S, records) array each
+        used = [j for j in range(3) if self.rmse[j] or self.quantiles[j] or self.custom[j]]
+        # Leading fused rows the reductions need (row 0 also for the out-of-spec shares)
+        self.n_rows = max(used + ([0] if self.thresholds else []), default=-1) + 1
+
+    @property
+    def extra(self) -> Tuple[str, ...]:
+        """Series without a dedicated TimeSeriesResult field (returned in `TimeSeriesResult.extra`)."""
+        return tuple(name for name in self.series if name not in FIELD_COLUMNS)
+
+    def evaluate(self, rows: np.ndarray, row0: int = 0) -> Dict[str, np.ndarray]:
+        """Requested reductions of fused rows row0 .. row0+R-1 (`rows` (S, R, N)) → {name: (S,)}."""
+        out: Dict[str, np.ndarray] = {}
+        for i, j in enumerate(range(row0, row0 + rows.shape[1])):
+            if self.rmse[j]:
+                out[self.rmse[j]] = np.sqrt(np.mean(rows[:, i] ** 2, axis=-1))
+            if self.quantiles[j]:
+                qs = sorted({q for q, _ in self.quantiles[j]})
+                q_row = multi_percentile(rows[:, i], qs)  # one partition for the declared quantiles of this row
+                for q, name in self.quantiles[j]:
+                    out[name] = q_row[qs.index(q)]
+            for name, fn in self.custom[j]:
+                out[name] = np.asarray(fn(rows[:, i]), dtype=float)
+        if row0 == 0 and self.thresholds:
+            shares = share_above(rows[:, 0], [t for t, _ in self.thresholds])
+            for (_, name), share in zip(self.thresholds, shares):
+                out[name] = share
+        return out
+
+
+__all__ = ["DEFAULT_METRICS", "TimeSeriesMetrics", "metric_column", "register_metric", "share_above"]
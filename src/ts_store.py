@@ -0,0 +1,114 @@
+"""Streaming on-disk store for time-series metrics (chunked `.npy` memmap columns).
+
+Long horizons (days at dt 0.1 s) do not fit `TimeSeriesResult` arrays in memory. The
+engine keeps only a chunk of recorded rows and appends each full chunk here:
+
+* one preallocated `.npy` file per column (`np.lib.format.open_memmap`, NaN until written),
+  two tables: `metrics` (one row per recorded instant) and `si` (secure interval growth);
+* `progress.json` – rows written per table, simulated time, wall-clock stamp – replaced
+  atomically after every chunk, so partial results can be inspected mid-run
+  (`load_time_series_store` returns the written prefix as read-only memmaps).
+"""
+from __future__ import annotations
+
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, Mapping, Sequence
+
+import numpy as np
+
+STORE_FORMAT_VERSION = 1
+
+# Column names follow time_series_metrics.csv (`time_series_columns`); the metric columns come from the
+# declared metric plan (`ts_metrics.metric_column`), mode and interval growth columns are fixed
+MODE_COLUMNS = ("mode_midpoint", "mode_unsafe", "mode_unsafe_clamped", "switch_rate")
+SI_COLUMNS = ("si_t_s", "si_additive_p99", "si_joint_p99")
+
+
+class TimeSeriesStore:
+    """Column store of one scenario lane (tables `metrics` and `si` with fixed row counts)."""
+
+    def __init__(self, directory: str | Path, n_rows: Mapping[str, int], columns: Mapping[str, Sequence[str]],
+                 resume: bool = False):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.n_rows = dict(n_rows)
+        self.columns = {table: tuple(cols) for table, cols in columns.items()}
+        progress = self.directory / "progress.json"
+        reuse = resume and progress.exists()
+        if reuse:
+            meta = json.loads(progress.read_text())
+            if meta["n_rows"] != self.n_rows or {t: tuple(c) for t, c in meta["columns"].items()} != self.columns:
+                raise ValueError(f"Store {self.directory} has a different layout; cannot resume into it")
+            self.n_written = dict(meta["n_written"])
+        else:
+            self.n_written = {table: 0 for table in self.columns}
+        self._cols: Dict[str, np.memmap] = {}
+        for table, cols in self.columns.items():
+            for name in cols:
+                path = self.directory / f"{name}.npy"
+                if reuse:
+                    self._cols[name] = np.load(path, mmap_mode="r+")
+                else:
+                    self._cols[name] = np.lib.format.open_memmap(path, mode="w+", dtype=np.float64, shape=(self.n_rows[table],))
+                    self._cols[name][:] = np.nan
+        self.t_s = 0.0
+        self._t0 = time.time()
+        self._write_progress()
+
+    def append(self, table: str, start: int, values: Mapping[str, np.ndarray]) -> None:
+        """Write rows [start, start + len) of `table`; every column of the table must be given."""
+        n = None
+        for name in self.columns[table]:
+            arr = np.asarray(values[name], dtype=np.float64)
+            n = arr.shape[0]
+            self._cols[name][start:start + n] = arr
+        if n:
+            self.n_written[table] = max(self.n_written[table], start + n)
+
+    def commit(self, t_s: float) -> None:
+        """Flush written chunks to disk and publish progress (simulated time `t_s`)."""
+        for col in self._cols.values():
+            col.flush()
+        self.t_s = float(t_s)
+        self._write_progress()
+
+    def column(self, name: str) -> np.ndarray:
+        """Written prefix of a column (read-only view on the memmap)."""
+        table = next(t for t, cols in self.columns.items() if name in cols)
+        view = self._cols[name][:self.n_written[table]]
+        view.flags.writeable = False
+        return view
+
+    def _write_progress(self) -> None:
+        n_metrics = self.n_rows.get("metrics", 0)
+        meta = {
+            "format_version": STORE_FORMAT_VERSION,
+            "n_rows": self.n_rows,
+            "n_written": self.n_written,
+            "columns": {t: list(c) for t, c in self.columns.items()},
+            "t_s": self.t_s,
+            "fraction_done": self.n_written.get("metrics", 0) / n_metrics if n_metrics else 1.0,
+            "wall_time_s": time.time() - self._t0,
+        }
+        tmp = self.directory / "progress.json.tmp"
+        tmp.write_text(json.dumps(meta, indent=2))
+        os.replace(tmp, self.directory / "progress.json")
+
+
+def load_time_series_store(directory: str | Path) -> Dict[str, np.ndarray]:
+    """Written prefix of every column of a (possibly still running) store, as read-only memmaps."""
+    directory = Path(directory)
+    meta = json.loads((directory / "progress.json").read_text())
+    if meta.get("format_version") != STORE_FORMAT_VERSION:
+        raise ValueError(f"Unsupported store format version {meta.get('format_version')} in {directory}")
+    out: Dict[str, np.ndarray] = {}
+    for table, cols in meta["columns"].items():
+        for name in cols:
+            out[name] = np.load(directory / f"{name}.npy", mmap_mode="r")[:meta["n_written"][table]]
+    return out
+
+
+__all__ = ["TimeSeriesStore", "load_time_series_store", "STORE_FORMAT_VERSION"]
@@ -1,6 +1,36 @@
+from __future__ import annotations
+
+import copy
 import sys
 from pathlib import Path
 
+import numpy as np
+
 ROOT = Path(__file__).resolve().parent.parent
 if str(ROOT) not in sys.path:
-    sys.path.insert(0, str(ROOT))
\ No newline at end of file
+    sys.path.insert(0, str(ROOT))
+
+from src.config import Config, load_config  # noqa: E402  (after the path setup)
+
+# Time-series result series compared bit for bit between equivalent runs
+SERIES_FIELDS = ("times", "rmse", "p95", "rmse_lat", "p95_lat", "rmse_2d", "p95_2d", "var_secure", "var_unsafe",
+                 "share_oos", "si_times", "si_additive_p99", "si_joint_p99", "switch_rate")
+
+
+def model_cfg(n: int, horizon: float, path: str = "config/model.yml", metrics_cadence_s: float | None = None,
+              **fusion) -> Config:
+    """Small copy of a config: N samples over `horizon` seconds, fusion options overridden by keyword."""
+    raw = copy.deepcopy(load_config(path).raw)
+    raw["sim"]["N_samples"] = n
+    raw["sim"]["time_horizon_s"] = horizon
+    if metrics_cadence_s is not None:
+        raw["sim"]["metrics_cadence_s"] = metrics_cadence_s
+    raw["sensors"]["fusion"].update(fusion)
+    return Config(raw=raw)
+
+
+def assert_same_series(ref, res, skip=()) -> None:
+    """Result series of two runs are identical (fields in `skip` excluded)."""
+    for field in SERIES_FIELDS:
+        if field not in skip:
+            assert np.array_equal(getattr(ref, field), getattr(res, field)), field
@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+
+from src.time_sim import _EventDrivenEngine, _TimeSeriesEngine
+from conftest import assert_same_series, model_cfg
+
+
+@pytest.mark.parametrize("engine_cls", [_TimeSeriesEngine, _EventDrivenEngine])
+def test_resume_reproduces_uninterrupted_run(tmp_path, engine_cls):
+    """Interrupt after a checkpoint, resume in a fresh engine (different RNG seed) → bit-identical results."""
+    cfg = model_cfg(400, 6.0, metrics_cadence_s=0.5, lateral_rule_based=True)
+    full = engine_cls([cfg], [np.random.default_rng(8)], export_interval_bounds=True)
+    full.run()
+    ref = full.results()[0]
+
+    path = tmp_path / "ckpt.npz"
+    first = engine_cls([cfg], [np.random.default_rng(8)], export_interval_bounds=True)
+    while first.k < first.n_steps // 2:
+        first.step()
+    first.save_checkpoint(path)
+
+    resumed = engine_cls([cfg], [np.random.default_rng(999)], export_interval_bounds=True)
+    resumed.load_checkpoint(path)
+    resumed.run()
+    res = resumed.results()[0]
+    assert_same_series(ref, res)
+    assert np.array_equal(ref.mode_share["unsafe"], res.mode_share["unsafe"])
+    assert np.array_equal(ref.interval_upper, res.interval_upper)
+
+
+def test_checkpoint_rejects_other_configuration(tmp_path):
+    path = tmp_path / "ckpt.npz"
+    engine = _TimeSeriesEngine([model_cfg(400, 6.0, metrics_cadence_s=0.5)], [np.random.default_rng(0)])
+    engine.step()
+    engine.save_checkpoint(path)
+    other = _TimeSeriesEngine([model_cfg(400, 6.0, metrics_cadence_s=0.5, rule_based=False)], [np.random.default_rng(0)])
+    with pytest.raises(ValueError):
+        other.load_checkpoint(path)
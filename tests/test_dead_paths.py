@@ -0,0 +1,48 @@
+import copy
+
+import numpy as np
+
+from src.config import load_config, Config
+from src.dead_paths import analyze_config, inactive_parameters
+from src.sensitivity import default_oat_params
+from src.sim_sensors import simulate_gnss_bias_noise_2d, simulate_map_error
+from src.time_sim import simulate_time_series
+
+
+def test_analysis_detects_dead_components():
+    no_gnss = analyze_config(load_config("config/scenario_no_gnss.yml"))
+    assert set(no_gnss.dead_gnss_modes) == {"open", "urban", "tunnel"} and no_gnss.unsafe_path_dead
+    assert no_gnss.is_dead("sensors.gnss.modes.open.noise.std")
+    assert not no_gnss.is_dead("sensors.gnss.modes.open.outage_prob")
+    assert analyze_config(load_config("config/model.yml")).dead_gnss_modes == ("tunnel",)
+
+    raw = copy.deepcopy(load_config("config/model.yml").raw)
+    raw["sensors"]["balise"]["multipath_tail_m"]["weight"] = 0.0
+    raw["sensors"]["balise"]["early_detection"]["enabled"] = False
+    cfg = Config(raw=raw)
+    report = analyze_config(cfg)
+    assert report.zero_weight_tails == ("sensors.balise.multipath_tail_m",) and report.early_detection_dead
+    assert {row["component"] for row in report.rows()} >= {"sensors.balise.multipath_tail_m", "sensors.balise.early_detection"}
+    dead_params = {"sensors.balise.multipath_tail_m.cap", "sensors.balise.early_detection.d_const_m"}
+    assert set(inactive_parameters(cfg, default_oat_params(load_config("config/model.yml")))) == dead_params
+    assert not dead_params & set(default_oat_params(cfg))
+
+
+def test_dead_paths_skip_draws():
+    cfg = load_config("config/scenario_no_gnss.yml")
+    rng = np.random.default_rng(1)
+    state = copy.deepcopy(rng.bit_generator.state)
+    long, lat = simulate_gnss_bias_noise_2d(cfg, 100, rng, mode="open")
+    assert not long.any() and not lat.any() and rng.bit_generator.state == state
+
+    raw = copy.deepcopy(cfg.raw)
+    raw["sensors"]["map"]["longitudinal"]["interpolation"]["weight"] = 0.0
+    ref = np.random.default_rng(2).normal(0.0, raw["sensors"]["map"]["longitudinal"]["ref_error"]["std"], size=50)
+    assert np.array_equal(simulate_map_error(Config(raw=raw), 50, np.random.default_rng(2)), ref)
+
+    raw["sim"]["N_samples"] = 400
+    raw["sim"]["time_horizon_s"] = 10.0
+    res = simulate_time_series(Config(raw=raw), np.random.default_rng(3))
+    # Permanent outage: rule fallback everywhere, held initial fix never refreshed
+    assert np.all(res.mode_share["midpoint"] == 1.0)
+    assert np.all(res.var_unsafe == res.var_unsafe[0])
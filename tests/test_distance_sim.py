@@ -0,0 +1,26 @@
+import numpy as np
+
+from src.distance_sim import compare_distance_engine, simulate_time_series_distance
+from conftest import model_cfg
+
+
+def test_distance_engine_matches_time_loop_statistically():
+    cfg = model_cfg(2000, 120.0)
+    rep = compare_distance_engine(cfg, 11, metrics_cadence_s=1.0)
+    for field in ("rmse", "p95", "rmse_2d", "var_secure", "var_unsafe"):
+        assert abs(rep["metrics"][field]["rel_diff"]) < 0.05, (field, rep["metrics"][field])
+    assert rep["iterations_time"] == 1200
+
+
+def test_distance_steps_stop_at_last_output_instant():
+    """Each sample walks only up to the last output instant; windows do not change the step count."""
+    cfg = model_cfg(300, 20.0)
+    res = simulate_time_series_distance(cfg, np.random.default_rng(5), ds_m=2.0, metrics_cadence_s=1.0)
+    res_win = simulate_time_series_distance(cfg, np.random.default_rng(5), ds_m=2.0, metrics_cadence_s=1.0,
+                                            window_values=300 * 3)
+    speeds = np.random.default_rng(5).uniform(0.0, 16.7, size=300)
+    max_steps = int(np.floor(speeds.max() * 20.0 / 2.0))
+    assert res.times.shape == (20,) and np.isclose(res.times[-1], 20.0)
+    assert res.n_iterations == max_steps + 20
+    assert res_win.n_iterations >= res.n_iterations  # windows split the walk, never skip steps
+    assert np.all(np.isfinite(res.rmse)) and np.all(res.var_secure > 0)
@@ -0,0 +1,29 @@
+import numpy as np
+import pytest
+
+from src.time_sim import _EventDrivenEngine, simulate_time_series, simulate_time_series_event_driven
+from src.trace_recorder import TraceSpec
+from conftest import model_cfg
+
+
+def test_event_driven_matches_fixed_step_statistics():
+    """Jumps + warm-up windows reproduce the fixed-step metrics in distribution with far fewer iterations."""
+    cfg = model_cfg(4000, 60.0, lateral_rule_based=True)
+    fixed = simulate_time_series(cfg, np.random.default_rng(1), metrics_cadence_s=5.0)
+    event = simulate_time_series_event_driven(cfg, np.random.default_rng(2), metrics_cadence_s=5.0)
+    assert np.allclose(event.times, fixed.times)
+    assert event.n_iterations * 5 < fixed.n_iterations
+    for field in ("rmse", "p95", "p95_2d", "var_secure", "si_joint_p99"):
+        a, b = np.mean(getattr(fixed, field)), np.mean(getattr(event, field))
+        assert abs(b / a - 1) < 0.05, field
+    # Shares: absolute tolerance (binomial noise of ~0.005 per output at N=4000)
+    assert abs(np.mean(event.share_oos) - np.mean(fixed.share_oos)) < 0.02
+    assert abs(np.mean(event.mode_share["unsafe"]) - np.mean(fixed.mode_share["unsafe"])) < 0.02
+    # Residence times are undefined across jumps
+    assert fixed.mode_residence is not None and event.mode_residence is None
+
+
+def test_event_driven_rejects_traces(tmp_path):
+    """Traces record every step; jumped stretches would stay empty."""
+    with pytest.raises(ValueError, match="every step"):
+        _EventDrivenEngine([model_cfg(4000, 60.0, lateral_rule_based=True)], [np.random.default_rng(0)], traces=[TraceSpec(tmp_path, n_samples=5)])
@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+import src.fusion_numba as fusion_numba
+from src.fusion import RuleFusionState, rule_based_fusion_step, resolve_backend
+
+
+def _state(shape):
+    return RuleFusionState(fused=np.zeros(shape), mode=np.zeros(shape, dtype=int), blend_left=np.zeros(shape, dtype=int))
+
+
+def _run(backend, shape, blend_steps, outage_fallback, seed=4):
+    rng = np.random.default_rng(seed)
+    secure = rng.normal(0.0, 0.05, size=shape)
+    lower = -rng.uniform(0.1, 0.3, size=shape)
+    upper = rng.uniform(0.1, 0.3, size=shape)
+    state = _state(shape)
+    out = []
+    for _ in range(15):
+        unsafe = rng.normal(0.0, 0.25, size=shape)
+        outage = rng.random(shape) < 0.25
+        fused, state, meta = rule_based_fusion_step(secure, unsafe, lower, upper, outage, state, blend_steps=blend_steps,
+                                                    outage_fallback=outage_fallback, backend=backend)
+        out.append((fused.copy(), state.mode.copy(), state.blend_left.copy(), meta))
+    return out, state
+
+
+@pytest.mark.parametrize("shape,blend_steps,fallback", [
+    ((500,), 5, "midpoint"),
+    ((500,), 1, "secure"),
+    ((2, 3, 200), 4, np.array([["secure", "midpoint", "midpoint"], ["midpoint", "secure", "midpoint"]])),
+])
+def test_numba_kernel_bit_identical(shape, blend_steps, fallback):
+    pytest.importorskip("numba")
+    ref, ref_state = _run("numpy", shape, blend_steps, fallback)
+    fast, fast_state = _run("numba", shape, blend_steps, fallback)
+    for (f_r, m_r, b_r, meta_r), (f_n, m_n, b_n, meta_n) in zip(ref, fast):
+        assert np.array_equal(f_r, f_n)
+        assert np.array_equal(m_r, m_n) and np.array_equal(b_r, b_n)
+        for key in meta_r:
+            assert np.array_equal(meta_r[key], meta_n[key])
+    if blend_steps > 1:
+        assert np.array_equal(ref_state.blend_start, fast_state.blend_start)
+
+
+def test_numba_backend_falls_back_without_numba(monkeypatch):
+    monkeypatch.setattr(fusion_numba, "NUMBA_AVAILABLE", False)
+    assert resolve_backend("numba") == "numpy"
+    assert resolve_backend("auto") == "numpy"
+    ref, _ = _run("numpy", (300,), 5, "midpoint")
+    fallback, _ = _run("numba", (300,), 5, "midpoint")
+    assert all(np.array_equal(a[0], b[0]) for a, b in zip(ref, fallback))
+    with pytest.raises(ValueError):
+        resolve_backend("cuda")
@@ -0,0 +1,19 @@
+import numpy as np
+
+from src.time_sim import simulate_time_series, simulate_time_series_gnss_modes
+from conftest import assert_same_series, model_cfg
+
+
+def test_gnss_modes_share_secure_path():
+    cfg = model_cfg(1500, 60.0)
+    ref = simulate_time_series(cfg, np.random.default_rng(4))
+    res = simulate_time_series_gnss_modes(cfg, np.random.default_rng(4))
+    assert list(res) == list(cfg.sensors["gnss"]["modes"])
+    # First mode (open) equals the single-mode run; all modes see the same secure path
+    assert_same_series(ref, res["open"])
+    for name in ("urban", "tunnel"):
+        assert np.array_equal(res[name].var_secure, res["open"].var_secure)
+        assert np.array_equal(res[name].si_joint_p99, res["open"].si_joint_p99)
+    # Urban: larger unsafe spread (multipath tail); tunnel: permanent outage → rule fallback everywhere
+    assert res["urban"].var_unsafe.mean() > res["open"].var_unsafe.mean()
+    assert np.all(res["tunnel"].mode_share["midpoint"] == 1.0)
@@ -0,0 +1,70 @@
+import copy
+import numpy as np
+import pytest
+
+from src.config import load_config, get_seed, Config
+from src.interval_table import (
+    IntervalLookupTable,
+    build_interval_table,
+    save_interval_table,
+    load_interval_table,
+)
+from src.time_sim import simulate_time_series
+
+
+def test_bilinear_lookup_exact_on_linear_grid_and_clamped():
+    v = np.array([0.0, 10.0, 20.0])
+    d = np.array([0.0, 200.0, 400.0])
+    vv, dd = np.meshgrid(v, d, indexing="ij")
+    upper = 0.1 + 0.002 * vv + 0.0001 * dd  # bilinear interpolation reproduces linear fields exactly
+    table = IntervalLookupTable(v, d, -upper, upper)
+    lo, up = table.lookup(np.array([5.0, 25.0]), np.array([100.0, -3.0]))
+    assert np.allclose(up, [0.1 + 0.01 + 0.01, 0.1 + 0.04 + 0.0])
+    assert np.allclose(lo, -up)
+
+
+def test_table_roundtrip_version_and_time_series(tmp_path):
+    cfg = load_config("config/model.yml")
+    table = build_interval_table(cfg, np.random.default_rng(1), n_per_node=500, horizon_s=60.0, sample_every_s=1.0)
+    assert np.all(table.upper > table.lower)
+    # With speed coupling the balise latency term scales with speed → anchored fast rows lie above v = 0 (no anchor)
+    raw_coupled = copy.deepcopy(cfg.raw)
+    raw_coupled["sensors"]["balise"]["speed_coupling"] = True
+    t_coupled = build_interval_table(Config(raw=raw_coupled), np.random.default_rng(1), n_per_node=500, horizon_s=60.0,
+                                     sample_every_s=1.0)
+    assert t_coupled.upper[-1, 0] > t_coupled.upper[0, 0] + 0.05
+    # Strong drift: bounds must widen along the distance axis (v = 0 never leaves d = 0)
+    raw_drift = copy.deepcopy(cfg.raw)
+    raw_drift["sensors"]["odometry"]["drift_per_km_m"] = 1.0
+    t_drift = build_interval_table(Config(raw=raw_drift), np.random.default_rng(1), n_per_node=500, horizon_s=60.0,
+                                   sample_every_s=1.0)
+    width = t_drift.upper - t_drift.lower
+    assert np.all(width[1:, -1] > width[1:, 0])
+    path = save_interval_table(table, tmp_path / "table.npz")
+    loaded = load_interval_table(path)
+    assert np.array_equal(loaded.upper, table.upper) and loaded.meta["n_per_node"] == 500
+
+    # Version guard
+    with np.load(path) as z:
+        data = dict(z)
+    data["format_version"] = np.array(999)
+    np.savez(tmp_path / "bad.npz", **data)
+    with pytest.raises(ValueError):
+        load_interval_table(tmp_path / "bad.npz")
+
+    raw = copy.deepcopy(cfg.raw)
+    raw["sim"].update(N_samples=500, time_horizon_s=5.0, dt_s=0.5)
+    raw["sensors"]["fusion"]["interval"].update(method="table", table_path=str(path))
+    res = simulate_time_series(Config(raw=raw), np.random.default_rng(get_seed(cfg)), export_interval_bounds=True)
+    assert res.interval_upper.min() >= table.upper.min() - 1e-12
+    assert res.interval_upper.max() <= table.upper.max() + 1e-12
+
+    # Tables must match the config's quantile levels and secure path model
+    raw_q = copy.deepcopy(raw)
+    raw_q["sensors"]["fusion"]["interval"]["quantile_high_pct"] = 95.0
+    with pytest.raises(ValueError, match="P1/P99"):
+        simulate_time_series(Config(raw=raw_q), np.random.default_rng(0))
+    raw_drift["sim"].update(N_samples=500, time_horizon_s=5.0, dt_s=0.5)
+    raw_drift["sensors"]["fusion"]["interval"].update(method="table", table_path=str(path))
+    with pytest.raises(ValueError, match="secure path model"):
+        simulate_time_series(Config(raw=raw_drift), np.random.default_rng(0))
@@ -0,0 +1,13 @@
+import numpy as np
+
+from src.time_sim import simulate_time_series
+from conftest import assert_same_series, model_cfg
+
+
+def test_threaded_metrics_bit_identical(tmp_path):
+    cfg = model_cfg(500, 30.0, lateral_rule_based=True)
+    ref = simulate_time_series(cfg, np.random.default_rng(9))
+    res = simulate_time_series(cfg, np.random.default_rng(9), metric_threads=3)
+    streamed = simulate_time_series(cfg, np.random.default_rng(9), metric_threads=2, stream_dir=tmp_path / "store")
+    assert_same_series(ref, res)
+    assert_same_series(ref, streamed)
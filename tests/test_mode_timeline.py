@@ -0,0 +1,54 @@
+import numpy as np
+
+from src.fusion import MODE_NAMES
+from src.mode_timeline import ModeTimeline
+from src.time_sim import _TimeSeriesEngine
+from conftest import model_cfg
+
+
+def _runs(matrix):
+    """Brute-force runs (mode, length, open at end) from a full (steps, rows) mode matrix."""
+    out = []
+    for col in matrix.T:
+        start = 0
+        for k in range(1, len(col) + 1):
+            if k == len(col) or col[k] != col[start]:
+                out.append((int(col[start]), k - start, k == len(col)))
+                start = k
+    return out
+
+
+def test_timeline_residence_matches_dense_matrix():
+    rng = np.random.default_rng(0)
+    # Sticky random modes: switch with probability 0.1 per step
+    matrix = np.empty((200, 30), dtype=int)
+    matrix[0] = rng.integers(0, 3, 30)
+    for k in range(1, 200):
+        flip = rng.random(30) < 0.1
+        matrix[k] = np.where(flip, rng.integers(0, 3, 30), matrix[k - 1])
+    timeline = ModeTimeline(matrix[0], start_step=0, capacity=4)
+    for k in range(1, 200):
+        timeline.record(k, matrix[k])
+    assert timeline.n_events == int(np.sum(matrix[1:] != matrix[:-1]))
+    res = timeline.residence(200)
+    runs = _runs(matrix)
+    for code, name in MODE_NAMES.items():
+        assert sorted(res.completed[name]) == sorted(n for m, n, end in runs if m == code and not end)
+        assert sorted(res.censored[name]) == sorted(n for m, n, end in runs if m == code and end)
+    # Row subset (one lane of a batched timeline)
+    sub = timeline.residence(200, range(10, 20))
+    sub_runs = _runs(matrix[:, 10:20])
+    assert sorted(sub.completed["unsafe"]) == sorted(n for m, n, end in sub_runs if m == 1 and not end)
+
+
+def test_engine_residence_covers_horizon():
+    engine = _TimeSeriesEngine([model_cfg(200, 5.0, rule_based=True)], [np.random.default_rng(1)])
+    modes = []
+    while engine.k < engine.n_steps:
+        engine.step()
+        modes.append(engine.state.mode[0, 0].copy())
+    res = engine.results()[0].mode_residence
+    runs = _runs(np.array(modes))
+    assert sorted(np.round(res.completed["unsafe"] / engine.dt).astype(int)) == sorted(n for m, n, end in runs if m == 1 and not end)
+    total = sum(v.sum() for part in (res.completed, res.censored) for v in part.values())
+    assert np.isclose(total, engine.n * engine.n_steps * engine.dt)
@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from src.fusion import RuleFusionState, rule_based_fusion_step, MODE_UNSAFE_CLAMPED
+from src.multirate_sim import compare_multirate_engine, simulate_time_series_multirate
+from conftest import model_cfg
+
+
+def test_multirate_variance_weighted_matches_fixed_step():
+    """Variance-weighted rows have no fusion state: coarse steps of quiet samples are exact in distribution."""
+    rep = compare_multirate_engine(model_cfg(3000, 60.0, rule_based=False), 7, coarse_dt_s=1.0)
+    for field in ("rmse", "p95", "rmse_2d", "var_secure", "var_unsafe"):
+        assert abs(rep["metrics"][field]["rel_diff"]) < 0.03, (field, rep["metrics"][field])
+    assert abs(rep["metrics"]["share_oos"]["multirate"] - rep["metrics"]["share_oos"]["fixed"]) < 0.01
+    assert 0.0 < rep["refined_share"] < 0.5
+
+
+def test_multirate_rule_based_documented_bias():
+    """Rule-based rows miss blends between coarse instants: small positive fused-error bias, no switch rate."""
+    cfg = model_cfg(3000, 60.0)
+    rep = compare_multirate_engine(cfg, 7, coarse_dt_s=1.0)
+    for field in ("rmse", "p95", "rmse_2d"):
+        assert -0.01 < rep["metrics"][field]["rel_diff"] < 0.05, (field, rep["metrics"][field])
+    assert abs(rep["metrics"]["mode_unsafe"]["multirate"] - rep["metrics"]["mode_unsafe"]["fixed"]) < 0.01
+    assert "switch_rate" not in rep["metrics"]
+    res = simulate_time_series_multirate(model_cfg(300, 5.0), np.random.default_rng(1))
+    assert res.switch_rate is None and res.mode_share is not None
+
+
+def test_multirate_outputs_at_coarse_instants():
+    cfg = model_cfg(500, 10.0)
+    res = simulate_time_series_multirate(cfg, np.random.default_rng(1), coarse_dt_s=0.5, metrics_cadence_s=1.0)
+    assert res.times.shape == (10,) and np.isclose(res.times[-1], 10.0)
+    assert np.all(np.isfinite(res.rmse)) and np.all(res.var_secure > 0)
+    with pytest.raises(ValueError):
+        simulate_time_series_multirate(cfg, np.random.default_rng(1), coarse_dt_s=1.0, metrics_cadence_s=0.5)
+
+
+def test_blend_counts_elapsed_base_steps():
+    """elapsed_steps=1 is the per-step kernel; a running blend advances by the elapsed steps (wall-clock time)."""
+    rng = np.random.default_rng(0)
+    n, blend_steps = 50, 5
+    secure, unsafe = rng.normal(0, 0.1, n), rng.normal(0, 0.1, n)
+    lower, upper = np.full(n, -1.0), np.full(n, 1.0)
+    outage = np.zeros(n, dtype=bool)
+
+    def state():
+        return RuleFusionState(fused=np.full(n, 0.5), mode=np.full(n, MODE_UNSAFE_CLAMPED),
+                               blend_left=np.zeros(n, dtype=int))
+
+    ref, st_ref, _ = rule_based_fusion_step(secure, unsafe, lower, upper, outage, state(), blend_steps=blend_steps)
+    one, st_one, _ = rule_based_fusion_step(secure, unsafe, lower, upper, outage, state(), blend_steps=blend_steps,
+                                            elapsed_steps=1)
+    assert np.array_equal(ref, one) and np.array_equal(st_ref.blend_left, st_one.blend_left)
+    assert np.all(st_one.blend_left == blend_steps - 1)  # blend started in this call: one step
+    # Running blends: 4 base steps in one call end the blend at the target
+    fused, st, _ = rule_based_fusion_step(secure, unsafe, lower, upper, outage, st_one, blend_steps=blend_steps,
+                                          elapsed_steps=blend_steps - 1)
+    assert np.all(st.blend_left == 0)
+    assert np.allclose(fused, unsafe)
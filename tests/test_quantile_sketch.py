@@ -0,0 +1,68 @@
+import copy
+import numpy as np
+
+from src.config import load_config, get_seed, Config
+from src.fusion import compute_secure_interval_bounds
+from src.quantile_sketch import SignedLogSketch, SpeedBinnedSketch
+from src.time_sim import simulate_time_series
+
+
+def test_sketch_quantile_within_relative_error_bound():
+    """Sketch quantiles must lie within alpha*|q| (+min_value) of the exact order statistic."""
+    rng = np.random.default_rng(5)
+    values = np.concatenate([rng.normal(0.02, 0.05, 8000), rng.exponential(0.1, 2000)])
+    sk = SignedLogSketch(relative_accuracy=0.005)
+    sk.add(values)
+    for q in (1.0, 5.0, 50.0, 95.0, 99.0):
+        exact = float(np.percentile(values, q, method="lower"))
+        est = sk.quantile(q)
+        assert abs(est - exact) <= sk.error_bound(exact) + 1e-12, f"q={q}: {est} vs {exact}"
+    exact_abs = float(np.percentile(np.abs(values), 99, method="lower"))
+    assert abs(sk.abs_quantile(99) - exact_abs) <= sk.error_bound(exact_abs) + 1e-12
+
+
+def test_incremental_update_and_merge_match_fresh_build():
+    """Moving changed samples must give the same counts as a rebuild; merge = union."""
+    rng = np.random.default_rng(11)
+    speeds = rng.uniform(0, 16.7, 3000)
+    secure = rng.normal(0, 0.05, 3000)
+    inc = SpeedBinnedSketch(speeds)
+    inc.update(secure)
+    secure = secure + rng.normal(0, 1e-4, 3000)
+    changed = inc.update(secure)
+    assert 0 < changed < secure.size, "Small drift increments should move only part of the samples"
+    fresh = SpeedBinnedSketch(speeds)
+    fresh.update(secure)
+    assert np.array_equal(inc.sketch.counts, fresh.sketch.counts)
+    # Clipped samples are counted once, not on every update
+    far = secure.copy()
+    far[:7] = 5e3
+    inc.update(far)
+    inc.update(far + 1e-4)
+    assert inc.sketch.n_clipped == 7
+    inc.update(secure)
+    assert inc.sketch.n_clipped == 0
+    a = SignedLogSketch(); b = SignedLogSketch(); whole = SignedLogSketch()
+    a.add(secure[:1000]); b.add(secure[1000:]); whole.add(secure)
+    assert np.array_equal(a.merge(b).counts, whole.counts)
+
+
+def test_sketch_bounds_close_to_exact_and_time_series_runs():
+    rng = np.random.default_rng(3)
+    n = 5000
+    speeds = rng.uniform(0, 16.7, n)
+    secure = rng.normal(0.01, 0.04, n)
+    lo_e, up_e, _ = compute_secure_interval_bounds(secure, speeds)
+    sk = SpeedBinnedSketch(speeds)
+    sk.update(secure)
+    lo_s, up_s, meta = sk.interval_bounds()
+    assert meta["rel_error_bound"] == 0.005
+    # Within sketch bound plus one inter-order-statistic gap (exact path interpolates linearly)
+    assert np.max(np.abs(up_s - up_e)) < 0.01 and np.max(np.abs(lo_s - lo_e)) < 0.01
+
+    base = load_config("config/model.yml")
+    raw = copy.deepcopy(base.raw)
+    raw["sim"].update(N_samples=800, time_horizon_s=5.0, dt_s=0.5)
+    raw["sensors"]["fusion"]["interval"]["method"] = "sketch"
+    res = simulate_time_series(Config(raw=raw), np.random.default_rng(get_seed(base)), export_interval_bounds=True)
+    assert res.interval_upper is not None and np.all(res.interval_upper >= res.interval_lower)
@@ -0,0 +1,43 @@
+import sys
+
+import pandas as pd
+import pytest
+import yaml
+
+import run_sim
+from conftest import model_cfg
+
+
+def _run(tmp_path, monkeypatch, *flags, plots=False, config="config/model.yml", time_series=True):
+    cfg_path = tmp_path / "small.yml"
+    cfg_path.write_text(yaml.safe_dump(model_cfg(300, 5.0, path=config).raw))
+    out = tmp_path / "out"
+    monkeypatch.setattr(sys, "argv", ["run_sim.py", "--config", str(cfg_path), "--out", str(out),
+                                      "--figdir", str(tmp_path / "fig"), *flags]
+                        + (["--time-series"] if time_series else []) + ([] if plots else ["--no-plots"]))
+    run_sim.main()
+    return out
+
+
+def test_steady_state_metrics_resolve_through_registry(tmp_path, monkeypatch):
+    out = _run(tmp_path, monkeypatch, "--steady-state")
+    steady = pd.read_csv(out / "time_series_steady_state.csv")
+    assert len(steady) and (out / "time_series_metrics.csv").exists()
+
+
+@pytest.mark.parametrize("flags", [("--event-driven",), ("--shards", "2")])
+def test_dropped_trace_spec_is_not_plotted(tmp_path, monkeypatch, flags):
+    """Runs that drop --trace-samples neither load traces nor plot stale ones of an earlier run."""
+    _run(tmp_path, monkeypatch, "--trace-samples", "3", "--minimal-plots", *flags, plots=True)
+    assert not (tmp_path / "out" / "traces").exists()
+    assert not any((tmp_path / "fig").rglob("fused_trace_interval_bounds.png"))
+
+
+def test_pruned_components_are_reported_as_nan(tmp_path, monkeypatch, capsys):
+    """Without GNSS the never-sampled components must not read as perfect sensors (RMSE = P95 = 0)."""
+    out = _run(tmp_path, monkeypatch, config="config/scenario_no_gnss.yml", time_series=False)
+    metrics = pd.read_csv(out / "metrics_all.csv").set_index("component")
+    pruned = ["gnss_open", "gnss_urban", "gnss_tunnel", "imu", "unsafe"]
+    assert metrics.loc[pruned, ["rmse", "p95"]].isna().all().all()
+    assert metrics.loc[["balise", "secure", "fused"], ["rmse", "p95"]].notna().all().all()
+    assert "reported as NaN" in capsys.readouterr().out
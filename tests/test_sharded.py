@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+from src.time_sim import simulate_time_series
+from src.sharded import (
+    merge_tail_percentile, merge_variance, moments, simulate_time_series_sharded, tail_request, take_tail,
+)
+from conftest import assert_same_series, model_cfg
+
+
+@pytest.mark.parametrize("n", [1, 2, 7, 100, 1001])
+def test_tail_merge_matches_numpy_percentile(n):
+    rng = np.random.default_rng(n)
+    x = rng.standard_t(3, size=(3, n))
+    cuts = np.sort(rng.choice(np.arange(1, n), size=min(3, n - 1), replace=False)) if n > 1 else []
+    shards = np.split(x, cuts, axis=-1)
+    for q in (0, 1, 5, 50, 95, 99, 99.9, 100):
+        req = tail_request(n, q)
+        merged = merge_tail_percentile([take_tail(s, *req) for s in shards], n, q)
+        assert np.array_equal(merged, np.percentile(x, q, axis=-1)), q
+    if n > 1:
+        var = merge_variance([moments(s) for s in shards])
+        assert np.allclose(var, np.var(x, axis=-1, ddof=1), rtol=1e-12)
+
+
+@pytest.mark.parametrize("cadence", [None, 0.5])
+def test_single_shard_reproduces_time_series(cadence):
+    cfg = model_cfg(500, 4.0, lateral_rule_based=True)
+    ref = simulate_time_series(cfg, np.random.default_rng(np.random.SeedSequence(3).spawn(1)[0]), export_interval_bounds=True,
+                               metrics_cadence_s=cadence)
+    res = simulate_time_series_sharded(cfg, 1, seed=3, parallel=False, export_interval_bounds=True, metrics_cadence_s=cadence)
+    assert_same_series(ref, res)
+    assert np.array_equal(ref.mode_share["unsafe"], res.mode_share["unsafe"])
+    assert np.array_equal(ref.interval_lower, res.interval_lower)
+
+
+def test_process_shards_match_in_process():
+    cfg = model_cfg(500, 4.0)
+    local = simulate_time_series_sharded(cfg, 3, seed=5, parallel=False)
+    procs = simulate_time_series_sharded(cfg, 3, seed=5, parallel=True)
+    assert_same_series(local, procs)
@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+from src.splitting_sim import BreachSpec, estimate_breach_probability, _SubsetEngine
+from src.time_sim import _TimeSeriesEngine
+from conftest import model_cfg
+
+
+def _plain_breach_share(cfg, seed, limit):
+    eng = _TimeSeriesEngine([cfg], [np.random.default_rng(seed)], metrics=("rmse",))
+    peak = np.zeros(eng.n)
+    for _ in range(eng.n_steps):
+        eng.advance_paths()
+        eng.update_intervals()
+        eng.secure_variances()
+        block = eng.fuse()
+        np.maximum(peak, np.abs(block[0, 0]), out=peak)
+        eng.k += 1
+    return float(np.mean(peak > limit))
+
+
+def test_subset_simulation_matches_plain_breach_share():
+    """1000 paths per level with tilted anchors reproduce the plain breach share of 20000 paths (p ~ 2e-2)."""
+    plain = _plain_breach_share(model_cfg(20000, 30.0, rule_based=False), 3, 0.3)
+    est = estimate_breach_probability(model_cfg(1000, 30.0, rule_based=False), np.random.default_rng(5), BreachSpec(limit_m=0.3), repeats=3)
+    assert 0.5 < est.p / plain < 1.6, (est.p, plain)
+    assert len(est.estimates) == 3 and np.isfinite(est.cv) and est.cv < 0.5
+    assert len(est.levels) >= 2 and est.levels[-1]["level"] == 0.0
+    assert est.plain_run_equivalents < 3 * 2 * (len(est.levels) + 1)
+
+
+def test_tilted_anchor_weights_are_unbiased():
+    """Weighted tilted anchor draws keep the nominal mean; the weights average to one."""
+    eng = _SubsetEngine(model_cfg(20000, 2.0, rule_based=False), 1, np.random.default_rng(2), BreachSpec(limit_m=0.4), anchor_tilt=45.0)
+    events = np.ones(eng.n, dtype=bool)
+    nominal, _ = eng.draw_balise(0, events)
+    tilted, _ = eng.draw_balise(1, events)
+    w = np.exp(eng.logw)
+    assert tilted.mean() > nominal.mean() + 0.03
+    assert abs(w.mean() - 1.0) < 0.05
+    assert abs(np.mean(w * tilted) - nominal.mean()) < 0.01
+
+
+def test_breach_spec_validation():
+    cfg = model_cfg(200, 2.0, rule_based=False)
+    with pytest.raises(ValueError):
+        estimate_breach_probability(cfg, np.random.default_rng(0), BreachSpec(limit_m=None))  # no secure bounds on variance-weighted rows
+    with pytest.raises(ValueError):
+        estimate_breach_probability(cfg, np.random.default_rng(0), BreachSpec(limit_m=0.3, row="radial"))
+    with pytest.raises(ValueError):
+        estimate_breach_probability(cfg, np.random.default_rng(0), BreachSpec(limit_m=0.3), p0=1.0)
+    est = estimate_breach_probability(model_cfg(200, 2.0), np.random.default_rng(0), BreachSpec(limit_m=None))
+    assert 0.0 <= est.p <= 1.0
+    assert all("stopped_below_breach" not in lvl or lvl["stopped_below_breach"] < 0.0 for lvl in est.levels)
@@ -1,5 +1,5 @@
 import numpy as np
-from src.fusion import RuleFusionState, rule_based_fusion_step
+from src.fusion import RuleFusionState, rule_based_fusion_step, joint_fusion_step, fuse_pair
 
 
 def _init(n):
@@ -86,3 +86,46 @@ def test_outage_transition_blend_towards_midpoint():
         prev = fused
     # End near midpoint
     assert abs(fused.mean()) < 0.02, "Did not approach midpoint sufficiently"
+
+
+def test_scalar_bounds_match_array_bounds():
+    """Scalar (event-driven) bounds must give identical results to broadcast per-sample arrays."""
+    n = 400
+    rng = np.random.default_rng(3)
+    secure = rng.normal(0.0, 0.05, size=n)
+    state_arr, state_sc = _init(n), _init(n)
+    for _ in range(12):
+        unsafe = rng.normal(0.0, 0.3, size=n)
+        outage = rng.random(n) < 0.2
+        f_arr, state_arr, m_arr = rule_based_fusion_step(secure, unsafe, -np.full(n, 0.25), np.full(n, 0.25), outage, state_arr, blend_steps=4)
+        f_sc, state_sc, m_sc = rule_based_fusion_step(secure, unsafe, -0.25, 0.25, outage, state_sc, blend_steps=4)
+        assert np.array_equal(f_arr, f_sc)
+        assert m_arr == m_sc
+
+
+def test_joint_kernel_matches_per_axis_calls():
+    """(2, N) kernel == separate long/lat calls (per-axis fallback, mixed rule/variance axes) + radial row."""
+    n = 300
+    rng = np.random.default_rng(5)
+    secure = rng.normal(0.0, 0.05, size=(2, n))
+    lower = np.vstack([rng.uniform(-0.3, -0.1, n), np.full(n, -0.2)])
+    upper = -lower
+    for rule_axes in [(True, True), (True, False)]:
+        joint = RuleFusionState(fused=np.zeros((2, n)), mode=np.zeros((2, n), dtype=int), blend_left=np.zeros((2, n), dtype=int))
+        s_long, s_lat = _init(n), _init(n)
+        for _ in range(10):
+            unsafe = rng.normal(0.0, 0.25, size=(2, n))
+            outage = rng.random(n) < 0.3
+            block, joint, meta = joint_fusion_step(secure, unsafe, lower, upper, outage, joint, blend_steps=4,
+                                                   outage_fallback=("secure", "midpoint"), rule_axes=rule_axes)
+            f_long, s_long, m_long = rule_based_fusion_step(secure[0], unsafe[0], lower[0], upper[0], outage, s_long,
+                                                            blend_steps=4, outage_fallback="secure")
+            if rule_axes[1]:
+                f_lat, s_lat, _ = rule_based_fusion_step(secure[1], unsafe[1], -0.2, 0.2, outage, s_lat, blend_steps=4)
+            else:
+                f_lat, _ = fuse_pair(secure[1], np.full(n, np.var(secure[1], ddof=1)), unsafe[1], np.full(n, np.var(unsafe[1], ddof=1)))
+            assert np.array_equal(block[0], f_long) and np.array_equal(block[1], f_lat)
+            assert np.array_equal(block[2], np.sqrt(f_long ** 2 + f_lat ** 2))
+            assert {key: int(val[0]) for key, val in meta.items()} == m_long
+            if not rule_axes[1]:
+                assert all(val[1] == 0 for val in meta.values())
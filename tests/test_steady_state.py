@@ -0,0 +1,36 @@
+import numpy as np
+
+from src.metrics import SteadyStateSpec, batch_means_ci, mser_truncation
+from src.time_sim import simulate_time_series
+from conftest import model_cfg
+
+
+def test_mser_finds_transient_and_batch_means_cover_mean():
+    rng = np.random.default_rng(3)
+    n, phi = 4000, 0.8
+    noise = np.zeros(n)
+    eps = rng.normal(0.0, 0.1, n)
+    for i in range(1, n):
+        noise[i] = phi * noise[i - 1] + eps[i]
+    x = 1.0 + 5.0 * np.exp(-np.arange(n) / 60.0) + noise
+    d = mser_truncation(x, batch_size=5)
+    assert 150 <= d <= 800
+    mean, half = batch_means_ci(x[d:], n_batches=20)
+    assert abs(mean - 1.0) <= half + 0.01
+    assert mser_truncation(np.full(100, 2.0)) == 0
+
+
+def test_steady_state_stops_early_with_identical_prefix():
+    cfg = model_cfg(300, 600.0)
+    spec = SteadyStateSpec(metrics=("rmse", "p95"), check_every_s=20.0, min_time_s=100.0, rel_tol=0.05)
+    full = simulate_time_series(cfg, np.random.default_rng(2), metrics_cadence_s=1.0)
+    res = simulate_time_series(cfg, np.random.default_rng(2), metrics_cadence_s=1.0, steady_state=spec)
+    ss = res.steady_state
+    assert ss.detected and ss.t_detect_s < 600.0 and ss.warmup_s <= ss.t_detect_s / 2
+    m = res.times.shape[0]
+    assert np.isclose(res.times[-1], ss.t_detect_s) and res.n_iterations == 10 * m
+    assert np.array_equal(res.rmse, full.rmse[:m]) and np.array_equal(res.p95, full.p95[:m])
+    for name, est in ss.estimates.items():
+        assert est["rel_half_width"] <= 0.05
+        ref = getattr(full, name)[int(round(est["warmup_s"])):]
+        assert abs(np.mean(ref) - est["mean"]) <= 4 * est["ci_half_width"] + 0.02 * abs(est["mean"])
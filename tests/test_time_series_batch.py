@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from src.metrics import multi_percentile
+from src.time_sim import simulate_time_series, simulate_time_series_batch
+from conftest import assert_same_series, model_cfg
+
+
+def test_batch_lanes_identical_to_separate_runs():
+    """Each scenario lane reproduces its separate run exactly (own RNG stream, mixed fusion settings)."""
+    cfgs = [
+        model_cfg(400, 6.0, lateral_rule_based=True),
+        model_cfg(400, 6.0, "config/scenario_bad_weather.yml"),
+        model_cfg(400, 6.0, "config/scenario_no_gnss.yml", rule_based=False),
+    ]
+    separate = [simulate_time_series(cfg, np.random.default_rng(10 + i), export_interval_bounds=True) for i, cfg in enumerate(cfgs)]
+    batch = simulate_time_series_batch(cfgs, [np.random.default_rng(10 + i) for i in range(len(cfgs))], export_interval_bounds=True)
+    for a, b in zip(separate, batch):
+        assert_same_series(a, b)
+        assert (a.mode_share is None) == (b.mode_share is None)
+        if a.mode_share is not None:
+            assert np.array_equal(a.mode_share["unsafe"], b.mode_share["unsafe"])
+            assert np.array_equal(a.interval_upper, b.interval_upper)
+
+
+def test_batch_rejects_mismatched_grid():
+    a = model_cfg(400, 6.0)
+    b = model_cfg(400, 6.0, "config/scenario_regular.yml")
+    b.raw["sim"]["dt_s"] = 0.2
+    with pytest.raises(ValueError):
+        simulate_time_series_batch([a, b], [np.random.default_rng(0), np.random.default_rng(1)])
+
+
+def test_metric_cadence_subsamples_full_run():
+    """Coarser metric cadence records the same values at its instants (state still advances every dt)."""
+    cfg = model_cfg(400, 6.0, lateral_rule_based=True)
+    full = simulate_time_series(cfg, np.random.default_rng(4))
+    coarse = simulate_time_series(cfg, np.random.default_rng(4), metrics_cadence_s=0.5)
+    every = 5  # 0.5 s / dt 0.1 s
+    assert np.allclose(coarse.times, full.times[every - 1::every])
+    for field in ("rmse", "p95", "p95_2d", "var_secure", "share_oos", "switch_rate"):
+        assert np.array_equal(getattr(coarse, field), getattr(full, field)[every - 1::every]), field
+    assert np.array_equal(coarse.si_joint_p99, full.si_joint_p99)
+
+
+def test_multi_percentile_matches_numpy():
+    rng = np.random.default_rng(0)
+    for n in (1, 2, 9, 1000):
+        x = rng.standard_normal((2, 3, n))
+        qs = [0, 1, 50, 95, 99, 100]
+        assert np.array_equal(multi_percentile(x, qs), np.percentile(x, qs, axis=-1))
+        assert np.array_equal(multi_percentile(x, [5, 95], axis=1), np.percentile(x, [5, 95], axis=1))
@@ -0,0 +1,44 @@
+import numpy as np
+
+from src.time_sim import _TimeSeriesEngine, simulate_time_series
+from src.trace_recorder import CHANNELS, KIND_BREACH, TraceRecorder, TraceSpec, load_traces
+from conftest import model_cfg
+
+
+def test_recorder_rows_match_dense_series(tmp_path):
+    """Reservoir rows hold full series; breach rows hold the pre-breach window and everything after."""
+    rng = np.random.default_rng(0)
+    n, n_steps, window = 60, 120, 7
+    dense = {ch: np.cumsum(rng.normal(0.0, 0.1, (n_steps, n)), axis=0) for ch in CHANNELS}
+    dense["mode"] = rng.integers(0, 3, (n_steps, n))
+    spec = TraceSpec(tmp_path, n_samples=5, breach_threshold=1.0, max_breach=12, pre_window_steps=window, block_steps=9)
+    rec = TraceRecorder(spec, n, n_steps, 0.1, breach_threshold=0.2)
+    for k in range(n_steps):
+        rec.record(k, *(dense[ch][k] for ch in CHANNELS), dense["mode"][k])
+    rec.close()
+
+    tr = load_traces(tmp_path)
+    first = tr["first_breach_step"]
+    assert (tr["kind"] == KIND_BREACH).sum() == 12 and (first > window).any()
+    for row, sample in enumerate(tr["sample_ids"]):
+        start = 0 if first[row] < 0 else max(0, first[row] - window)
+        for ch in CHANNELS:
+            assert np.array_equal(tr[ch][row, start:], dense[ch][start:, sample].astype(np.float32)), (ch, row)
+            assert np.isnan(tr[ch][row, :start]).all()
+        assert np.array_equal(tr["mode"][row, start:], dense["mode"][start:, sample])
+        if first[row] >= 0:
+            path = np.abs(dense["fused"][:, sample])
+            assert path[first[row]] > 1.0 and (path[:first[row]] <= 1.0).all()
+
+
+def test_engine_traces_leave_results_unchanged(tmp_path):
+    cfg = model_cfg(300, 5.0, rule_based=True)
+    engine = _TimeSeriesEngine([cfg], [np.random.default_rng(5)], traces=[TraceSpec(tmp_path, n_samples=8)])
+    fused = []
+    while engine.k < engine.n_steps:
+        engine.step()
+        fused.append(engine.block[0, 0].copy())
+    res = engine.results()[0]
+    assert np.array_equal(res.rmse, simulate_time_series(cfg, np.random.default_rng(5)).rmse)  # own generator
+    tr = load_traces(tmp_path)
+    assert np.array_equal(tr["fused"][:8], np.array(fused).T[tr["sample_ids"][:8]].astype(np.float32))
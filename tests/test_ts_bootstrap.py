@@ -0,0 +1,34 @@
+import numpy as np
+import pytest
+
+from src.time_sim import simulate_time_series, time_series_columns
+from src.ts_bootstrap import BootstrapSpec, weighted_quantile
+from conftest import model_cfg
+
+
+def test_weighted_quantile_partial_sort_matches_full_sort():
+    rng = np.random.default_rng(3)
+    values = rng.standard_t(3, size=800)
+    weights = rng.poisson(1.0, size=(40, 800)).astype(float)
+    order = np.argsort(values)
+    cum = np.cumsum(weights[:, order], axis=1)
+    for q in (0.05, 0.5, 0.95, 0.99):
+        ref = values[order][np.argmax(cum >= q * cum[:, -1:], axis=1)]
+        assert np.array_equal(weighted_quantile(values, weights, q), ref)
+        assert np.array_equal(weighted_quantile(values, weights, q, margin=0.0), ref)  # tail fallback
+
+
+def test_bootstrap_bands_bracket_point_estimates_without_changing_them():
+    cfg = model_cfg(1500, 20.0, rule_based=False)
+    plain = simulate_time_series(cfg, np.random.default_rng(4), metrics_cadence_s=1.0)
+    boot = simulate_time_series(cfg, np.random.default_rng(4), metrics_cadence_s=1.0,
+                                bootstrap=BootstrapSpec(replicates=100, metrics=("rmse", "p95", "p95_2d")))
+    assert np.array_equal(plain.rmse, boot.rmse) and np.array_equal(plain.p95, boot.p95)
+    assert set(boot.ci_bands) == {f"{c}_ci_{s}" for c in ("rmse_long", "p95_long", "p95_2d") for s in ("lo", "hi")}
+    for col, point in (("rmse_long", boot.rmse), ("p95_long", boot.p95), ("p95_2d", boot.p95_2d)):
+        lo, hi = boot.ci_bands[col + "_ci_lo"], boot.ci_bands[col + "_ci_hi"]
+        assert np.all(lo <= hi) and np.all(hi > lo)
+        assert np.mean((lo <= point) & (point <= hi)) > 0.9
+    assert "p95_long_ci_hi" in time_series_columns(boot)
+    with pytest.raises(ValueError):
+        simulate_time_series(cfg, np.random.default_rng(4), metrics=["rmse"], bootstrap=BootstrapSpec())
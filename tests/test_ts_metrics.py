@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from src.time_sim import simulate_time_series, time_series_columns
+from src import ts_metrics
+from src.ts_metrics import TimeSeriesMetrics, register_metric, share_above
+from conftest import model_cfg
+
+
+def test_declared_metrics_only(tmp_path, monkeypatch):
+    cfg = model_cfg(800, 20.0)
+    ref = simulate_time_series(cfg, np.random.default_rng(3))
+    monkeypatch.setattr(ts_metrics, "_CUSTOM", {})  # registration is process-global; restored at teardown
+    register_metric("max_abs_lat", lambda v: np.max(np.abs(v), axis=-1), row="lat")
+    names = ["rmse", "p99", "p95_2d", "share_oos", "share_oos@0.05", "share_oos@0.5", "max_abs_lat"]
+    res = simulate_time_series(cfg, np.random.default_rng(3), metrics=names)
+    threaded = simulate_time_series(cfg, np.random.default_rng(3), metrics=names, metric_threads=2)
+    streamed = simulate_time_series(cfg, np.random.default_rng(3), metrics=names, stream_dir=tmp_path / "store")
+    # Requested built-ins equal the full run; everything else is not computed
+    for field in ("rmse", "p95_2d", "share_oos"):
+        assert np.array_equal(getattr(res, field), getattr(ref, field)), field
+    for field in ("p95", "var_secure", "var_unsafe", "rmse_lat", "p95_lat", "rmse_2d", "si_times", "si_joint_p99"):
+        assert getattr(res, field) is None, field
+    assert list(res.extra) == ["p99", "share_oos@0.05", "share_oos@0.5", "max_abs_lat"]
+    assert np.all(res.extra["share_oos@0.05"] >= res.share_oos)
+    assert np.all(res.extra["share_oos@0.5"] <= res.share_oos)
+    for other in (threaded, streamed):
+        for name, values in res.extra.items():
+            assert np.array_equal(values, other.extra[name]), name
+    assert list(time_series_columns(res)) == ["t_s", "rmse_long", "share_out_of_spec_long", "p95_2d", "p99_long",
+                                             "share_out_of_spec_long@0.05", "share_out_of_spec_long@0.5", "max_abs_lat"]
+
+
+def test_share_above_one_pass_and_plan_validation():
+    x = np.random.default_rng(0).normal(size=(2, 3, 1001))
+    thresholds = [1.0, 0.1, 2.5, 0.5]
+    expected = np.stack([np.mean(np.abs(x) > t, axis=-1) for t in thresholds])
+    assert np.array_equal(share_above(x, thresholds), expected)
+    plan = TimeSeriesMetrics(["rmse", "p95_lat", "si"], with_lateral=False)
+    assert plan.names == ("rmse", "si") and plan.n_rows == 1 and plan.interval_growth
+    # Per-row reductions: only the declared rows and quantiles
+    plan = TimeSeriesMetrics(["rmse_lat", "p50_lat", "p90"])
+    out = plan.evaluate(x)
+    assert sorted(out) == ["p50_lat", "p90", "rmse_lat"]
+    assert np.array_equal(out["rmse_lat"], np.sqrt(np.mean(x[:, 1] ** 2, axis=-1)))
+    assert np.array_equal(out["p50_lat"], np.percentile(x[:, 1], 50, axis=-1))
+    assert np.array_equal(out["p90"], np.percentile(x[:, 0], 90, axis=-1))
+    with pytest.raises(ValueError):
+        TimeSeriesMetrics(["p95", "rmse_3d"])
@@ -0,0 +1,42 @@
+import numpy as np
+
+from src.time_sim import _TimeSeriesEngine, simulate_time_series
+from src.ts_store import load_time_series_store
+from conftest import assert_same_series, model_cfg
+
+
+def _assert_same(ref, res):
+    assert_same_series(ref, res)
+    assert np.array_equal(ref.mode_share["unsafe"], res.mode_share["unsafe"])
+
+
+def test_streamed_results_match_in_memory(tmp_path):
+    """Chunked store (chunk not dividing the record count) holds exactly the in-memory series."""
+    cfg = model_cfg(300, 6.3, metrics_cadence_s=0.2, lateral_rule_based=True)
+    ref = simulate_time_series(cfg, np.random.default_rng(2))
+    engine = _TimeSeriesEngine([cfg], [np.random.default_rng(2)], stream_dirs=[tmp_path], stream_chunk_records=7)
+    assert engine.rmse_t.shape[1] == 7
+    engine.run()
+    _assert_same(ref, engine.results()[0])
+    stored = load_time_series_store(tmp_path)
+    assert np.array_equal(stored["p95_2d"], ref.p95_2d)
+    assert np.array_equal(stored["si_joint_p99"], ref.si_joint_p99)
+
+
+def test_partial_store_and_resume(tmp_path):
+    """Mid-run the store exposes the flushed prefix; checkpoint resume continues the same store."""
+    cfg = model_cfg(300, 6.3, metrics_cadence_s=0.2, lateral_rule_based=True)
+    ref = simulate_time_series(cfg, np.random.default_rng(3))
+    first = _TimeSeriesEngine([cfg], [np.random.default_rng(3)], stream_dirs=[tmp_path / "s"], stream_chunk_records=5)
+    while first.k < 33:
+        first.step()
+    partial = load_time_series_store(tmp_path / "s")
+    assert len(partial["rmse_long"]) == 15  # 16 records done, three full chunks of 5 flushed
+    assert np.array_equal(partial["rmse_long"], ref.rmse[:15])
+    first.save_checkpoint(tmp_path / "ckpt.npz")
+
+    resumed = _TimeSeriesEngine([cfg], [np.random.default_rng(0)], stream_dirs=[tmp_path / "s"], stream_chunk_records=5,
+                                stream_resume=True)
+    resumed.load_checkpoint(tmp_path / "ckpt.npz")
+    resumed.run()
+    _assert_same(ref, resumed.results()[0])